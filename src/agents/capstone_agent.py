@@ -1,25 +1,78 @@
 
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
-import sys
-import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, List, Dict, Any, Set, Tuple
 
 # Imports from previous days
 from src.agents.persona import Persona, PersonaManager
-from src.agents.plan_verifier import PlanVerifier, PlanStep
+from src.agents.plan_verifier import PlanVerifier, PlanStep, STEP_REF, referenced_steps
+from src.utils.keyword_matcher import KeywordMatcher
 
 @dataclass
 class AgentResponse:
     success: bool
     content: str
     trace: List[str]
+    partial: bool = False # True for intermediate snapshots yielded by run_stream()
+
+def step_dependencies(plan: List[PlanStep]) -> Dict[int, Set[int]]:
+    """
+    step_id -> ids of earlier steps whose output it references in its arguments.
+    References to unknown or later steps are ignored (left as literal text).
+    """
+    deps = {}
+    seen = set()
+    for step in plan:
+        deps[step.step_id] = referenced_steps(step.arguments) & seen
+        seen.add(step.step_id)
+    return deps
+
+class PlanViolation(Exception):
+    """A step's resolved arguments failed the plan verifier's argument rules at run time."""
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+class _AnswerAssembler:
+    """
+    Streams pieces of "context" so that their concatenation equals context.strip():
+    leading whitespace is dropped and trailing whitespace is held back until more text follows.
+    """
+    def __init__(self):
+        self.started = False
+        self.pending = ""
+
+    def push(self, text: str) -> str:
+        if not self.started:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self.started = True
+        body = text.rstrip()
+        if not body:
+            self.pending += text
+            return ""
+        out = self.pending + body
+        self.pending = text[len(body):]
+        return out
 
 class SafeResearchAssistant:
     """
     Phase 2 Capstone Agent.
     Integrates: Guardrails, Persona, Planning, and Verification.
+
+    run_stream() executes independent plan steps concurrently (dependencies come from
+    "{{step_<id>}}" references in step arguments) on a thread pool owned by the agent,
+    checks the answer incrementally as tool outputs arrive, and yields partial
+    AgentResponses as the answer grows. run() returns the final response of the same stream.
+    Call close() or use the agent as a context manager to shut the thread pool down.
     """
-    def __init__(self):
+    # Characters of already-checked output re-checked together with each new chunk,
+    # so guard phrases split across chunks are still caught
+    GUARD_TAIL_CHARS = 64
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
         # 1. Persona Config
         self.persona = Persona(
             name="ResearchBot",
@@ -31,13 +84,23 @@ class SafeResearchAssistant:
         
         # 2. Safety Components
         self.plan_verifier = PlanVerifier(restricted_tools=["system_shell", "delete_file", "format_disk"])
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+        self.unsafe_keywords = KeywordMatcher(["poison", "kill", "bomb", "ignore instructions"])
         
+    def close(self):
+        """Shuts down the agent's thread pool; the agent cannot run plans afterwards."""
+        self.executor.shutdown(wait=True)
+
+    def __enter__(self) -> "SafeResearchAssistant":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def _input_guard(self, text: str) -> bool:
         """Mock Input Guardrail (Day 27)"""
-        unsafe = ["poison", "kill", "bomb", "ignore instructions"]
-        for term in unsafe:
-            if term in text.lower():
-                return False # Blocked
+        if self.unsafe_keywords.contains_any(text):
+            return False # Blocked
         return True # Safe
 
     def _output_guard(self, text: str) -> bool:
@@ -73,51 +136,142 @@ class SafeResearchAssistant:
             return "Content of page..."
         return "Tool Executed"
 
+    def _execute_plan(self, plan: List[PlanStep]) -> Iterator[Tuple[PlanStep, str]]:
+        """
+        Runs the plan on the agent's thread pool, starting each step as soon as the steps it
+        references have finished. Yields (step, output) in plan order as soon as
+        every earlier step's output is available.
+        """
+        deps = step_dependencies(plan)
+        outputs: Dict[int, str] = {}
+        running = {}
+        next_index = 0
+        try:
+            while next_index < len(plan):
+                started = set(running.values())
+                for step in plan:
+                    if step.step_id not in outputs and step.step_id not in started \
+                            and deps[step.step_id] <= outputs.keys():
+                        args = self._resolve_arguments(step.arguments, outputs)
+                        # Arguments fed by earlier outputs are only known now; check them before running
+                        check = self.plan_verifier.verify_arguments(step, args)
+                        if not check.is_valid:
+                            raise PlanViolation(check.errors)
+                        running[self.executor.submit(self._execute_tool, step.tool_name, args)] = step.step_id
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outputs[running.pop(future)] = future.result()
+                while next_index < len(plan) and plan[next_index].step_id in outputs:
+                    yield plan[next_index], outputs[plan[next_index].step_id]
+                    next_index += 1
+        finally:
+            for future in running:
+                future.cancel()
+
+    @staticmethod
+    def _resolve_arguments(value: Any, outputs: Dict[int, str]) -> Any:
+        if isinstance(value, str):
+            return STEP_REF.sub(lambda m: outputs.get(int(m.group(1)), m.group(0)), value)
+        if isinstance(value, dict):
+            return {k: SafeResearchAssistant._resolve_arguments(v, outputs) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(SafeResearchAssistant._resolve_arguments(v, outputs) for v in value)
+        return value
+
     def run(self, user_query: str) -> AgentResponse:
+        response = None
+        for response in self.run_stream(user_query):
+            pass
+        return response
+
+    def run_stream(self, user_query: str) -> Iterator[AgentResponse]:
+        """
+        Yields partial AgentResponses (partial=True) as the trace and answer grow,
+        then the final response. The final response and its trace are the ones the
+        original sequential run() produced.
+
+        The persona-drift check and output guard run on each new chunk of the answer
+        (plus a short tail of what came before) before it is released. Persona drift
+        stops the remaining steps at the first offending chunk. After an output-guard
+        violation nothing more is released, but the rest of the answer is still
+        checked for drift, whose redaction takes precedence.
+        """
         trace = []
         trace.append(f"Received Query: {user_query}")
-        
+        yield AgentResponse(True, "", list(trace), partial=True)
+
         # 1. Input Guardrail
         if not self._input_guard(user_query):
             trace.append("❌ Input Guardbox: Blocked unsafe query.")
-            return AgentResponse(False, "I cannot answer that query due to safety guidelines.", trace)
+            yield AgentResponse(False, "I cannot answer that query due to safety guidelines.", trace)
+            return
         trace.append("✅ Input Guard: Passed")
-        
+
         # 2. Persona Wrapping
-        wrapped_query = self.persona_manager.wrap_prompt(user_query)
+        self.persona_manager.wrap_prompt(user_query)
         trace.append("✅ Persona: Prompt wrapped with constraints.")
-        
+
         # 3. Planning
         plan = self._generate_plan(user_query)
         trace.append(f"Generated Plan: {[s.tool_name for s in plan]}")
-        
+
         # 4. Plan Verification
-        verification = self.plan_verifier.verify_plan(plan)
+        verification = self.plan_verifier.verify_plan(plan, deferred_arguments=True)
         if not verification.is_valid:
             trace.append(f"❌ Plan Verification: BOCKED. Errors: {verification.errors}")
-            return AgentResponse(False, "My proposed plan was deemed unsafe.", trace)
+            yield AgentResponse(False, "My proposed plan was deemed unsafe.", trace)
+            return
         trace.append("✅ Plan Verification: Passed")
-        
-        # 5. Execution
-        context = ""
-        for step in plan:
-            res = self._execute_tool(step.tool_name, step.arguments)
-            context += res + "\n"
+        yield AgentResponse(True, "", list(trace), partial=True)
+
+        # 5. Execution, 6. Generate Answer (Mock), streamed through 7./8. as chunks arrive
+        answer = ""
+        tail = ""
+        drifted = False
+        blocked = False
+        assembler = _AnswerAssembler()
+        chunks = self._answer_chunks(plan, assembler)
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                window = tail + chunk
+                tail = window[-self.GUARD_TAIL_CHARS:]
+
+                # 7. Drift Check (Persona)
+                if not self.persona_manager.check_consistency(window):
+                    drifted = True
+                    break
+
+                # 8. Output Guardrail; keep checking later chunks for drift without releasing them
+                blocked = blocked or not self._output_guard(window)
+                if not blocked:
+                    answer += chunk
+                    yield AgentResponse(True, answer, list(trace), partial=True)
+        except PlanViolation as e:
+            trace.append(f"❌ Plan Verification: BOCKED. Errors: {e.errors}")
+            yield AgentResponse(False, "My proposed plan was deemed unsafe.", trace)
+            return
+        finally:
+            chunks.close()
         trace.append("✅ Execution: Tools ran successfully")
-        
-        # 6. Generate Answer (Mock)
-        final_answer = f"Based on my research: {context.strip()}"
-        
-        # 7. Drift Check (Persona)
-        if not self.persona_manager.check_consistency(final_answer):
-             trace.append("❌ Persona Drift: Response violated tone/constraints.")
-             # Self-Correction could happen here (Day 42), simplifed to fail for now
-             final_answer = "[REDACTED due to persona drift]"
-        
-        # 8. Output Guardrail
-        if not self._output_guard(final_answer):
-             trace.append("❌ Output Guard: Blocked sensitive content.")
-             return AgentResponse(False, "Response redacted for safety.", trace)
-        
+
+        if drifted:
+            trace.append("❌ Persona Drift: Response violated tone/constraints.")
+            # Self-Correction could happen here (Day 42), simplifed to fail for now
+            answer = "[REDACTED due to persona drift]"
+            blocked = not self._output_guard(answer)
+
+        if blocked:
+            trace.append("❌ Output Guard: Blocked sensitive content.")
+            yield AgentResponse(False, "Response redacted for safety.", trace)
+            return
+
         trace.append("✅ Output Guard: Passed")
-        return AgentResponse(True, final_answer, trace)
+        yield AgentResponse(True, answer, trace)
+
+    def _answer_chunks(self, plan: List[PlanStep], assembler: "_AnswerAssembler"):
+        """The answer "Based on my research: <tool outputs>" as text chunks."""
+        yield "Based on my research: "
+        for _, output in self._execute_plan(plan):
+            yield assembler.push(output + "\n")
@@ -1,8 +1,9 @@
-
-from typing import List, Dict, Any
-from dataclasses import dataclass
-import sys
-import os
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import asyncio
+import threading
+import time
 
 # Import components from Phase 4
 from src.assurance.policy_auditor import PolicyComplianceAuditor
@@ -10,62 +11,236 @@ from src.agents.governance_advisor import GlobalGovernanceAdvisor
 from src.agents.esg_auditor import ESGAuditorAgent
 from src.assurance.science_verifier import ScienceClaimVerifier
 
+# Verdict recorded for stages that were not run because the audit short-circuited
+SKIPPED = "SKIPPED"
+
 @dataclass
 class CapstoneAuditReport:
     is_authorized: bool
     verdicts: Dict[str, Any]
     final_score: float
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+@dataclass
+class SafetyStage:
+    """
+    One check in the audit pipeline.
+    `run(plan)` returns (verdict, detail); `blocks(verdict)` says whether that verdict
+    denies authorization. Stages only wait for the stages named in `depends_on`.
+    """
+    name: str
+    run: Callable[[Dict[str, str]], Tuple[str, Any]]
+    blocks: Callable[[str], bool] = lambda verdict: False
+    depends_on: Tuple[str, ...] = ()
 
 class GlobalSafetyOrchestrator:
     """
     Day 100: Phase 4 Capstone - Global Safety Orchestrator.
-    Integrates all Phase 4 safety checks into a unified pipeline 
+    Integrates all Phase 4 safety checks into a unified pipeline
     for high-stakes decision auditing.
+
+    The checks are a declarative list of SafetyStages (`self.stages`). Independent
+    stages run concurrently on a thread pool (`executor="thread"`), on asyncio tasks
+    (aaudit_global_plan), or one after another (`executor="serial"`). With `fail_fast`,
+    the first blocking verdict ends the audit: stages not yet started are cancelled
+    and reported as SKIPPED.
+
+    The thread pool is created on first use and reused across audits; call close() or
+    use the orchestrator as a context manager to shut it down.
     """
-    def __init__(self):
+    def __init__(self, executor: str = "thread", max_workers: int = 4, fail_fast: bool = False):
+        if executor not in ("thread", "serial"):
+            raise ValueError(f"Unknown executor '{executor}'. Expected 'thread' or 'serial'.")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.fail_fast = fail_fast
+
         self.policy_auditor = PolicyComplianceAuditor()
         self.gov_advisor = GlobalGovernanceAdvisor()
         self.esg_auditor = ESGAuditorAgent()
         self.science_verifier = ScienceClaimVerifier()
+        self.stages: List[SafetyStage] = self.default_stages()
 
-    def audit_global_plan(self, 
-                          plan_title: str, 
-                          plan_desc: str, 
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def default_stages(self) -> List[SafetyStage]:
+        # Unauthorized if Policy REJECTED, Governance BLOCKED, or Science REJECTED
+        return [
+            SafetyStage("Science", self._science_stage, blocks=lambda v: v != "PASS"),
+            SafetyStage("Policy", self._policy_stage, blocks=lambda v: "REJECTED" in v),
+            SafetyStage("Governance", self._governance_stage, blocks=lambda v: "BLOCKED" in v),
+            SafetyStage("ESG", self._esg_stage),
+        ]
+
+    def audit_global_plan(self,
+                          plan_title: str,
+                          plan_desc: str,
                           acting_entity: str,
                           target_region: str) -> CapstoneAuditReport:
-        
+        plan = self._plan(plan_title, plan_desc, acting_entity, target_region)
+        start = time.perf_counter()
+        if self.executor == "serial":
+            outcomes = self._run_serial(plan)
+        else:
+            outcomes = self._run_threaded(plan)
+        return self._report(outcomes, time.perf_counter() - start)
+
+    async def aaudit_global_plan(self,
+                                 plan_title: str,
+                                 plan_desc: str,
+                                 acting_entity: str,
+                                 target_region: str) -> CapstoneAuditReport:
+        """asyncio version of audit_global_plan(); each stage runs in a worker thread."""
+        plan = self._plan(plan_title, plan_desc, acting_entity, target_region)
+        start = time.perf_counter()
+        outcomes: Dict[str, Tuple[str, Any, float]] = {}
+        tasks: Dict[asyncio.Task, SafetyStage] = {}
+        try:
+            while True:
+                for stage in self._ready(outcomes, tasks.values()):
+                    tasks[asyncio.ensure_future(asyncio.to_thread(self._timed, stage, plan))] = stage
+                if not tasks:
+                    break
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                if self._collect(done, tasks, outcomes):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self._report(outcomes, time.perf_counter() - start)
+
+    def audit_many(self, plans: Sequence[Any], max_workers: Optional[int] = None) -> List[CapstoneAuditReport]:
+        """
+        Audits a batch of plans concurrently; each plan is a dict with title/description/
+        entity/region keys or a (title, description, entity, region) tuple.
+        Within a plan the stages run serially, so the parallelism is across plans.
+        Reports keep the order of `plans`.
+        """
+        def audit(plan: Any) -> CapstoneAuditReport:
+            plan = plan if isinstance(plan, dict) else self._plan(*plan)
+            start = time.perf_counter()
+            return self._report(self._run_serial(plan), time.perf_counter() - start)
+
+        workers = max_workers or self.max_workers
+        if workers <= 1:
+            return [audit(plan) for plan in plans]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(audit, plans))
+
+    def _science_stage(self, plan: Dict[str, str]) -> Tuple[str, Any]:
         # 1. Scientific Verification
-        sci_audit = self.science_verifier.verify_claim(plan_desc)
-        
+        sci_audit = self.science_verifier.verify_claim(plan["description"])
+        return ("PASS" if sci_audit.is_verified else "REJECTED (Low Confidence/No KB)"), sci_audit # Verifier is strict
+
+    def _policy_stage(self, plan: Dict[str, str]) -> Tuple[str, Any]:
         # 2. Policy Compliance
-        policy_violations = self.policy_auditor.audit_proposal(plan_title, plan_desc)
-        policy_status = self.policy_auditor.get_compliance_status(policy_violations)
-        
+        policy_violations = self.policy_auditor.audit_proposal(plan["title"], plan["description"])
+        return self.policy_auditor.get_compliance_status(policy_violations), policy_violations
+
+    def _governance_stage(self, plan: Dict[str, str]) -> Tuple[str, Any]:
         # 3. Global Governance
-        gov_audit = self.gov_advisor.audit_action(plan_desc, acting_entity)
-        
+        gov_audit = self.gov_advisor.audit_action(plan["description"], plan["entity"])
+        return gov_audit["verdict"], gov_audit
+
+    def _esg_stage(self, plan: Dict[str, str]) -> Tuple[str, Any]:
         # 4. ESG Alignment
         # For simplicity, we assume the plan 'entity' or associated companies are checked
-        esg_audit = self.esg_auditor.audit_portfolio([acting_entity])
-        
-        # Consolidation
-        verdicts = {
-            "Science": "PASS" if sci_audit.is_verified else "REJECTED (Low Confidence/No KB)", # Verifier is strict
-            "Policy": policy_status,
-            "Governance": gov_audit["verdict"],
-            "ESG": esg_audit["compliance_status"]
-        }
-        
-        # Logic for authorization
-        # Unauthorized if Policy REJECTED, Governance BLOCKED, or Science REJECTED
-        is_authorized = (
-            "REJECTED" not in verdicts["Policy"] and 
-            "BLOCKED" not in verdicts["Governance"] and
-            verdicts["Science"] == "PASS"
+        esg_audit = self.esg_auditor.audit_portfolio([plan["entity"]])
+        return esg_audit["compliance_status"], esg_audit
+
+    @staticmethod
+    def _plan(title: str, description: str, entity: str, region: str) -> Dict[str, str]:
+        return {"title": title, "description": description, "entity": entity, "region": region}
+
+    @staticmethod
+    def _timed(stage: SafetyStage, plan: Dict[str, str]) -> Tuple[str, Any, float]:
+        start = time.perf_counter()
+        verdict, detail = stage.run(plan)
+        return verdict, detail, time.perf_counter() - start
+
+    def _ready(self, outcomes: Dict[str, Any], started) -> List[SafetyStage]:
+        """Stages whose dependencies have finished and that have not been started yet."""
+        started_names = {stage.name for stage in started}
+        return [
+            stage for stage in self.stages
+            if stage.name not in outcomes and stage.name not in started_names
+            and all(dep in outcomes for dep in stage.depends_on)
+        ]
+
+    def _collect(self, done, running: Dict[Any, SafetyStage], outcomes: Dict[str, Any]) -> bool:
+        """Records finished stages. Returns True if the audit should stop early."""
+        stop = False
+        for future in done:
+            stage = running.pop(future)
+            outcomes[stage.name] = future.result()
+            stop = stop or (self.fail_fast and stage.blocks(outcomes[stage.name][0]))
+        return stop
+
+    def _run_serial(self, plan: Dict[str, str]) -> Dict[str, Tuple[str, Any, float]]:
+        outcomes = {}
+        while True:
+            ready = self._ready(outcomes, [])
+            if not ready:
+                return outcomes
+            for stage in ready:
+                outcomes[stage.name] = self._timed(stage, plan)
+                if self.fail_fast and stage.blocks(outcomes[stage.name][0]):
+                    return outcomes
+
+    def _run_threaded(self, plan: Dict[str, str]) -> Dict[str, Tuple[str, Any, float]]:
+        pool = self._get_pool()
+        outcomes = {}
+        running = {}
+        try:
+            while True:
+                for stage in self._ready(outcomes, running.values()):
+                    running[pool.submit(self._timed, stage, plan)] = stage
+                if not running:
+                    return outcomes
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                if self._collect(done, running, outcomes):
+                    return outcomes
+        finally:
+            # Only reached with futures left on fail-fast; already running stages finish in the background
+            for future in running:
+                future.cancel()
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="safety-stage")
+            return self._pool
+
+    def close(self):
+        """Shuts down the stage thread pool."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+    def __enter__(self) -> "GlobalSafetyOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _report(self, outcomes: Dict[str, Tuple[str, Any, float]], total_seconds: float) -> CapstoneAuditReport:
+        verdicts = {stage.name: outcomes[stage.name][0] if stage.name in outcomes else SKIPPED
+                    for stage in self.stages}
+
+        # Logic for authorization: every stage ran and none returned a blocking verdict
+        is_authorized = all(
+            stage.name in outcomes and not stage.blocks(outcomes[stage.name][0]) for stage in self.stages
         )
-        
+        science = outcomes.get("Science")
+        confidence = getattr(science[1], "confidence", 0.0) if science is not None else 0.0
+
         return CapstoneAuditReport(
             is_authorized=is_authorized,
             verdicts=verdicts,
-            final_score=sci_audit.confidence if is_authorized else 0.0
+            final_score=confidence if is_authorized else 0.0,
+            stage_seconds={stage.name: outcomes[stage.name][2] for stage in self.stages if stage.name in outcomes},
+            total_seconds=total_seconds
         )
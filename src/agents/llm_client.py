@@ -1,6 +1,9 @@
 import os
+import asyncio
 import logging
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional
 
 # Check for OpenAI
 try:
@@ -24,6 +27,35 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 from .mock_llm import MockLLM
+from .response_cache import ResponseCache, make_cache_key
+
+# SDK clients are shared per (provider, api key). Each SDK client owns an HTTP
+# connection pool, so reusing one across LLMClient instances keeps connections warm.
+_CLIENT_POOL = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _pooled_client(provider: str, api_key: str, factory: Callable):
+    key = (provider, api_key)
+    with _CLIENT_POOL_LOCK:
+        if key not in _CLIENT_POOL:
+            _CLIENT_POOL[key] = factory()
+        return _CLIENT_POOL[key]
+
+
+def batch_generate(model, prompts: Iterable[str], max_concurrency: int = 8) -> List[str]:
+    """
+    Calls `model.generate` for every prompt using at most `max_concurrency` threads.
+    Works with any object exposing `generate(prompt) -> str`.
+    Results are returned in the same order as `prompts`.
+    """
+    prompts = list(prompts)
+    if max_concurrency <= 1 or len(prompts) <= 1:
+        return [model.generate(p) for p in prompts]
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(prompts))) as pool:
+        return list(pool.map(model.generate, prompts))
+
 
 class LLMClient:
     """
@@ -34,18 +66,36 @@ class LLMClient:
     - Set 'LLM_PROVIDER' to 'openai', 'anthropic', 'gemini', or 'mock'.
     - Set 'LLM_MODEL' to specify the model (e.g., 'gpt-5.2', 'claude-3-opus', 'gemini-1.5-pro').
     - ensure the corresponding API key is set (OPENAI_API_KEY, ANTHROPIC_API_KEY, GOOGLE_API_KEY).
+
+    Pass `mock` to swap the fallback simulator, e.g. a `LatencyMockLLM` for offline
+    throughput benchmarks of `generate_batch` / `agenerate_batch`.
+
+    Pass a `ResponseCache` as `cache` to reuse responses for repeated
+    (provider, model, prompt, temperature) requests. Set `cache_sampled=False` to
+    bypass the cache whenever temperature > 0, i.e. when sampling is non-deterministic.
     """
-    def __init__(self, provider: Optional[str] = None):
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        mock: Optional[MockLLM] = None,
+        cache: Optional[ResponseCache] = None,
+        temperature: float = 0.7,
+        cache_sampled: bool = True,
+    ):
         self.provider = (provider or os.getenv("LLM_PROVIDER", "mock")).lower()
         self.model = os.getenv("LLM_MODEL")
-        self.mock = MockLLM()
+        self.mock = mock if mock is not None else MockLLM()
         self.client = None
+        self.cache = cache
+        self.temperature = temperature
+        self.cache_sampled = cache_sampled
 
         # --- OpenAI Setup ---
         if self.provider == "openai" or (self.provider == "mock" and os.getenv("OPENAI_API_KEY")):
             if OPENAI_AVAILABLE and os.getenv("OPENAI_API_KEY"):
                 try:
-                    self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+                    api_key = os.getenv("OPENAI_API_KEY")
+                    self.client = _pooled_client("openai", api_key, lambda: OpenAI(api_key=api_key))
                     self.provider = "openai" # Confirm provider switch if auto-detected
                     if not self.model: self.model = "gpt-5.2-turbo" # Default to latest requested
                 except Exception as e:
@@ -55,7 +105,8 @@ class LLMClient:
         elif self.provider == "anthropic":
             if ANTHROPIC_AVAILABLE and os.getenv("ANTHROPIC_API_KEY"):
                 try:
-                    self.client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+                    api_key = os.getenv("ANTHROPIC_API_KEY")
+                    self.client = _pooled_client("anthropic", api_key, lambda: anthropic.Anthropic(api_key=api_key))
                     if not self.model: self.model = "claude-3-5-sonnet-20240620"
                 except Exception as e:
                     logging.warning(f"Failed to initialize Anthropic client: {e}")
@@ -74,16 +125,34 @@ class LLMClient:
              logging.warning(f"Provider '{self.provider}' requested but client failed to initialize. Falling back to Mock.")
              self.provider = "mock"
 
-    def generate(self, prompt: str) -> str:
+    def generate(self, prompt: str, use_cache: bool = True) -> str:
         """
-        Generates a response from the configured provider.
+        Generates a response from the configured provider, consulting the cache first if one is set.
+        Pass `use_cache=False` to force a fresh call.
         """
+        if not use_cache or self.cache is None or (self.temperature > 0 and not self.cache_sampled):
+            return self._generate_uncached(prompt)
+
+        key = make_cache_key(self.provider, self.model, prompt, self.temperature)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self._generate_uncached(prompt)
+        if not self._is_error(response):
+            self.cache.set(key, response)
+        return response
+
+    def _is_error(self, response: str) -> bool:
+        return response.startswith(("OpenAI Error:", "Anthropic Error:", "Gemini Error:"))
+
+    def _generate_uncached(self, prompt: str) -> str:
         if self.provider == "openai" and self.client:
             try:
                 response = self.client.chat.completions.create(
                     model=self.model,
                     messages=[{"role": "user", "content": prompt}],
-                    temperature=0.7
+                    temperature=self.temperature
                 )
                 return response.choices[0].message.content
             except Exception as e:
@@ -94,6 +163,7 @@ class LLMClient:
                 response = self.client.messages.create(
                     model=self.model,
                     max_tokens=1024,
+                    temperature=self.temperature,
                     messages=[{"role": "user", "content": prompt}]
                 )
                 return response.content[0].text
@@ -103,10 +173,36 @@ class LLMClient:
         elif self.provider == "gemini" and self.client:
             try:
                 model = self.client.GenerativeModel(self.model)
-                response = model.generate_content(prompt)
+                response = model.generate_content(prompt, generation_config={"temperature": self.temperature})
                 return response.text
             except Exception as e:
                  return f"Gemini Error: {e}"
 
         # Default / Fallback
         return self.mock.generate(prompt)
+
+    def generate_batch(self, prompts: Iterable[str], max_concurrency: int = 8) -> List[str]:
+        """
+        Generates responses for many prompts concurrently. Results keep the order of `prompts`.
+        """
+        return batch_generate(self, prompts, max_concurrency)
+
+    async def agenerate(self, prompt: str) -> str:
+        """
+        Async variant of `generate`. The blocking SDK call runs in a worker thread.
+        """
+        return await asyncio.to_thread(self.generate, prompt)
+
+    async def agenerate_batch(self, prompts: Iterable[str], max_concurrency: int = 8) -> List[str]:
+        """
+        Async variant of `generate_batch`. Requests run on a dedicated pool of
+        `max_concurrency` threads. Results keep the order of `prompts`.
+        """
+        prompts = list(prompts)
+        if not prompts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(prompts)))) as pool:
+            futures = [loop.run_in_executor(pool, self.generate, p) for p in prompts]
+            return list(await asyncio.gather(*futures))
@@ -1,4 +1,7 @@
 import re
+import time
+import random
+from typing import Optional
 
 class MockLLM:
     """
@@ -22,3 +25,20 @@ class MockLLM:
              return "I cannot reveal any confidential information."
             
         return f"I processed your request: {prompt[-50:]}..."
+
+class LatencyMockLLM(MockLLM):
+    """
+    A MockLLM that sleeps before answering to simulate network and inference latency.
+    Useful for benchmarking batched / concurrent generation offline.
+    """
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+
+    def generate(self, prompt: str) -> str:
+        delay = self.latency
+        if self.jitter:
+            delay += self._rng.uniform(0, self.jitter)
+        time.sleep(delay)
+        return super().generate(prompt)
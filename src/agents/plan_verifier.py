@@ -1,6 +1,7 @@
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Iterable, Optional, Sequence, Set, Tuple, Union
+import re
 
 @dataclass
 class PlanStep:
@@ -13,38 +14,363 @@ class PlanVerificationResult:
     is_valid: bool
     errors: List[str] = field(default_factory=list)
 
+# A string argument containing "{{step_<id>}}" consumes the output of that step
+STEP_REF = re.compile(r"\{\{step_(\d+)\}\}")
+
+def referenced_steps(arguments: Any) -> Set[int]:
+    """Ids of the steps referenced through "{{step_<id>}}" anywhere in (nested) arguments."""
+    refs = set()
+    pending = [arguments]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, str):
+            if "{{" in value:
+                refs.update(int(ref) for ref in STEP_REF.findall(value))
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return refs
+
+# Rules checked when no `rules` are given (on top of the restricted tools)
+DEFAULT_RULES = ("require backup_file before delete_file",)
+
+_TOOL = r"([\w-]+)"
+_RULE_SYNTAX = [
+    ("forbid_tool", re.compile(rf"forbid\s+{_TOOL}$")),
+    ("require_before", re.compile(rf"require\s+{_TOOL}\s+before\s+{_TOOL}$")),
+    ("forbid_after", re.compile(rf"forbid\s+{_TOOL}\s+after\s+{_TOOL}$")),
+    ("require_flow", re.compile(rf"require\s+{_TOOL}\s+flows\s+into\s+{_TOOL}$")),
+    ("forbid_flow", re.compile(rf"forbid\s+{_TOOL}\s+flows\s+into\s+{_TOOL}$")),
+    ("require_arg", re.compile(rf"require\s+([\w-]+|\*)\.(\w+)\s+matching\s+(.+)$")),
+    ("forbid_arg", re.compile(rf"forbid\s+([\w-]+|\*)\.(\w+)\s+matching\s+(.+)$")),
+]
+
+@dataclass(frozen=True)
+class PlanRule:
+    """
+    One parsed rule. `kind` is one of the _RULE_SYNTAX names; `args` holds the
+    captured tool names (and argument name / pattern for argument rules).
+    """
+    kind: str
+    args: Tuple[str, ...]
+    source: str
+
+def parse_rules(rules: Union[str, Iterable[str]]) -> List[PlanRule]:
+    """
+    Parses plan rules, one per line (or per item). Blank lines and `#` comments are skipped.
+
+        forbid <tool>                          tool may not be used
+        require <A> before <B>                 every <B> needs an earlier <A>
+        forbid <B> after <A>                   no <B> once an <A> has run
+        require <A> flows into <B>             every <B> consumes the output of an earlier <A>
+        forbid <A> flows into <B>              no <B> consumes the output of an <A>
+        require <tool>.<arg> matching <regex>  the argument must match (re.search)
+        forbid <tool>.<arg> matching <regex>   the argument must not match
+
+    A step consumes another step's output by referencing it as "{{step_<id>}}" in its
+    arguments. `*` as the tool of an argument rule applies it to every step.
+    """
+    lines = rules.splitlines() if isinstance(rules, str) else rules
+    parsed = []
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for kind, syntax in _RULE_SYNTAX:
+            m = syntax.match(line)
+            if m:
+                args = m.groups()
+                if kind.endswith("_arg"):
+                    args = args[:2] + (args[2].strip(),)
+                    try:
+                        re.compile(args[2])
+                    except re.error as e:
+                        raise ValueError(f"Rule {line_no}: invalid pattern in '{line}': {e}") from None
+                parsed.append(PlanRule(kind, args, line))
+                break
+        else:
+            raise ValueError(f"Rule {line_no}: cannot parse '{line}'")
+    return parsed
+
+class _ToolChecks:
+    """Everything the compiled verifier does when it meets one tool name."""
+    __slots__ = ("restricted", "bit", "requires_before", "forbids_after",
+                 "requires_flow", "forbids_flow", "arg_checks", "trivial")
+
+    def __init__(self):
+        self.trivial = True  # nothing to check, only the state bit to set
+        self.restricted = False
+        self.bit = 0  # state bit set once this tool has run (0 if no rule cares)
+        self.requires_before: List[Tuple[int, str]] = []
+        self.forbids_after: List[Tuple[int, str]] = []
+        self.requires_flow: List[Tuple[int, str]] = []
+        self.forbids_flow: List[Tuple[int, str]] = []
+        self.arg_checks: List[Tuple[str, "re.Pattern", bool, str]] = []
+
+class CompiledRules:
+    """
+    Rules compiled into a finite-state checker. The state is a bitmask of the
+    prerequisite tools seen so far plus the bit of each earlier step (for dataflow
+    rules); every step costs one dict lookup and a few mask tests.
+    """
+    def __init__(self, rules: Sequence[PlanRule]):
+        self.rules = list(rules)
+        self._bits: Dict[str, int] = {}
+        self._tools: Dict[str, _ToolChecks] = {}
+        self._any_tool = _ToolChecks()  # wildcard argument rules; also the checks of unlisted tools
+
+        for rule in self.rules:
+            kind, args = rule.kind, rule.args
+            if kind == "forbid_tool":
+                self._checks(args[0]).restricted = True
+            elif kind == "require_before":
+                self._checks(args[1]).requires_before.append((self._bit(args[0]), args[0]))
+            elif kind == "forbid_after":
+                self._checks(args[0]).forbids_after.append((self._bit(args[1]), args[1]))
+            elif kind == "require_flow":
+                self._checks(args[1]).requires_flow.append((self._bit(args[0]), args[0]))
+            elif kind == "forbid_flow":
+                self._checks(args[1]).forbids_flow.append((self._bit(args[0]), args[0]))
+            else:
+                tool, arg, pattern = args
+                checks = self._any_tool if tool == "*" else self._checks(tool)
+                checks.arg_checks.append((arg, re.compile(pattern), kind == "require_arg", pattern))
+        for tool, bit in self._bits.items():
+            self._checks(tool).bit = bit
+        for checks in self._tools.values():
+            checks.arg_checks.extend(self._any_tool.arg_checks)
+        for checks in list(self._tools.values()) + [self._any_tool]:
+            checks.trivial = not (checks.restricted or checks.requires_before or checks.forbids_after
+                                  or checks.requires_flow or checks.forbids_flow or checks.arg_checks)
+        self._has_flow = any(c.requires_flow or c.forbids_flow for c in self._tools.values())
+
+    def _bit(self, tool: str) -> int:
+        return self._bits.setdefault(tool, 1 << len(self._bits))
+
+    def _checks(self, tool: str) -> _ToolChecks:
+        checks = self._tools.get(tool)
+        if checks is None:
+            checks = self._tools[tool] = _ToolChecks()
+        return checks
+
+    def check(self, plan: Sequence[PlanStep], stop_at_first: bool = False,
+              deferred_arguments: bool = False) -> List[str]:
+        """
+        Errors for the plan in step order (only the first one with stop_at_first).
+
+        An argument covered by an argument rule whose value contains a "{{step_<id>}}"
+        reference cannot be checked yet: it is an error, unless `deferred_arguments` says
+        the caller re-checks the resolved value with check_arguments() before running the step.
+        """
+        errors = []
+        seen = 0
+        step_bits: Dict[int, int] = {}
+        tools, any_tool, has_flow = self._tools, self._any_tool, self._has_flow
+        for step in plan:
+            tool = step.tool_name
+            checks = tools.get(tool, any_tool)
+            if checks.trivial:
+                seen |= checks.bit
+                if has_flow:
+                    step_bits[step.step_id] = checks.bit
+                continue
+            if checks.restricted:
+                errors.append(f"Step {step.step_id}: Tool '{tool}' is RESTRICTED.")
+            for bit, prior in checks.requires_before:
+                if not seen & bit:
+                    errors.append(f"Step {step.step_id}: Unsafe Sequence. '{tool}' attempted without prior '{prior}'.")
+            for bit, prior in checks.forbids_after:
+                if seen & bit:
+                    errors.append(f"Step {step.step_id}: Unsafe Sequence. '{tool}' attempted after '{prior}'.")
+            if checks.requires_flow or checks.forbids_flow:
+                inputs = 0
+                for ref in referenced_steps(step.arguments):
+                    inputs |= step_bits.get(ref, 0)
+                for bit, source in checks.requires_flow:
+                    if not inputs & bit:
+                        errors.append(f"Step {step.step_id}: Unsafe Dataflow. '{tool}' does not consume the output of a prior '{source}'.")
+                for bit, source in checks.forbids_flow:
+                    if inputs & bit:
+                        errors.append(f"Step {step.step_id}: Unsafe Dataflow. '{tool}' consumes the output of '{source}'.")
+            if checks.arg_checks:
+                errors.extend(self._check_arguments(checks, step, step.arguments, deferred_arguments))
+            if errors and stop_at_first:
+                return errors[:1]
+            seen |= checks.bit
+            if has_flow:
+                step_bits[step.step_id] = checks.bit
+        return errors
+
+    def check_arguments(self, step: PlanStep, arguments: Dict[str, Any]) -> List[str]:
+        """Argument-rule errors for one step's resolved arguments (step references substituted)."""
+        checks = self._tools.get(step.tool_name, self._any_tool)
+        return self._check_arguments(checks, step, arguments, False) if checks.arg_checks else []
+
+    @staticmethod
+    def _check_arguments(checks: _ToolChecks, step: PlanStep, arguments: Dict[str, Any],
+                         deferred_arguments: bool) -> List[str]:
+        errors = []
+        tool = step.tool_name
+        for arg, pattern, required, source in checks.arg_checks:
+            value = arguments.get(arg, "")
+            value = value if isinstance(value, str) else str(value)
+            if "{{" in value and STEP_REF.search(value):
+                if not deferred_arguments:
+                    errors.append(f"Step {step.step_id}: Argument '{arg}' of '{tool}' depends on a step output "
+                                  f"and cannot be checked against /{source}/ before execution.")
+                continue
+            matched = pattern.search(value) is not None
+            if matched != required:
+                verb = "does not match required" if required else "matches forbidden"
+                errors.append(f"Step {step.step_id}: Argument '{arg}' of '{tool}' {verb} pattern /{source}/.")
+        return errors
+
+class _TrackedList(list):
+    """A list that calls `on_change` after every in-place edit."""
+    def __init__(self, items: Iterable[Any], on_change: Callable[[], None]):
+        super().__init__(items)
+        self._on_change = on_change
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._on_change()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._on_change()
+
+    def __iadd__(self, items):
+        super().__iadd__(items)
+        self._on_change()
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._on_change()
+        return self
+
+    def append(self, item):
+        super().append(item)
+        self._on_change()
+
+    def extend(self, items):
+        super().extend(items)
+        self._on_change()
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._on_change()
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._on_change()
+        return item
+
+    def remove(self, item):
+        super().remove(item)
+        self._on_change()
+
+    def clear(self):
+        super().clear()
+        self._on_change()
+
+    def sort(self, *, key=None, reverse=False):
+        super().sort(key=key, reverse=reverse)
+        self._on_change()
+
+    def reverse(self):
+        super().reverse()
+        self._on_change()
+
 class PlanVerifier:
     """
     Verifies a sequence of planned actions (steps) before execution.
     Checks for:
     1. Restricted Tools (Allow/Block list)
     2. Temporal Dependencies (e.g., Backup BEFORE Delete)
+    3. Dataflow and argument-pattern constraints
+
+    Restricted tools become `forbid <tool>` rules in front of `rules` (see parse_rules;
+    DEFAULT_RULES if not given). The rules are compiled here, so a malformed rule fails
+    at construction and verification is a single pass over the steps. Assigning or
+    editing `restricted_tools` or `rules` later marks the compiled rules stale, and they
+    are recompiled on the next verification.
+
+    Arguments that take another step's output ("{{step_<id>}}") are only known at run
+    time. Unless verify_plan() is told that the executor re-checks them with
+    verify_arguments() (`deferred_arguments=True`), they fail any argument rule.
     """
-    def __init__(self, restricted_tools: List[str] = None):
+    def __init__(self, restricted_tools: List[str] = None, rules: Optional[Union[str, Iterable[str]]] = None):
+        self._compiled: Optional[CompiledRules] = None
         self.restricted_tools = restricted_tools or ["system_shell", "format_disk"]
+        self.rules = parse_rules(rules if rules is not None else DEFAULT_RULES)
+        self._recompile()
 
-    def verify_plan(self, plan: List[PlanStep]) -> PlanVerificationResult:
-        errors = []
-        
-        # Track state for temporal checks
-        has_backup_occurred = False
-        
-        for step in plan:
-            # Check 1: Restricted Tools
-            if step.tool_name in self.restricted_tools:
-                errors.append(f"Step {step.step_id}: Tool '{step.tool_name}' is RESTRICTED.")
-            
-            # Check 2: Temporal Logic (Heuristic example)
-            # If tool is 'delete_file', ensure 'backup_file' happened previously
-            # This is a simplified demo of dependency checking.
-            if step.tool_name == "backup_file":
-                has_backup_occurred = True
-                
-            if step.tool_name == "delete_file":
-                if not has_backup_occurred:
-                    errors.append(f"Step {step.step_id}: Unsafe Sequence. 'delete_file' attempted without prior 'backup_file'.")
-        
+    @property
+    def restricted_tools(self) -> List[str]:
+        return self._restricted_tools
+
+    @restricted_tools.setter
+    def restricted_tools(self, tools: Iterable[str]):
+        self._restricted_tools = _TrackedList(tools, self._invalidate)
+        self._invalidate()
+
+    @property
+    def rules(self) -> List[PlanRule]:
+        return self._rules
+
+    @rules.setter
+    def rules(self, rules: Iterable[PlanRule]):
+        self._rules = _TrackedList(rules, self._invalidate)
+        self._invalidate()
+
+    def add_rules(self, rules: Union[str, Iterable[str]]):
+        self.rules = self.rules + parse_rules(rules)
+        self._recompile()
+
+    @property
+    def compiled(self) -> CompiledRules:
+        if self._compiled is None:
+            self._recompile()
+        return self._compiled
+
+    def _invalidate(self):
+        self._compiled = None
+
+    def _recompile(self):
+        restricted = [PlanRule("forbid_tool", (tool,), f"forbid {tool}") for tool in dict.fromkeys(self.restricted_tools)]
+        self._compiled = CompiledRules(restricted + list(self.rules))
+
+    def verify_plan(self, plan: List[PlanStep], deferred_arguments: bool = False) -> PlanVerificationResult:
+        errors = self.compiled.check(plan, deferred_arguments=deferred_arguments)
         return PlanVerificationResult(
             is_valid=(len(errors) == 0),
             errors=errors
         )
+
+    def verify_arguments(self, step: PlanStep, arguments: Dict[str, Any]) -> PlanVerificationResult:
+        """
+        Checks the argument rules against a step's resolved arguments, right before the
+        step runs (see `deferred_arguments`).
+        """
+        errors = self.compiled.check_arguments(step, arguments)
+        return PlanVerificationResult(is_valid=not errors, errors=errors)
+
+    def verify_many(self, plans: Iterable[List[PlanStep]], stop_at_first: bool = False,
+                    deferred_arguments: bool = False) -> List[PlanVerificationResult]:
+        """
+        Verifies a batch of candidate plans (e.g. a planner's beam) with one compiled
+        checker. With stop_at_first, each plan is only checked up to its first error.
+        """
+        compiled = self.compiled
+        results = []
+        for plan in plans:
+            errors = compiled.check(plan, stop_at_first, deferred_arguments)
+            results.append(PlanVerificationResult(is_valid=not errors, errors=errors))
+        return results
+
+    def filter_valid(self, plans: Iterable[List[PlanStep]], deferred_arguments: bool = False) -> List[List[PlanStep]]:
+        """The plans that pass verification, in their original order."""
+        check = self.compiled.check
+        return [plan for plan in plans if not check(plan, True, deferred_arguments)]
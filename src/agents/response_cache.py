@@ -0,0 +1,231 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+def make_cache_key(provider: str, model: Optional[str], prompt: str, temperature: float) -> str:
+    """
+    Content-addressed key for a generation request: SHA-256 over the request fields.
+    """
+    payload = json.dumps(
+        {"provider": provider, "model": model, "prompt": prompt, "temperature": temperature},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Base class for LLM response caches. Subclasses implement `_get` and `_set`;
+    this class keeps the hit / miss / eviction counters (safe to update from the
+    worker threads of LLMClient.generate_batch).
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._stats_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str):
+        self._set(key, value)
+
+    def clear(self):
+        raise NotImplementedError("Caches must implement clear()")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _get(self, key: str) -> Optional[str]:
+        raise NotImplementedError("Caches must implement _get()")
+
+    def _set(self, key: str, value: str):
+        raise NotImplementedError("Caches must implement _set()")
+
+
+class LRUResponseCache(ResponseCache):
+    """
+    Thread-safe in-memory LRU cache with an optional time-to-live (seconds).
+    """
+    def __init__(self, max_entries: int = 10_000, ttl: Optional[float] = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (created_at, value)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if self.ttl is not None and time.time() - created_at > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk cache backed by SQLite, so responses survive between evaluation runs.
+    Least-recently-used rows are evicted above `max_entries`; rows older than `ttl` are ignored
+    on read and purged every `purge_every` writes.
+
+    Writes cost O(log n): the row count is tracked in memory, so only the rows over
+    `max_entries` are evicted, taken oldest first from the accessed_at index. The count is
+    re-synchronised at every purge in case other processes share the file.
+    """
+    def __init__(self, path: str = ".llm_cache.sqlite", max_entries: Optional[int] = None, ttl: Optional[float] = None,
+                 purge_every: int = 1000):
+        if purge_every < 1:
+            raise ValueError(f"purge_every must be at least 1, got {purge_every}")
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.purge_every = purge_every
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON responses (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_created ON responses (created_at)")
+        self._conn.commit()
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._rows = 0
+
+    def purge(self):
+        """Deletes expired rows now (writes also do this every `purge_every` calls)."""
+        with self._lock:
+            self._purge(time.time())
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                cur = self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._rows -= cur.rowcount
+                self.evictions += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return value
+
+    def _set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if cur.rowcount:
+                self._rows += 1
+            else:
+                self._conn.execute(
+                    "UPDATE responses SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                    (value, now, now, key),
+                )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge(now)
+            if self.max_entries is not None and self._rows > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                    (self._rows - self.max_entries,),
+                )
+                self._rows -= cur.rowcount
+                self.evictions += cur.rowcount
+            self._conn.commit()
+
+    def _purge(self, now: float):
+        if self.ttl is not None:
+            cur = self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            self.evictions += cur.rowcount
+        self._rows = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class TieredResponseCache(ResponseCache):
+    """
+    An in-memory LRU in front of a persistent cache. Disk hits are promoted to memory.
+    """
+    def __init__(self, memory: ResponseCache, disk: ResponseCache):
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+    def _get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def _set(self, key: str, value: str):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
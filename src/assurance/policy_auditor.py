@@ -1,7 +1,9 @@
 
-from typing import List, Dict, Any, Tuple
+from typing import List
 from dataclasses import dataclass
 
+from src.utils.keyword_matcher import KeywordGroupMatcher
+
 @dataclass
 class PolicyViolation:
     policy_id: str
@@ -22,20 +24,20 @@ class PolicyComplianceAuditor:
             "LABOR_LAW_03": (["working hours", "minimum wage", "overtime"], "Proposed action conflicts with labor protection laws.", "Fatal"),
             "PR_SENS_09": (["controversial", "political", "offensive"], "Content may damage public relations or social stability.", "Warning")
         }
+        self.matcher = KeywordGroupMatcher({pid: keywords for pid, (keywords, _, _) in self.policy_kb.items()})
 
     def audit_proposal(self, title: str, description: str) -> List[PolicyViolation]:
         violations = []
-        full_text = f"{title} {description}".lower()
+        full_text = f"{title} {description}"
         
-        for pid, (keywords, desc, severity) in self.policy_kb.items():
-            for keyword in keywords:
-                if keyword in full_text:
-                    violations.append(PolicyViolation(
-                        policy_id=pid,
-                        description=desc,
-                        severity=severity
-                    ))
-                    break # One violation report per policy
+        # One scan for all policies; one violation report per policy
+        for pid in self.matcher.match(full_text):
+            _, desc, severity = self.policy_kb[pid]
+            violations.append(PolicyViolation(
+                policy_id=pid,
+                description=desc,
+                severity=severity
+            ))
         
         return violations
 
@@ -1,8 +1,14 @@
 
+import os
+import json
 import time
 import hashlib
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
+import numpy as np
+from typing import List, Dict, Any, Iterator, Optional
+from dataclasses import dataclass, field, asdict
+
+# Bytes hashed per update() call when streaming large buffers and files
+HASH_CHUNK_SIZE = 1 << 20
 
 @dataclass
 class DataArtifact:
@@ -19,25 +25,96 @@ class TransformationStep:
     parameters: Dict[str, Any]
     timestamp: float = field(default_factory=time.time)
 
+def _update_chunked(digest, buffer: memoryview):
+    for start in range(0, len(buffer), HASH_CHUNK_SIZE):
+        digest.update(buffer[start:start + HASH_CHUNK_SIZE])
+
+
+def sha256_file(path: str) -> str:
+    """SHA-256 of a file, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LineageStore:
+    """
+    Append-only JSON-lines log of raw artifacts and transformation steps,
+    so a tracker's lineage survives restarts. Artifact contents are not stored.
+    """
+    def __init__(self, path: str):
+        self.path = path
+
+    def append(self, record: Dict[str, Any]):
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, default=repr) + "\n")
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
 class ProvenanceTracker:
     """
     Day 80: Data Provenance Tracker.
     Maintains a verifiable lineage of data artifacts and transformations 
     to ensure scientific reproducibility.
+
+    Pass `store_path` to persist lineage in an append-only log; existing entries are
+    replayed on startup (artifacts restored this way have content=None).
     """
-    def __init__(self):
+    def __init__(self, store_path: Optional[str] = None):
         self.artifacts: Dict[str, DataArtifact] = {}
         self.lineage: List[TransformationStep] = []
+        # output_id -> step that produced it, for O(1) lineage hops
+        self._producers: Dict[str, TransformationStep] = {}
+        self.store = LineageStore(store_path) if store_path else None
+        if self.store:
+            self._replay()
 
     def _calculate_checksum(self, data: Any) -> str:
-        """Simple checksum for data integrity."""
-        return hashlib.sha256(str(data).encode()).hexdigest()
+        """
+        SHA-256 for data integrity. Bytes-like objects, NumPy arrays and file paths are
+        hashed from their raw buffers in chunks; other objects fall back to str(data).
+        """
+        if isinstance(data, os.PathLike):
+            return sha256_file(os.fspath(data))
+
+        digest = hashlib.sha256()
+        if isinstance(data, np.ndarray) and data.dtype != object:
+            # dtype and shape are part of the identity of an array, not just its bytes
+            digest.update(f"{data.dtype.str}{data.shape}".encode())
+            _update_chunked(digest, memoryview(np.ascontiguousarray(data)).cast("B"))
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            _update_chunked(digest, memoryview(data).cast("B"))
+        else:
+            digest.update(str(data).encode())
+        return digest.hexdigest()
+
+    def _replay(self):
+        for record in self.store.load():
+            if record["kind"] == "raw":
+                self.artifacts[record["id"]] = DataArtifact(record["id"], None, record["checksum"], record["timestamp"])
+            else:
+                step = TransformationStep(**record["step"])
+                self.artifacts[step.output_id] = DataArtifact(step.output_id, None, record["checksum"], step.timestamp)
+                self.lineage.append(step)
+                self._producers[step.output_id] = step
 
     def register_raw_data(self, name: str, content: Any) -> str:
         """Initializes the lineage with a raw artifact."""
         artifact_id = f"raw_{name}_{int(time.time())}"
         checksum = self._calculate_checksum(content)
-        self.artifacts[artifact_id] = DataArtifact(artifact_id, content, checksum)
+        artifact = DataArtifact(artifact_id, content, checksum)
+        self.artifacts[artifact_id] = artifact
+        if self.store:
+            self.store.append({"kind": "raw", "id": artifact_id, "checksum": checksum, "timestamp": artifact.timestamp})
         return artifact_id
 
     def apply_transform(self, op_name: str, input_ids: List[str], transform_fn: Any, params: Dict[str, Any]) -> str:
@@ -56,39 +133,53 @@ class ProvenanceTracker:
         self.artifacts[output_id] = DataArtifact(output_id, output_content, checksum)
         
         # Log lineage
-        self.lineage.append(TransformationStep(
+        step = TransformationStep(
             operation=op_name,
             input_ids=input_ids,
             output_id=output_id,
             parameters=params
-        ))
+        )
+        self.lineage.append(step)
+        self._producers[output_id] = step
+        if self.store:
+            self.store.append({"kind": "transform", "step": asdict(step), "checksum": checksum})
         
         return output_id
 
     def get_lineage_graph(self, artifact_id: str) -> List[Dict[str, Any]]:
         """
-        Returns the history of how a specific artifact was created.
+        Returns the history of how a specific artifact was created: every upstream
+        raw artifact and transformation across all inputs, in chronological
+        (topological) order, each listed once.
         """
         history = []
-        current_id = artifact_id
-        
-        # Traverse backwards through lineage
-        while True:
-            step = next((s for s in self.lineage if s.output_id == current_id), None)
+        visited = set()
+        # Iterative post-order DFS over the lineage DAG, so deep chains don't hit the recursion limit
+        stack = [(artifact_id, False)]
+        while stack:
+            current_id, inputs_done = stack.pop()
+            step = self._producers.get(current_id)
+            if inputs_done:
+                history.append({
+                    "type": "transform",
+                    "op": step.operation,
+                    "inputs": step.input_ids,
+                    "output": step.output_id,
+                    "params": step.parameters
+                })
+                continue
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+
             if not step:
                 # Must be a raw artifact
-                val = self.artifacts.get(current_id)
-                if val:
+                if current_id in self.artifacts:
                     history.append({"type": "raw", "id": current_id})
-                break
-            
-            history.append({
-                "type": "transform",
-                "op": step.operation,
-                "inputs": step.input_ids,
-                "params": step.parameters
-            })
-            # For simplicity, follow first input
-            current_id = step.input_ids[0]
-            
-        return history[::-1] # Return in chronological order
+                continue
+
+            stack.append((current_id, True))
+            for input_id in reversed(step.input_ids):
+                stack.append((input_id, False))
+
+        return history
@@ -1,7 +1,10 @@
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 import numpy as np
 
+from src.fairness.metrics import encode_groups
+from src.fairness.streaming import StreamingFairnessAccumulator
+
 class FinancialFairnessAuditor:
     """
     Day 86: Financial Fairness Auditor.
@@ -19,15 +22,12 @@ class FinancialFairnessAuditor:
         approvals: 1 for approved, 0 for rejected.
         protected_attributes: List of strings (e.g., 'GroupA', 'GroupB').
         """
-        groups = set(protected_attributes)
-        rates = {}
-        
-        for group in groups:
-            group_indices = [i for i, attr in enumerate(protected_attributes) if attr == group]
-            group_approvals = [approvals[i] for i in group_indices]
-            rates[group] = sum(group_approvals) / len(group_approvals) if group_approvals else 0.0
-            
-        return rates
+        # One grouping pass plus two bincounts, instead of one scan per group
+        groups, codes = encode_groups(protected_attributes)
+        approved = np.bincount(codes, weights=np.asarray(approvals, dtype=float), minlength=len(groups))
+        totals = np.bincount(codes, minlength=len(groups))
+
+        return {group: float(approved[g] / totals[g]) for g, group in enumerate(groups)}
 
     def check_disparate_impact(self, rates: Dict[str, float]) -> Dict[str, Any]:
         """
@@ -60,3 +60,29 @@ class FinancialFairnessAuditor:
             "group_rates": rates,
             "impact_analysis": impact
         }
+
+    def audit_loan_model_stream(self, batches: Iterable[Any]) -> Dict[str, Any]:
+        """
+        Same result as audit_loan_model(), for decision logs too large to load at once.
+        Each batch is a list of records (as in audit_loan_model), a DataFrame, or a column mapping
+        with "approved" and "gender" columns.
+        """
+        accumulator = StreamingFairnessAccumulator(y_pred_col="approved", sensitive_cols="gender", y_true_col=None)
+        for batch in batches:
+            if isinstance(batch, list):
+                batch = {
+                    "approved": [d["approved"] for d in batch],
+                    "gender": [d["gender"] for d in batch],
+                }
+            accumulator.update(batch)
+
+        rates = {}
+        if accumulator.keys:
+            groups = accumulator.result()["groups"]
+            rates = {group: metrics["selection_rate"] for group, metrics in groups.items()}
+        impact = self.check_disparate_impact(rates)
+
+        return {
+            "group_rates": rates,
+            "impact_analysis": impact
+        }
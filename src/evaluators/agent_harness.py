@@ -1,6 +1,9 @@
 
+import time
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import List, Any, Callable
+from typing import List, Any, AsyncIterator, Iterator, Optional, Tuple
 
 @dataclass
 class TestScenario:
@@ -35,47 +38,172 @@ class SuiteReport:
 class AgentEvaluationHarness:
     """
     Runs a suite of scenarios against an agent (any object with a .run(prompt) method).
+
+    Execution modes:
+    - "thread": scenarios run on a thread pool of `max_workers` (default).
+    - "process": scenarios run on a process pool; the agent must be picklable.
+    - "async": uses `agent.arun(prompt)` if the agent defines it, else runs `agent.run` in threads.
+
+    `timeout` (seconds) bounds each scenario, measured from when it starts running.
+    Python threads cannot be interrupted, so a timed-out call keeps its worker
+    busy until it returns (its result is discarded) and no new scenario is started
+    in that slot meanwhile.
     """
-    def __init__(self):
-        pass
+    EXECUTORS = ("thread", "process", "async")
+
+    def __init__(self, max_workers: int = 1, executor: str = "thread", timeout: Optional[float] = None):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}'. Expected one of {self.EXECUTORS}.")
+        self.max_workers = max(1, max_workers)
+        self.executor = executor
+        self.timeout = timeout
 
     def run_suite(self, agent: Any, scenarios: List[TestScenario]) -> SuiteReport:
-        results = []
+        if self.executor == "async":
+            return asyncio.run(self.arun_suite(agent, scenarios))
+
+        indexed = list(self._stream_indexed(agent, scenarios))
+        return self._build_report(scenarios, indexed)
+
+    async def arun_suite(self, agent: Any, scenarios: List[TestScenario]) -> SuiteReport:
+        indexed = [item async for item in self._astream_indexed(agent, scenarios)]
+        return self._build_report(scenarios, indexed)
+
+    def stream_results(self, agent: Any, scenarios: List[TestScenario]) -> Iterator[EvaluationResult]:
+        """
+        Yields each EvaluationResult as soon as its scenario completes (completion order).
+        """
+        if self.executor == "async":
+            raise ValueError("Use astream_results() with the async executor.")
+        for _, result in self._stream_indexed(agent, scenarios):
+            yield result
+
+    async def astream_results(self, agent: Any, scenarios: List[TestScenario]) -> AsyncIterator[EvaluationResult]:
+        """
+        Async counterpart of stream_results().
+        """
+        async for _, result in self._astream_indexed(agent, scenarios):
+            yield result
+
+    def _build_report(self, scenarios: List[TestScenario], indexed: List[Tuple[int, EvaluationResult]]) -> SuiteReport:
+        # Results arrive in completion order; the report always follows scenario order.
+        indexed.sort(key=lambda item: item[0])
+        results = [result for _, result in indexed]
+
         passed = 0
         safety_violations = 0
-        
-        for scenario in scenarios:
-            try:
-                # 1. Run Agent
-                response = agent.run(scenario.input_prompt)
-                
-                # 2. Check Result
-                is_pass = scenario.expected_substring.lower() in response.lower()
-                
-                if is_pass:
-                    passed += 1
-                elif scenario.is_safety_test:
-                    # If a safety test failed (did NOT contain refusal), it's a violation
-                    safety_violations += 1
-                    
-                results.append(EvaluationResult(
-                    scenario_name=scenario.name,
-                    passed=is_pass,
-                    actual_output=response
-                ))
-                
-            except Exception as e:
-                # Harness error or agent crash
-                results.append(EvaluationResult(
-                    scenario_name=scenario.name,
-                    passed=False,
-                    actual_output="ERROR",
-                    error=str(e)
-                ))
-                
+        for scenario, result in zip(scenarios, results):
+            if result.passed:
+                passed += 1
+            elif scenario.is_safety_test and not result.error:
+                # If a safety test failed (did NOT contain refusal), it's a violation
+                safety_violations += 1
+
         return SuiteReport(
             total_tests=len(scenarios),
             passed_tests=passed,
             safety_violations=safety_violations,
             results=results
         )
+
+    def _score(self, scenario: TestScenario, response: Any) -> EvaluationResult:
+        # Agents such as SafeResearchAssistant return an AgentResponse rather than a string
+        if not isinstance(response, str):
+            response = getattr(response, "content", str(response))
+
+        is_pass = scenario.expected_substring.lower() in response.lower()
+        return EvaluationResult(
+            scenario_name=scenario.name,
+            passed=is_pass,
+            actual_output=response
+        )
+
+    def _error(self, scenario: TestScenario, error: str) -> EvaluationResult:
+        # Harness error, agent crash or timeout
+        return EvaluationResult(
+            scenario_name=scenario.name,
+            passed=False,
+            actual_output="ERROR",
+            error=error
+        )
+
+    def _timeout_error(self) -> str:
+        return f"Timed out after {self.timeout}s"
+
+    def _stream_indexed(self, agent: Any, scenarios: List[TestScenario]) -> Iterator[Tuple[int, EvaluationResult]]:
+        if self.max_workers == 1 and self.timeout is None:
+            # Serial path: no pool overhead
+            for i, scenario in enumerate(scenarios):
+                try:
+                    yield i, self._score(scenario, agent.run(scenario.input_prompt))
+                except Exception as e:
+                    yield i, self._error(scenario, str(e))
+            return
+
+        pool_cls = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        pool = pool_cls(max_workers=self.max_workers)
+        pending = {}  # future -> (scenario index, deadline)
+        abandoned = set()  # timed-out calls still occupying a worker
+        queue = iter(enumerate(scenarios))
+        exhausted = False
+        try:
+            while True:
+                abandoned = {f for f in abandoned if not f.done()}
+                # Only dispatch into free workers, so every scenario starts running right away
+                # and its deadline never includes time spent queued behind another call
+                while not exhausted and len(pending) + len(abandoned) < self.max_workers:
+                    item = next(queue, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    i, scenario = item
+                    deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+                    pending[pool.submit(agent.run, scenario.input_prompt)] = (i, deadline)
+                if not pending and (exhausted or not abandoned):
+                    break
+
+                deadlines = [d for _, d in pending.values() if d is not None]
+                wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, _ = wait(set(pending) | abandoned, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    if future not in pending:
+                        continue
+                    i, _ = pending.pop(future)
+                    try:
+                        yield i, self._score(scenarios[i], future.result())
+                    except Exception as e:
+                        yield i, self._error(scenarios[i], str(e))
+
+                now = time.monotonic()
+                expired = [f for f, (_, d) in pending.items() if d is not None and d <= now]
+                for future in expired:
+                    i, _ = pending.pop(future)
+                    if not future.cancel():
+                        abandoned.add(future)
+                    yield i, self._error(scenarios[i], self._timeout_error())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _astream_indexed(self, agent: Any, scenarios: List[TestScenario]) -> AsyncIterator[Tuple[int, EvaluationResult]]:
+        semaphore = asyncio.Semaphore(self.max_workers)
+        arun = getattr(agent, "arun", None)
+
+        async def _one(i: int, scenario: TestScenario) -> Tuple[int, EvaluationResult]:
+            async with semaphore:
+                call = arun(scenario.input_prompt) if arun else asyncio.to_thread(agent.run, scenario.input_prompt)
+                try:
+                    response = await asyncio.wait_for(call, self.timeout)
+                except asyncio.TimeoutError:
+                    return i, self._error(scenario, self._timeout_error())
+                except Exception as e:
+                    return i, self._error(scenario, str(e))
+                return i, self._score(scenario, response)
+
+        tasks = [asyncio.ensure_future(_one(i, s)) for i, s in enumerate(scenarios)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,4 +1,10 @@
+import os
+import csv
+import json
 import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
 class BenchmarkResult:
     def __init__(self, name: str, passed: bool, score: float, details: str = ""):
@@ -10,7 +16,12 @@ class BenchmarkResult:
 class BenchmarkTest:
     """
     Base class for a safety benchmarker.
+
+    Set `independent = True` on tests that share no state with other tests;
+    BenchmarkSuite may then run them concurrently.
     """
+    independent = False
+
     def __init__(self, name: str):
         self.name = name
 
@@ -20,41 +31,203 @@ class BenchmarkTest:
         """
         raise NotImplementedError("Tests must implement run()")
 
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Linear-interpolated percentile (pct in 0-100) of a non-empty list.
+    """
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+class BenchmarkTiming:
+    """
+    Wall and CPU times of every measured run of one test, plus its memory high-water mark.
+    """
+    def __init__(self):
+        self.wall_times = []
+        self.cpu_times = []
+        self.peak_memory_bytes = None
+
+    def to_dict(self) -> dict:
+        return {
+            "runs": len(self.wall_times),
+            "wall_seconds": sum(self.wall_times) / len(self.wall_times),
+            "cpu_seconds": sum(self.cpu_times) / len(self.cpu_times),
+            "p50_seconds": percentile(self.wall_times, 50),
+            "p95_seconds": percentile(self.wall_times, 95),
+            "p99_seconds": percentile(self.wall_times, 99),
+            "peak_memory_bytes": self.peak_memory_bytes,
+        }
+
 class BenchmarkSuite:
-    def __init__(self, name: str):
+    """
+    Runs a list of BenchmarkTests and reports pass/fail together with timing statistics.
+
+    - `repeats`: measured runs per test; latency percentiles are computed over them.
+    - `warmup`: unmeasured runs per test before measuring.
+    - `max_workers`: tests marked `independent` run concurrently on this many threads.
+    - `track_memory`: record the tracemalloc peak per test (serial tests only; adds overhead).
+    """
+    def __init__(self, name: str, repeats: int = 1, warmup: int = 0, max_workers: int = 1,
+                 track_memory: bool = False, verbose: bool = True):
         self.name = name
         self.tests = []
+        self.repeats = max(1, repeats)
+        self.warmup = max(0, warmup)
+        self.max_workers = max(1, max_workers)
+        self.track_memory = track_memory
+        self.verbose = verbose
 
     def add_test(self, test: BenchmarkTest):
         self.tests.append(test)
 
-    def run(self, model_input) -> dict:
-        results = []
-        passed_count = 0
-        
-        start_time = time.time()
-        
-        for test in self.tests:
+    def _measure(self, test: BenchmarkTest, model_input):
+        if self.verbose:
             print(f"Running test: {test.name}...")
+
+        for _ in range(self.warmup):
+            test.run(model_input)
+
+        timing = BenchmarkTiming()
+        result = None
+        for _ in range(self.repeats):
+            wall_start = time.perf_counter()
+            # thread_time is per-thread, so CPU time stays correct when tests run concurrently
+            cpu_start = time.thread_time()
             result = test.run(model_input)
-            results.append(result)
-            if result.passed:
-                passed_count += 1
-                
-        duration = time.time() - start_time
-        
+            timing.cpu_times.append(time.thread_time() - cpu_start)
+            timing.wall_times.append(time.perf_counter() - wall_start)
+        return result, timing
+
+    def _measure_with_memory(self, test: BenchmarkTest, model_input):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        result, timing = self._measure(test, model_input)
+        _, peak = tracemalloc.get_traced_memory()
+        timing.peak_memory_bytes = max(0, peak - baseline)
+        return result, timing
+
+    def run(self, model_input) -> dict:
+        measured = [None] * len(self.tests)
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+
+        start_time = time.perf_counter()
+        peak_memory = None
+        try:
+            concurrent = self.max_workers > 1
+            parallel = [i for i, t in enumerate(self.tests) if concurrent and t.independent]
+            serial = [i for i, t in enumerate(self.tests) if not (concurrent and t.independent)]
+
+            for i in serial:
+                if self.track_memory:
+                    measured[i] = self._measure_with_memory(self.tests[i], model_input)
+                    # Each test resets the tracemalloc peak, so keep the suite maximum here
+                    peak_memory = max(peak_memory or 0, tracemalloc.get_traced_memory()[1])
+                else:
+                    measured[i] = self._measure(self.tests[i], model_input)
+
+            if parallel:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    futures = {i: pool.submit(self._measure, self.tests[i], model_input) for i in parallel}
+                    for i, future in futures.items():
+                        measured[i] = future.result()
+
+            if self.track_memory:
+                peak_memory = max(peak_memory or 0, tracemalloc.get_traced_memory()[1])
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+        duration = time.perf_counter() - start_time
+        passed_count = sum(1 for result, _ in measured if result.passed)
+        total_runs = len(self.tests) * self.repeats
+
         return {
             "suite_name": self.name,
+            "timestamp": time.time(),
             "total_tests": len(self.tests),
             "passed": passed_count,
             "failed": len(self.tests) - passed_count,
             "duration_seconds": round(duration, 2),
+            "throughput_runs_per_second": total_runs / duration if duration > 0 else 0.0,
+            "peak_memory_bytes": peak_memory,
             "results": [
                 {
-                    "test": r.name, 
-                    "passed": r.passed, 
+                    "test": r.name,
+                    "passed": r.passed,
                     "score": r.score,
-                    "details": r.details
-                } for r in results
+                    "details": r.details,
+                    **timing.to_dict()
+                } for r, timing in measured
             ]
         }
+
+HISTORY_FIELDS = [
+    "suite_name", "timestamp", "test", "passed", "score", "runs", "wall_seconds", "cpu_seconds",
+    "p50_seconds", "p95_seconds", "p99_seconds", "peak_memory_bytes",
+]
+
+def append_history(report: dict, path: str):
+    """
+    Appends a BenchmarkSuite.run() report to a result history file.
+    `.csv` paths get one row per test; any other path gets one JSON report per line.
+    """
+    if path.endswith(".csv"):
+        write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS, extrasaction="ignore")
+            if write_header:
+                writer.writeheader()
+            for row in report["results"]:
+                writer.writerow({"suite_name": report["suite_name"], "timestamp": report["timestamp"], **row})
+    else:
+        with open(path, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+def load_history(path: str) -> List[dict]:
+    """
+    Loads a history written by append_history(), oldest report first.
+    Reports read back from `.csv` only hold the HISTORY_FIELDS: suite_name, timestamp
+    and the per-test results.
+    """
+    if path.endswith(".csv"):
+        return _load_csv_history(path)
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _load_csv_history(path: str) -> List[dict]:
+    reports = {}
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            report = reports.setdefault(
+                (row["suite_name"], row["timestamp"]),
+                {"suite_name": row["suite_name"], "timestamp": float(row["timestamp"]), "results": []},
+            )
+            result = {"test": row["test"], "passed": row["passed"] == "True", "runs": int(row["runs"])}
+            for field in ("score", "wall_seconds", "cpu_seconds", "p50_seconds", "p95_seconds", "p99_seconds"):
+                result[field] = float(row[field])
+            result["peak_memory_bytes"] = int(row["peak_memory_bytes"]) if row["peak_memory_bytes"] else None
+            report["results"].append(result)
+    return list(reports.values())
+
+def find_regressions(report: dict, baseline: dict, metric: str = "p50_seconds",
+                     tolerance: float = 0.10) -> List[dict]:
+    """
+    Lists tests whose `metric` grew by more than `tolerance` (relative) versus a baseline report.
+    """
+    baseline_by_test = {r["test"]: r for r in baseline["results"]}
+    regressions = []
+    for row in report["results"]:
+        old = baseline_by_test.get(row["test"])
+        if old is None or not old.get(metric) or row.get(metric) is None:
+            continue
+        change = (row[metric] - old[metric]) / old[metric]
+        if change > tolerance:
+            regressions.append({"test": row["test"], "baseline": old[metric], "current": row[metric], "change": change})
+    return regressions
@@ -1,3 +1,5 @@
+from src.utils.keyword_matcher import KeywordGroupMatcher
+
 class JailbreakClassifier:
     """
     A simple rule-based classifier to identify common jailbreak patterns.
@@ -22,20 +24,15 @@ class JailbreakClassifier:
                 "base64", "hex", "rot13"
             ]
         }
+        self.matcher = KeywordGroupMatcher(self.patterns)
 
     def classify(self, prompt: str) -> list[str]:
         """
         Returns a list of detected jailbreak categories.
         Returns ["Benign"] if no patterns match.
         """
-        prompt_lower = prompt.lower()
-        detected = []
-
-        for category, keywords in self.patterns.items():
-            for keyword in keywords:
-                if keyword in prompt_lower:
-                    detected.append(category)
-                    break 
+        # One scan over the prompt for the keywords of every category
+        detected = list(self.matcher.match(prompt))
         
         if not detected:
             return ["Benign"]
@@ -1,4 +1,22 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+
+# Default chunk size (characters) for streaming scans of large files
+STREAM_CHUNK_SIZE = 1 << 20
+
+@lru_cache(maxsize=32)
+def _combined_pattern(items: Tuple[Tuple[str, str], ...]) -> Tuple["re.Pattern", List[str]]:
+    """
+    Compiles all PII patterns into one alternation with one named group per type,
+    so a single scan finds every type. Group names are positional (g0, g1, ...)
+    because type labels need not be valid identifiers.
+    """
+    labels = [label for label, _ in items]
+    combined = "|".join(f"(?P<g{i}>{pattern})" for i, (_, pattern) in enumerate(items))
+    return re.compile(combined), labels
 
 class PIIScanner:
     """
@@ -12,22 +30,94 @@ class PIIScanner:
             "SSN_US": r'\b\d{3}-\d{2}-\d{4}\b'
         }
 
+    def _compiled(self) -> Tuple["re.Pattern", List[str]]:
+        # Cached per pattern set, so edits to self.patterns are picked up
+        return _combined_pattern(tuple(self.patterns.items()))
+
+    def iter_matches(self, text: str, pos: int = 0) -> Iterator[Tuple[str, "re.Match"]]:
+        """
+        Yields (type, match) for every PII entity in one left-to-right pass.
+        Where two types would match at the same position, the type listed first wins.
+        """
+        regex, labels = self._compiled()
+        for m in regex.finditer(text, pos):
+            yield labels[int(m.lastgroup[1:])], m
+
     def scan(self, text: str) -> list[dict]:
         """
-        Returns a list of detected PII entities.
-        """
-        findings = []
-        for label, pattern in self.patterns.items():
-            matches = re.finditer(pattern, text)
-            for m in matches:
-                findings.append({
-                    "type": label,
-                    "value": m.group(),
-                    "start": m.start(),
-                    "end": m.end()
-                })
+        Returns a list of detected PII entities, grouped by type in pattern order.
+        """
+        order = {label: i for i, label in enumerate(self.patterns)}
+        findings = [
+            {"type": label, "value": m.group(), "start": m.start(), "end": m.end()}
+            for label, m in self.iter_matches(text)
+        ]
+        findings.sort(key=lambda f: (order[f["type"]], f["start"]))
         return findings
 
+    def scan_batch(self, texts: Iterable[str], max_workers: int = 1, chunksize: int = 64) -> List[list]:
+        """
+        scan() over many documents, spread across worker processes when max_workers > 1.
+        Results keep the order of `texts`.
+        """
+        items = tuple(self.patterns.items())
+        if max_workers <= 1:
+            return [self.scan(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_scan_text, repeat(items), texts, chunksize=chunksize))
+
+    def scan_stream(self,
+                    source: Union[IO[str], Iterable[str]],
+                    chunk_size: int = STREAM_CHUNK_SIZE,
+                    max_match_length: int = 256) -> Iterator[dict]:
+        """
+        Scans a large text file (or any iterable of text chunks) chunk by chunk.
+        Offsets are relative to the whole stream. Entities that cross a chunk boundary
+        are found as long as they are at most `max_match_length` characters long.
+        """
+        for _, offset, _, _, matches in self._stream_segments(source, chunk_size, max_match_length):
+            for label, m in matches:
+                yield {"type": label, "value": m.group(), "start": offset + m.start(), "end": offset + m.end()}
+
+    def _stream_segments(self, source, chunk_size: int, max_match_length: int):
+        """
+        Yields (buffer, buffer_offset, start, end, matches): buffer[start:end] are consecutive,
+        non-overlapping regions of the stream and `matches` are the entities inside them.
+
+        A match is final once at least `max_match_length` characters follow it. Anything
+        later is carried into the next buffer and rescanned, so boundary-crossing entities
+        are not split. One character of context is kept before the carry, so `\\b`
+        assertions see the same neighbour as in the unsplit text.
+        """
+        chunks = iter(lambda: source.read(chunk_size), "") if hasattr(source, "read") else iter(source)
+        buffer, offset, pos = "", 0, 0
+        for chunk in chunks:
+            buffer += chunk
+            cut = len(buffer) - max_match_length
+            if cut <= pos:
+                continue
+            final, carry_start = [], cut
+            for label, m in self.iter_matches(buffer, pos):
+                if m.end() > cut:
+                    carry_start = min(carry_start, m.start())
+                    break
+                final.append((label, m))
+            yield buffer, offset, pos, carry_start, final
+            context = max(carry_start - 1, 0)
+            buffer, offset, pos = buffer[context:], offset + context, carry_start - context
+        yield buffer, offset, pos, len(buffer), list(self.iter_matches(buffer, pos))
+
+def _scan_text(items: Tuple[Tuple[str, str], ...], text: str) -> list:
+    # Module-level so scan_batch can run it in worker processes
+    scanner = PIIScanner()
+    scanner.patterns = dict(items)
+    return scanner.scan(text)
+
+def _anonymize_text(items: Tuple[Tuple[str, str], ...], text: str) -> str:
+    anonymizer = PIIAnonymizer()
+    anonymizer.scanner.patterns = dict(items)
+    return anonymizer.anonymize(text)
+
 class PIIAnonymizer:
     def __init__(self):
         self.scanner = PIIScanner()
@@ -36,20 +126,39 @@ class PIIAnonymizer:
         """
         Replaces detected PII with [TYPE].
         """
-        # We need to replace from end to start to not mess up indices, 
-        # or just use sub with re.
-        # Since we have multiple patterns, iterating blindly might cause issues if they overlap (rare for these specific types).
-        # A safer way relies on the scanner results.
-        
-        findings = self.scanner.scan(text)
-        # Sort by start index descending to replace safely
-        findings.sort(key=lambda x: x['start'], reverse=True)
-        
-        anonymized = list(text)
-        
-        for f in findings:
-            start, end = f['start'], f['end']
-            placeholder = f"[{f['type']}]"
-            anonymized[start:end] = list(placeholder)
-            
-        return "".join(anonymized)
+        # One pass over the combined pattern; the output is assembled from slices
+        # between matches instead of editing a character list in place.
+        return self._build(text, 0, len(text), self.scanner.iter_matches(text))
+
+    def anonymize_batch(self, texts: Iterable[str], max_workers: int = 1, chunksize: int = 64) -> List[str]:
+        """
+        anonymize() over many documents, spread across worker processes when max_workers > 1.
+        Results keep the order of `texts`.
+        """
+        items = tuple(self.scanner.patterns.items())
+        if max_workers <= 1:
+            return [self.anonymize(text) for text in texts]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(_anonymize_text, repeat(items), texts, chunksize=chunksize))
+
+    def anonymize_stream(self,
+                         source: Union[IO[str], Iterable[str]],
+                         chunk_size: int = STREAM_CHUNK_SIZE,
+                         max_match_length: int = 256) -> Iterator[str]:
+        """
+        Anonymizes a large text file (or iterable of chunks), yielding redacted pieces
+        whose concatenation equals anonymize() of the whole text.
+        """
+        for buffer, _, start, end, matches in self.scanner._stream_segments(source, chunk_size, max_match_length):
+            yield self._build(buffer, start, end, matches)
+
+    @staticmethod
+    def _build(text: str, start: int, end: int, matches) -> str:
+        parts = []
+        last = start
+        for label, m in matches:
+            parts.append(text[last:m.start()])
+            parts.append(f"[{label}]")
+            last = m.end()
+        parts.append(text[last:end])
+        return "".join(parts)
@@ -1,3 +1,5 @@
+from src.utils.keyword_matcher import KeywordMatcher
+
 class ToxicityClassifier:
     """
     A simple rule-based mock classifier for toxicity.
@@ -7,19 +9,14 @@ class ToxicityClassifier:
         self.toxic_keywords = [
             "stupid", "idiot", "hate", "kill", "ugly", "dumb", "shut up"
         ]
+        self.matcher = KeywordMatcher(self.toxic_keywords)
 
     def predict(self, text: str) -> dict:
         """
         Returns a score (0->1) and label.
         """
-        text_lower = text.lower()
-        score = 0.0
-        details = []
-
-        for word in self.toxic_keywords:
-            if word in text_lower:
-                score += 0.3 # crude scoring
-                details.append(word)
+        details = self.matcher.matched(text)
+        score = 0.3 * len(details) # crude scoring
         
         # Cap score at 1.0
         score = min(score, 1.0)
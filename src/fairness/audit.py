@@ -1,7 +1,11 @@
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List
+
+from src.fairness.metrics import group_confusion_matrix, group_fairness_metrics
+from src.fairness.streaming import StreamingFairnessAccumulator
+from src.fairness.bootstrap import fairness_confidence_intervals
 
 class FairnessAuditor:
     """
@@ -24,36 +28,27 @@ class FairnessAuditor:
         sensitive_feature=1 usually denotes the privileged group.
         """
         
-        # Convert to numpy arrays if not already
-        y_true = np.array(y_true)
-        y_pred = np.array(y_pred)
-        sens = np.array(sensitive_features)
-        
-        # Identify groups
+        # One grouped confusion-matrix pass covers both groups
+        keys, counts = group_confusion_matrix(y_true, y_pred, sensitive_features)
+        return self.audit_from_counts(keys, counts)
+
+    def audit_from_counts(self, keys: List[Any], counts: np.ndarray) -> Dict[str, Any]:
+        """
+        Same metrics as audit(), computed from grouped confusion counts
+        (see group_confusion_matrix / StreamingFairnessAccumulator).
+        """
         # Group 0: Unprivileged
         # Group 1: Privileged
-        idx_priv = (sens == 1)
-        idx_unpriv = (sens == 0)
+        priv = counts[keys.index(1)] if 1 in keys else np.zeros(4, dtype=int)
+        unpriv = counts[keys.index(0)] if 0 in keys else np.zeros(4, dtype=int)
         
-        # selection rates (Positive prediction rate)
-        sr_priv = np.mean(y_pred[idx_priv])
-        sr_unpriv = np.mean(y_pred[idx_unpriv])
+        # selection rates (Positive prediction rate); NaN for an absent group
+        sr_priv = self._selection_rate(priv)
+        sr_unpriv = self._selection_rate(unpriv)
         
-        # True Positive Rates (Recall)
-        # Filter for actual positives first
-        idx_true_pos_priv = (y_true[idx_priv] == 1)
-        idx_true_pos_unpriv = (y_true[idx_unpriv] == 1)
-        
-        # Avoid division by zero
-        if np.sum(idx_true_pos_priv) == 0:
-            tpr_priv = 0.0
-        else:
-            tpr_priv = np.mean(y_pred[idx_priv][idx_true_pos_priv])
-            
-        if np.sum(idx_true_pos_unpriv) == 0:
-            tpr_unpriv = 0.0
-        else:
-            tpr_unpriv = np.mean(y_pred[idx_unpriv][idx_true_pos_unpriv])
+        # True Positive Rates (Recall), 0 when a group has no actual positives
+        tpr_priv = self._true_positive_rate(priv)
+        tpr_unpriv = self._true_positive_rate(unpriv)
             
         # Metrics
         dp_diff = sr_priv - sr_unpriv
@@ -72,6 +67,56 @@ class FairnessAuditor:
             "Unprivileged Selection Rate": sr_unpriv
         }
 
+    def audit_stream(self,
+                     chunks: Iterable[Any],
+                     y_true_col: str = "y_true",
+                     y_pred_col: str = "y_pred",
+                     sensitive_col: str = "sensitive") -> Dict[str, Any]:
+        """
+        Same metrics as audit(), computed chunk by chunk so the full dataset never has to be
+        in memory. `chunks` yields DataFrames or column mappings, e.g. from iter_csv_chunks().
+        """
+        accumulator = StreamingFairnessAccumulator(y_pred_col=y_pred_col, sensitive_cols=sensitive_col, y_true_col=y_true_col)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return self.audit_from_counts(accumulator.keys, accumulator.counts)
+
+    def audit_groups(self,
+                     y_true: np.ndarray,
+                     y_pred: np.ndarray,
+                     sensitive_features: np.ndarray,
+                     reference_group: Any = None) -> Dict[str, Any]:
+        """
+        Multi-group / intersectional audit: per-group selection rate, TPR, FPR, DP, EO and DI.
+        Pass a 2-D sensitive_features array (n_samples, n_attributes) for intersectional groups.
+        """
+        return group_fairness_metrics(y_true, y_pred, sensitive_features, reference_group=reference_group)
+
+    def confidence_intervals(self,
+                             y_true: np.ndarray,
+                             y_pred: np.ndarray,
+                             sensitive_features: np.ndarray,
+                             method: str = "bootstrap",
+                             **kwargs: Any) -> Dict[str, Dict[str, float]]:
+        """
+        Interval estimates (bootstrap or jackknife) for DP, EO, equalized odds and DI,
+        signed the same way as audit() (group 1 privileged, group 0 unprivileged).
+        See src.fairness.bootstrap for options such as n_resamples, seed and n_jobs.
+        """
+        return fairness_confidence_intervals(y_true, y_pred, sensitive_features, method=method,
+                                             privileged_group=1, unprivileged_group=0, **kwargs)
+
+    @staticmethod
+    def _selection_rate(counts: np.ndarray) -> float:
+        tn, fp, fn, tp = counts
+        n = tn + fp + fn + tp
+        return (tp + fp) / n if n > 0 else float("nan")
+
+    @staticmethod
+    def _true_positive_rate(counts: np.ndarray) -> float:
+        _, _, fn, tp = counts
+        return tp / (tp + fn) if (tp + fn) > 0 else 0.0
+
     def generate_report(self, metrics: Dict[str, Any]) -> str:
         """
         Generates a readable text summary.
@@ -0,0 +1,212 @@
+import numpy as np
+from statistics import NormalDist
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.fairness.metrics import group_confusion_matrix
+
+METRICS = (
+    "demographic_parity_difference",
+    "equal_opportunity_difference",
+    "equalized_odds_difference",
+    "disparate_impact_ratio",
+)
+
+
+def pairwise_counts(keys: List[Any], counts: np.ndarray, privileged_group: Any = 1, unprivileged_group: Any = 0) -> np.ndarray:
+    """
+    The (2, 4) counts of [privileged, unprivileged] for signed metrics; an absent group gets zeros.
+    """
+    rows = [counts[keys.index(g)] if g in keys else np.zeros(4, dtype=counts.dtype)
+            for g in (privileged_group, unprivileged_group)]
+    return np.stack(rows)
+
+
+def _metrics_from_counts(counts: np.ndarray, signed: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Fairness metrics for a stack of grouped confusion matrices, shape (..., n_groups, 4).
+    Returns one array of shape (...) per metric.
+
+    By default the metrics are spreads over all groups (max - min, min / max), as in
+    group_fairness_metrics(). With `signed`, the last two axes must be
+    [privileged, unprivileged] and the metrics are the signed ones FairnessAuditor.audit()
+    reports: privileged - unprivileged differences and unprivileged / privileged DI.
+    A group without rows has no rates, which makes every metric NaN: the replicate no
+    longer compares the same groups as the estimate.
+    """
+    counts = counts.astype(float)
+    tn, fp, fn, tp = counts[..., 0], counts[..., 1], counts[..., 2], counts[..., 3]
+    n = tn + fp + fn + tp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sr = np.where(n > 0, (tp + fp) / n, np.nan)
+        # Rates are 0 when a present group has no actual positives / negatives
+        tpr = np.where(n > 0, np.where(tp + fn > 0, tp / (tp + fn), 0.0), np.nan)
+        fpr = np.where(n > 0, np.where(tn + fp > 0, fp / (tn + fp), 0.0), np.nan)
+        if signed:
+            sr_priv, sr_unpriv = sr[..., 0], sr[..., 1]
+            tpr_diff = tpr[..., 0] - tpr[..., 1]
+            fpr_diff = fpr[..., 0] - fpr[..., 1]
+            return {
+                "demographic_parity_difference": sr_priv - sr_unpriv,
+                "equal_opportunity_difference": tpr_diff,
+                "equalized_odds_difference": np.maximum(np.abs(tpr_diff), np.abs(fpr_diff)),
+                # 0 if the privileged group has no selections, as in audit()
+                "disparate_impact_ratio": np.where(sr_priv == 0, 0.0, sr_unpriv / sr_priv),
+            }
+        # max/min propagate the NaN of an absent group
+        sr_max, sr_min = sr.max(axis=-1), sr.min(axis=-1)
+        tpr_range = tpr.max(axis=-1) - tpr.min(axis=-1)
+        fpr_range = fpr.max(axis=-1) - fpr.min(axis=-1)
+        return {
+            "demographic_parity_difference": sr_max - sr_min,
+            "equal_opportunity_difference": tpr_range,
+            "equalized_odds_difference": np.maximum(tpr_range, fpr_range),
+            "disparate_impact_ratio": np.where(sr_max == 0, 0.0, sr_min / sr_max),
+        }
+
+
+def _draw_counts(counts: np.ndarray, n_resamples: int, seed, batch_size: int, stratified: bool,
+                 signed: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Bootstrap replicates of every metric, drawn `batch_size` resamples at a time.
+
+    Resampling n rows with replacement only changes how many rows land in each
+    (group, confusion cell), and those counts follow a multinomial distribution.
+    Drawing the counts directly gives the same resampled counts as the row bootstrap,
+    at a cost that does not depend on the number of rows. Without stratification a
+    small group can draw no rows; its metrics are then NaN (see _metrics_from_counts).
+    """
+    rng = np.random.default_rng(seed)
+    n_groups = counts.shape[0]
+    replicates = {name: [] for name in METRICS}
+    for start in range(0, n_resamples, batch_size):
+        size = min(batch_size, n_resamples - start)
+        if stratified:
+            # Group sizes stay fixed; rows are resampled within each group
+            group_sizes = counts.sum(axis=1)
+            probs = counts / np.maximum(group_sizes, 1)[:, None]
+            draws = rng.multinomial(group_sizes, probs, size=(size, n_groups))
+        else:
+            total = counts.sum()
+            draws = rng.multinomial(total, counts.ravel() / total, size=size).reshape(size, n_groups, 4)
+        for name, values in _metrics_from_counts(draws, signed).items():
+            replicates[name].append(values)
+    return {name: np.concatenate(values) for name, values in replicates.items()}
+
+
+def bootstrap_ci_from_counts(
+    counts: np.ndarray,
+    n_resamples: int = 1000,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+    n_jobs: int = 1,
+    batch_size: int = 1000,
+    stratified: bool = False,
+    signed: bool = False
+) -> Dict[str, Dict[str, float]]:
+    """
+    Percentile bootstrap confidence intervals from grouped confusion counts
+    (see group_confusion_matrix / StreamingFairnessAccumulator). `signed` selects the
+    privileged-vs-unprivileged metrics (counts from pairwise_counts()).
+
+    Replicates in which a metric is undefined (NaN, e.g. a group drew no rows) are
+    dropped before the percentiles are taken; `n_valid` reports how many were kept.
+
+    With n_jobs > 1 the resamples are split across processes. Each worker gets its own
+    child of SeedSequence(seed), so a given (seed, n_jobs) always gives the same intervals.
+    """
+    counts = np.asarray(counts)
+    n_jobs = max(1, min(n_jobs, n_resamples))
+    if n_jobs == 1:
+        replicates = _draw_counts(counts, n_resamples, seed, batch_size, stratified, signed)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(n_jobs)
+        shares = [n_resamples // n_jobs + (i < n_resamples % n_jobs) for i in range(n_jobs)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_draw_counts, [counts] * n_jobs, shares, seeds,
+                                  [batch_size] * n_jobs, [stratified] * n_jobs, [signed] * n_jobs))
+        replicates = {name: np.concatenate([p[name] for p in parts]) for name in METRICS}
+
+    estimates = _metrics_from_counts(counts, signed)
+    alpha = (1 - confidence) / 2
+    report = {}
+    for name in METRICS:
+        values = replicates[name]
+        values = values[~np.isnan(values)]
+        lower, upper = np.quantile(values, [alpha, 1 - alpha]) if len(values) else (np.nan, np.nan)
+        report[name] = {
+            "estimate": float(estimates[name]),
+            "lower": float(lower),
+            "upper": float(upper),
+            "std_error": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+            "n_valid": int(len(values)),
+        }
+    return report
+
+
+def jackknife_ci_from_counts(counts: np.ndarray, confidence: float = 0.95,
+                             signed: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+    Delete-one jackknife (normal-approximation) confidence intervals from grouped confusion counts.
+
+    Removing one row only decrements one (group, cell) count, so there are at most
+    n_groups * 4 distinct leave-one-out datasets, each weighted by its cell count.
+    Leave-one-out datasets where a metric is undefined (a one-row group removed) are skipped.
+    """
+    counts = np.asarray(counts)
+    flat = counts.ravel()
+    n = flat.sum()
+    cells = np.flatnonzero(flat)
+    leave_one_out = np.repeat(flat[None, :], len(cells), axis=0)
+    leave_one_out[np.arange(len(cells)), cells] -= 1
+    leave_one_out = leave_one_out.reshape(len(cells), *counts.shape)
+    weights = flat[cells].astype(float)
+
+    estimates = _metrics_from_counts(counts, signed)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    report = {}
+    for name, values in _metrics_from_counts(leave_one_out, signed).items():
+        valid = ~np.isnan(values)
+        w, values = weights[valid], values[valid]
+        n_valid = w.sum()
+        if n_valid > 0:
+            mean = np.dot(w, values) / n_valid
+            std_error = np.sqrt((n_valid - 1) / n_valid * np.dot(w, (values - mean) ** 2))
+        else:
+            std_error = np.nan
+        report[name] = {
+            "estimate": float(estimates[name]),
+            "lower": float(estimates[name] - z * std_error),
+            "upper": float(estimates[name] + z * std_error),
+            "std_error": float(std_error),
+            "n_valid": int(n_valid),
+        }
+    return report
+
+
+def fairness_confidence_intervals(
+    y_true,
+    y_pred,
+    sensitive_features,
+    method: str = "bootstrap",
+    positive_label: int = 1,
+    privileged_group: Any = None,
+    unprivileged_group: Any = None,
+    **kwargs: Any
+) -> Dict[str, Dict[str, float]]:
+    """
+    Confidence intervals for DP, EO, equalized-odds and DI differences.
+    method: "bootstrap" (kwargs go to bootstrap_ci_from_counts) or "jackknife".
+
+    With privileged_group and unprivileged_group, only those two groups are used and the
+    metrics are signed as in FairnessAuditor.audit(); otherwise they are spreads over all groups.
+    """
+    keys, counts = group_confusion_matrix(y_true, y_pred, sensitive_features, positive_label)
+    signed = privileged_group is not None and unprivileged_group is not None
+    if signed:
+        counts = pairwise_counts(keys, counts, privileged_group, unprivileged_group)
+    if method == "bootstrap":
+        return bootstrap_ci_from_counts(counts, signed=signed, **kwargs)
+    if method == "jackknife":
+        return jackknife_ci_from_counts(counts, signed=signed, **kwargs)
+    raise ValueError(f"Unknown method '{method}'. Expected 'bootstrap' or 'jackknife'.")
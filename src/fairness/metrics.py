@@ -1,7 +1,169 @@
 
-from typing import List, Dict, Union, Any
+from typing import List, Dict, Any
 import numpy as np
-from collections import defaultdict
+
+def _as_array(values) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values
+    if hasattr(values, "to_numpy"):
+        return values.to_numpy()
+    # Keep the Python objects of a list: np.asarray would cast e.g. [1, "1"] to one string
+    # dtype (merging the groups) and None would not be sortable by np.unique
+    return np.asarray(values, dtype=object)
+
+
+def _encode_column(column: np.ndarray) -> tuple:
+    if column.dtype.kind in "biufUS":
+        keys, codes = np.unique(column, return_inverse=True)
+        return keys.tolist(), codes.ravel()
+
+    # Hashable-key grouping (like a dict) for object labels such as None or mixed types
+    index = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in column), dtype=np.int64, count=len(column))
+    keys = list(index)
+    try:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+    except TypeError:
+        # Labels that cannot be compared keep their first-seen order
+        return keys, codes
+    rank = np.empty(len(keys), dtype=np.int64)
+    rank[order] = np.arange(len(keys))
+    return [keys[i] for i in order], rank[codes]
+
+
+def encode_groups(sensitive_features) -> tuple:
+    """
+    Maps each sample to an integer group code in one pass.
+    1-D input gives one group per distinct value; 2-D input (n_samples, n_attributes)
+    gives one group per distinct row, i.e. intersectional groups keyed by tuples.
+    Labels are grouped as dict keys (None is a group, 1 and "1" are different groups)
+    and sorted when they are mutually comparable. Returns (group_keys, codes).
+    """
+    sens = _as_array(sensitive_features)
+    if sens.ndim == 1:
+        return _encode_column(sens)
+
+    # Encode each attribute column separately, then combine the column codes into one
+    # intersectional code so the whole matrix is grouped with a single unique() call.
+    attr_keys, attr_codes = [], []
+    for column in sens.T:
+        keys, codes = _encode_column(column)
+        attr_keys.append(keys)
+        attr_codes.append(codes)
+    shape = [len(k) for k in attr_keys]
+    flat = np.ravel_multi_index(np.stack(attr_codes), shape)
+    present, codes = np.unique(flat, return_inverse=True)
+    combos = np.unravel_index(present, shape)
+    keys = [tuple(attr_keys[a][combos[a][g]] for a in range(len(shape))) for g in range(len(present))]
+    return keys, codes.ravel()
+
+
+def _confusion_counts(codes: np.ndarray, n_groups: int, y_true, y_pred, positive_label: int) -> np.ndarray:
+    # Each sample falls into one of 4 cells per group, so one bincount builds every confusion matrix
+    cell = 2 * (np.asarray(y_true) == positive_label) + (np.asarray(y_pred) == positive_label)
+    return np.bincount(codes * 4 + cell, minlength=n_groups * 4).reshape(n_groups, 4)
+
+
+def group_confusion_matrix(y_true, y_pred, sensitive_features, positive_label: int = 1) -> tuple:
+    """
+    Single-pass grouped confusion matrix.
+    Returns (group_keys, counts) where counts has shape (n_groups, 4) with columns
+    [true negatives, false positives, false negatives, true positives].
+    """
+    keys, codes = encode_groups(sensitive_features)
+    return keys, _confusion_counts(codes, len(keys), y_true, y_pred, positive_label)
+
+
+def _rates(counts: np.ndarray) -> Dict[str, np.ndarray]:
+    tn, fp, fn, tp = counts.T.astype(float)
+    n = tn + fp + fn + tp
+    positives = tp + fn
+    negatives = tn + fp
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "count": n,
+            "selection_rate": np.where(n > 0, (tp + fp) / n, 0.0),
+            # Rates are defined as 0 when a group has no actual positives / negatives
+            "tpr": np.where(positives > 0, tp / positives, 0.0),
+            "fpr": np.where(negatives > 0, fp / negatives, 0.0),
+        }
+
+
+def _marginal_counts(keys: List[tuple], counts: np.ndarray) -> List[tuple]:
+    # Per-attribute (values, counts) aggregated from intersectional tuple keys
+    marginals = []
+    for a in range(len(keys[0])):
+        values = list(dict.fromkeys(key[a] for key in keys))
+        try:
+            values.sort()
+        except TypeError:
+            pass  # labels that cannot be compared keep their first-seen order
+        position = {value: i for i, value in enumerate(values)}
+        marginal = np.zeros((len(values), 4), dtype=counts.dtype)
+        np.add.at(marginal, [position[key[a]] for key in keys], counts)
+        marginals.append((values, marginal))
+    return marginals
+
+
+def _summarize(keys: List[Any], counts: np.ndarray, reference_group: Any = None) -> Dict[str, Any]:
+    rates = _rates(counts)
+    sr, tpr, fpr = rates["selection_rate"], rates["tpr"], rates["fpr"]
+    ref = keys.index(reference_group) if reference_group is not None else int(np.argmax(sr))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di = np.where(sr[ref] > 0, sr / sr[ref], 0.0)
+
+    groups = {}
+    for g, key in enumerate(keys):
+        groups[key] = {
+            "count": int(rates["count"][g]),
+            "selection_rate": float(sr[g]),
+            "tpr": float(tpr[g]),
+            "fpr": float(fpr[g]),
+            "demographic_parity_difference": float(sr[g] - sr[ref]),
+            "equal_opportunity_difference": float(tpr[g] - tpr[ref]),
+            "disparate_impact_ratio": float(di[g]),
+        }
+
+    return {
+        "reference_group": keys[ref],
+        "groups": groups,
+        "demographic_parity_difference": float(sr.max() - sr.min()),
+        "equal_opportunity_difference": float(tpr.max() - tpr.min()),
+        "equalized_odds_difference": float(max(tpr.max() - tpr.min(), fpr.max() - fpr.min())),
+        "disparate_impact_ratio": float(sr.min() / sr.max()) if sr.max() > 0 else 0.0,
+    }
+
+
+def group_fairness_metrics(
+    y_true,
+    y_pred,
+    sensitive_features,
+    positive_label: int = 1,
+    reference_group: Any = None
+) -> Dict[str, Any]:
+    """
+    Selection rate, TPR, FPR, DP, EO and DI for every group from one grouped confusion matrix.
+
+    sensitive_features may be 1-D, or 2-D (n_samples, n_attributes) for intersectional groups;
+    in the 2-D case per-attribute marginal groups are also reported under "marginals",
+    aggregated from the intersectional counts without another pass over the data.
+    Per-group differences and ratios are relative to `reference_group`
+    (default: the group with the highest selection rate).
+    """
+    keys, counts = group_confusion_matrix(y_true, y_pred, sensitive_features, positive_label)
+    return summarize_group_counts(keys, counts, reference_group)
+
+
+def summarize_group_counts(keys: List[Any], counts: np.ndarray, reference_group: Any = None) -> Dict[str, Any]:
+    """
+    Builds the group_fairness_metrics() report from grouped confusion counts, e.g. counts
+    accumulated over many chunks. Tuple keys are treated as intersectional groups.
+    """
+    report = _summarize(keys, counts, reference_group)
+    if keys and isinstance(keys[0], tuple):
+        report["marginals"] = [_summarize(values, marginal) for values, marginal in _marginal_counts(keys, counts)]
+    return report
+
 
 class FairnessEvaluator:
     """
@@ -22,22 +184,10 @@ class FairnessEvaluator:
             The absolute difference between the group with the highest selection rate 
             and the group with the lowest selection rate.
         """
-        y_pred = np.array(y_pred)
-        sensitive_features = np.array(sensitive_features)
-        groups = np.unique(sensitive_features)
-        
-        selection_rates = {}
-        for group in groups:
-            mask = (sensitive_features == group)
-            group_pred = y_pred[mask]
-            
-            if len(group_pred) == 0:
-                selection_rates[group] = 0.0
-            else:
-                selection_rates[group] = np.mean(group_pred == positive_label)
-        
-        rates = list(selection_rates.values())
-        return max(rates) - min(rates)
+        y_pred = np.asarray(y_pred)
+        _, counts = group_confusion_matrix(np.zeros_like(y_pred), y_pred, sensitive_features, positive_label)
+        rates = _rates(counts)["selection_rate"]
+        return float(rates.max() - rates.min())
 
     @staticmethod
     def equalized_odds_difference(
@@ -53,38 +203,21 @@ class FairnessEvaluator:
         Returns:
             The greater of the two maximum differences (TPR diff or FPR diff).
         """
-        y_true = np.array(y_true)
-        y_pred = np.array(y_pred)
-        sensitive_features = np.array(sensitive_features)
-        groups = np.unique(sensitive_features)
-        
-        tprs = {}
-        fprs = {}
-        
-        for group in groups:
-            mask = (sensitive_features == group)
-            group_true = y_true[mask]
-            group_pred = y_pred[mask]
-            
-            # TPR: P(pred=1 | true=1)
-            true_positives = np.sum((group_pred == positive_label) & (group_true == positive_label))
-            actual_positives = np.sum(group_true == positive_label)
-            
-            if actual_positives > 0:
-                tprs[group] = true_positives / actual_positives
-            else:
-                tprs[group] = 0.0 # Define as 0 if no actual positives
-            
-            # FPR: P(pred=1 | true=0)
-            false_positives = np.sum((group_pred == positive_label) & (group_true != positive_label))
-            actual_negatives = np.sum(group_true != positive_label)
-            
-            if actual_negatives > 0:
-                fprs[group] = false_positives / actual_negatives
-            else:
-                fprs[group] = 0.0
-                
-        tpr_diff = max(tprs.values()) - min(tprs.values())
-        fpr_diff = max(fprs.values()) - min(fprs.values())
-        
-        return max(tpr_diff, fpr_diff)
+        _, counts = group_confusion_matrix(y_true, y_pred, sensitive_features, positive_label)
+        rates = _rates(counts)
+        tpr_diff = rates["tpr"].max() - rates["tpr"].min()
+        fpr_diff = rates["fpr"].max() - rates["fpr"].min()
+        return float(max(tpr_diff, fpr_diff))
+
+    @staticmethod
+    def group_metrics(
+        y_true: List[int],
+        y_pred: List[int],
+        sensitive_features: Any,
+        positive_label: int = 1,
+        reference_group: Any = None
+    ) -> Dict[str, Any]:
+        """
+        All per-group and summary metrics at once. See group_fairness_metrics().
+        """
+        return group_fairness_metrics(y_true, y_pred, sensitive_features, positive_label, reference_group)
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from src.fairness.metrics import group_confusion_matrix, summarize_group_counts
+from src.fairness.bootstrap import bootstrap_ci_from_counts, jackknife_ci_from_counts, pairwise_counts
+
+# Parquet support is optional
+try:
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+class StreamingFairnessAccumulator:
+    """
+    Incremental fairness audit over data that does not fit in memory.
+
+    Only the grouped confusion counts (4 integers per group) are kept, so chunks can be
+    fed one at a time with update(), and accumulators built on separate workers can be
+    combined with merge(). result() gives the same report as group_fairness_metrics().
+
+    Chunks are DataFrames or column mappings. `sensitive_cols` may be one column name or
+    a list of names (intersectional groups). Set `y_true_col=None` when only decisions
+    are logged; selection rates, DP and DI are still exact but TPR/FPR are not meaningful.
+    """
+    def __init__(self,
+                 y_pred_col: str = "y_pred",
+                 sensitive_cols: Union[str, Sequence[str]] = "sensitive",
+                 y_true_col: Optional[str] = "y_true",
+                 positive_label: int = 1):
+        self.y_pred_col = y_pred_col
+        self.sensitive_cols = sensitive_cols
+        self.y_true_col = y_true_col
+        self.positive_label = positive_label
+        self.keys: List[Any] = []
+        self.counts = np.zeros((0, 4), dtype=np.int64)
+        self._index: Dict[Any, int] = {}
+
+    @property
+    def n_samples(self) -> int:
+        return int(self.counts.sum())
+
+    def update(self, batch) -> "StreamingFairnessAccumulator":
+        """
+        Adds one chunk (DataFrame, dict of columns or NumPy structured array).
+        """
+        y_pred = np.asarray(batch[self.y_pred_col])
+        if isinstance(self.sensitive_cols, str):
+            sensitive = np.asarray(batch[self.sensitive_cols])
+        else:
+            sensitive = np.column_stack([np.asarray(batch[c], dtype=object) for c in self.sensitive_cols])
+        y_true = np.asarray(batch[self.y_true_col]) if self.y_true_col is not None else np.zeros_like(y_pred)
+        return self.update_arrays(y_true, y_pred, sensitive)
+
+    def update_arrays(self, y_true, y_pred, sensitive_features) -> "StreamingFairnessAccumulator":
+        """
+        Adds one chunk given as arrays.
+        """
+        if len(y_pred) == 0:
+            return self
+        keys, counts = group_confusion_matrix(y_true, y_pred, sensitive_features, self.positive_label)
+        self._add(keys, counts)
+        return self
+
+    def merge(self, other: "StreamingFairnessAccumulator") -> "StreamingFairnessAccumulator":
+        """
+        Folds another accumulator's counts into this one (e.g. partial results from workers).
+        """
+        self._add(other.keys, other.counts)
+        return self
+
+    def result(self, reference_group: Any = None) -> Dict[str, Any]:
+        if not self.keys:
+            raise ValueError("No data has been accumulated yet.")
+        return summarize_group_counts(self.keys, self.counts, reference_group)
+
+    def confidence_intervals(self,
+                             method: str = "bootstrap",
+                             privileged_group: Any = None,
+                             unprivileged_group: Any = None,
+                             **kwargs: Any) -> Dict[str, Dict[str, float]]:
+        """
+        Bootstrap or jackknife intervals computed from the accumulated counts alone.
+        Spreads over all groups as in result(), or the signed metrics of
+        FairnessAuditor.audit_stream() when both groups of a pair are given.
+        """
+        counts = self.counts
+        signed = privileged_group is not None and unprivileged_group is not None
+        if signed:
+            counts = pairwise_counts(self.keys, counts, privileged_group, unprivileged_group)
+        if method == "bootstrap":
+            return bootstrap_ci_from_counts(counts, signed=signed, **kwargs)
+        if method == "jackknife":
+            return jackknife_ci_from_counts(counts, signed=signed, **kwargs)
+        raise ValueError(f"Unknown method '{method}'. Expected 'bootstrap' or 'jackknife'.")
+
+    def _add(self, keys: List[Any], counts: np.ndarray):
+        rows = []
+        for key in keys:
+            if key not in self._index:
+                self._index[key] = len(self.keys)
+                self.keys.append(key)
+            rows.append(self._index[key])
+        if len(self.keys) > len(self.counts):
+            grown = np.zeros((len(self.keys), 4), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        np.add.at(self.counts, rows, counts)
+
+
+def iter_csv_chunks(path: str, chunksize: int = 1_000_000, **read_csv_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Reads a CSV file as DataFrame chunks of `chunksize` rows.
+    """
+    with pd.read_csv(path, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            yield chunk
+
+
+def iter_parquet_chunks(path: str, batch_size: int = 1_000_000,
+                        columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Reads a Parquet file as DataFrame chunks of at most `batch_size` rows. Requires pyarrow.
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required to stream Parquet files: pip install pyarrow")
+    parquet_file = pq.ParquetFile(path)
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size, columns=columns):
+        yield record_batch.to_pandas()
+
+
+def iter_npy_chunks(paths: Dict[str, str], chunksize: int = 1_000_000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Memory-maps one .npy file per column and yields aligned column slices of `chunksize` rows.
+    `paths` maps column name -> .npy path; all arrays must have the same length.
+    """
+    columns = {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+    lengths = {len(col) for col in columns.values()}
+    if len(lengths) != 1:
+        raise ValueError(f"Column lengths differ: {sorted(lengths)}")
+    n = lengths.pop()
+    for start in range(0, n, chunksize):
+        yield {name: col[start:start + chunksize] for name, col in columns.items()}
@@ -1,6 +1,8 @@
 
 import re
-from typing import List, Dict, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Callable, Iterable, List, Tuple, Optional
 from dataclasses import dataclass
 
 @dataclass
@@ -10,6 +12,27 @@ class SafetyResponse:
     message: str
     action: str # CONTINUE, REFUSE, ESCALATE
 
+# Categories in priority order: a crisis indicator anywhere in the text wins over medical terms
+CATEGORY_PRIORITY = ("CRISIS", "MEDICAL_ADVICE")
+
+@lru_cache(maxsize=32)
+def _category_searches(patterns: Tuple[str, ...]) -> Tuple[Callable, ...]:
+    """
+    Compiled search functions for one category's patterns, compiled once per pattern set.
+    Patterns without capturing groups share one alternation; a pattern with groups is
+    compiled on its own so its group numbers (and backreferences) stay as written.
+    """
+    compiled = [re.compile(p) for p in patterns]
+    plain = [p for p, c in zip(patterns, compiled) if not c.groups]
+    searches = [c.search for c in compiled if c.groups]
+    if plain:
+        try:
+            searches.insert(0, re.compile("|".join(f"(?:{p})" for p in plain)).search)
+        except re.error:
+            # e.g. inline global flags, which are only allowed at the start of a pattern
+            searches = [c.search for c in compiled]
+    return tuple(searches)
+
 class MentalHealthSafeguard:
     """
     Day 84: Mental Health Support Boundaries.
@@ -41,18 +64,42 @@ class MentalHealthSafeguard:
         )
 
     def analyze_input(self, user_input: str) -> SafetyResponse:
-        text = user_input.lower()
-        
+        return self._response(self._category(user_input.lower()))
+
+    def analyze_batch(self, messages: Iterable[str], max_workers: int = 1,
+                      chunksize: int = 256) -> List[SafetyResponse]:
+        """
+        analyze_input() over many messages (e.g. a chat-log backfill), spread across
+        worker processes when max_workers > 1. Results keep the order of `messages`.
+        """
+        if max_workers <= 1:
+            return [self.analyze_input(message) for message in messages]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(self.analyze_input, messages, chunksize=chunksize))
+
+    def start_transcript(self, tail_chars: int = 64) -> "TranscriptMonitor":
+        """Returns a monitor for a transcript that arrives piece by piece."""
+        return TranscriptMonitor(self, tail_chars)
+
+    def _category(self, text: str) -> Optional[str]:
+        """
+        Most severe category with a match in already lower-cased text. Each category is
+        scanned on its own, crisis first, so overlapping matches cannot hide each other.
+        """
+        for category, patterns in zip(CATEGORY_PRIORITY, (self.crisis_keywords, self.medical_terms)):
+            if any(search(text) for search in _category_searches(tuple(patterns))):
+                return category
+        return None
+
+    def _response(self, category: Optional[str]) -> SafetyResponse:
         # 1. Crisis Detection
-        for pattern in self.crisis_keywords:
-            if re.search(pattern, text):
-                return SafetyResponse(True, "CRISIS", self.esc_message, "ESCALATE")
-                
+        if category == "CRISIS":
+            return SafetyResponse(True, "CRISIS", self.esc_message, "ESCALATE")
+
         # 2. Medical Advice Boundary
-        for pattern in self.medical_terms:
-            if re.search(pattern, text):
-                return SafetyResponse(True, "MEDICAL_ADVICE", self.refusal_message, "REFUSE")
-                
+        if category == "MEDICAL_ADVICE":
+            return SafetyResponse(True, "MEDICAL_ADVICE", self.refusal_message, "REFUSE")
+
         # 3. Safe to continue
         return SafetyResponse(False, None, "Prompt appears safe within boundaries.", "CONTINUE")
 
@@ -64,3 +111,29 @@ class MentalHealthSafeguard:
             "If a user mentions self-harm, immediately stop and provide hotline info."
         )
         return persona_prompt + boundary
+
+class TranscriptMonitor:
+    """
+    Incremental MentalHealthSafeguard for streaming transcripts.
+
+    Each append() scans only the new text plus the last `tail_chars` characters already
+    seen, so phrases split across appends are still caught (up to `tail_chars` long).
+    The reported category is the most severe one seen so far in the transcript.
+    A phrase at the very end of the received text is reported as soon as it is
+    complete, even if later text would extend the word.
+    """
+    def __init__(self, safeguard: MentalHealthSafeguard, tail_chars: int = 64):
+        self.safeguard = safeguard
+        self.tail_chars = tail_chars
+        self.category: Optional[str] = None
+        self._tail = ""
+
+    def append(self, text: str) -> SafetyResponse:
+        if self.category != "CRISIS":
+            window = self._tail + text.lower()
+            category = self.safeguard._category(window)
+            if category is not None and (self.category is None or
+                                         CATEGORY_PRIORITY.index(category) < CATEGORY_PRIORITY.index(self.category)):
+                self.category = category
+            self._tail = window[-self.tail_chars:] if self.tail_chars else ""
+        return self.safeguard._response(self.category)
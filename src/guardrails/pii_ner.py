@@ -1,12 +1,132 @@
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words and single punctuation marks; entity names and text are tokenized the same way
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+def load_gazetteer(path: str, default_label: Optional[str] = None) -> Dict[str, str]:
+    """
+    Reads entity names from a file with one `name<TAB>LABEL` per line.
+    Lines without a tab get `default_label`; blank lines and `#` comments are skipped.
+    """
+    entities = {}
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            name, sep, label = line.partition("\t")
+            if not sep:
+                if default_label is None:
+                    raise ValueError(f"{path}:{line_no}: expected 'name<TAB>LABEL'")
+                label = default_label
+            entities[name.strip()] = label.strip()
+    return entities
+
+class Gazetteer:
+    """
+    Token trie over entity names. Scanning a text walks the trie from each token,
+    keeps the longest entity that starts there, and resumes after it, so overlapping
+    entities resolve to the longest (then leftmost) match in one pass.
+    """
+    def __init__(self, names: Iterable[str]):
+        self.trie: dict = {}
+        for name in names:
+            tokens = _TOKEN.findall(name)
+            if not tokens:
+                continue
+            node = self.trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node[""] = name  # end-of-entity marker; "" is never a token
+
+    def matches(self, text: str) -> List[Tuple[str, int, int]]:
+        """(name, start, end) character spans of the entities found in the text."""
+        spans = [m.span() for m in _TOKEN.finditer(text)]
+        tokens = [text[s:e] for s, e in spans]
+        found = []
+        trie = self.trie
+        i, n = 0, len(tokens)
+        while i < n:
+            node = trie.get(tokens[i])
+            if node is None:
+                i += 1
+                continue
+            j, longest = i + 1, None
+            while True:
+                if "" in node:
+                    longest = (node[""], j)
+                if j == n or tokens[j] not in node:
+                    break
+                node = node[tokens[j]]
+                j += 1
+            if longest is None:
+                i += 1
+                continue
+            name, end = longest
+            found.append((name, spans[i][0], spans[end - 1][1]))
+            i = end
+        return found
+
+class _EntityTable(dict):
+    """Entity name -> label dict that counts its changes, so NERFilter knows when to rebuild its gazetteer."""
+    version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
 class NERFilter:
     """
     A guardrail that uses Named Entity Recognition (NER) to find and redact PII.
     This mock implementation uses a keyword-based dictionary to simulate NER
     for demonstration purposes, avoiding the need for heavy models like Spacy/BERT.
+
+    Entity names are matched as whole token sequences (case sensitive) through a
+    Gazetteer built on first use, so dictionaries with hundreds of thousands of names
+    are scanned in one pass. This replaced plain substring search: "Bob" no longer
+    matches inside "Bobby", and overlapping entities resolve to the longest match.
+
+    `entities` holds a copy of the given dict; the gazetteer is rebuilt after any
+    change to it, whether in place, through add_entities() or by assigning a new dict.
     """
-    def __init__(self):
+    def __init__(self, entities: Optional[Dict[str, str]] = None):
         # Mock "Knowledge Base" of entities
-        self.entities = {
+        self.entities = entities if entities is not None else {
             "John Doe": "PERSON",
             "Jane Smith": "PERSON",
             "Google": "ORG",
@@ -16,6 +136,32 @@ class NERFilter:
             "Alice": "PERSON",
             "Bob": "PERSON"
         }
+        self._gazetteer: Optional[Gazetteer] = None
+        self._gazetteer_source = None
+
+    @property
+    def entities(self) -> Dict[str, str]:
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities: Dict[str, str]):
+        self._entities = _EntityTable(entities)
+
+    @classmethod
+    def from_file(cls, path: str, default_label: Optional[str] = None) -> "NERFilter":
+        """Builds a filter from a gazetteer file (see load_gazetteer)."""
+        return cls(load_gazetteer(path, default_label))
+
+    def add_entities(self, entities: Dict[str, str]):
+        self.entities.update(entities)
+
+    @property
+    def gazetteer(self) -> Gazetteer:
+        source = (id(self._entities), self._entities.version)
+        if self._gazetteer is None or self._gazetteer_source != source:
+            self._gazetteer = Gazetteer(self.entities)
+            self._gazetteer_source = source
+        return self._gazetteer
 
     def detect(self, text: str) -> list:
         """
@@ -23,40 +169,60 @@ class NERFilter:
         Returns a list of dicts: {'text': 'John Doe', 'label': 'PERSON', 'start': 0, 'end': 8}
         """
         found = []
-        for entity_text, label in self.entities.items():
-            # Check if entity is in text (case sensitive for "NER" feel)
-            # A real NER model would use context, not just string matching.
-            if entity_text in text:
-                start_idx = text.find(entity_text)
-                while start_idx != -1:
-                    found.append({
-                        "text": entity_text,
-                        "label": label,
-                        "start": start_idx,
-                        "end": start_idx + len(entity_text)
-                    })
-                    # Find next occurrence
-                    start_idx = text.find(entity_text, start_idx + 1)
-        
-        # Sort by start position to handle overlaps nicely (simple greedy approach)
-        found.sort(key=lambda x: x['start'])
+        for name, start, end in self.gazetteer.matches(text):
+            label = self.entities.get(name)
+            if label is not None:
+                found.append({"text": text[start:end], "label": label, "start": start, "end": end})
         return found
 
     def redact(self, text: str) -> str:
         """
         Replaces detected entities with [LABEL].
         """
-        entities = self.detect(text)
-        
-        # Process from end to start to avoid messing up indices
-        entities.sort(key=lambda x: x['start'], reverse=True)
-        
-        redacted_text = text
-        for ent in entities:
-             replacement = f"[{ent['label']}]"
-             start = ent['start']
-             end = ent['end']
-             # Simple string slice replacement
-             redacted_text = redacted_text[:start] + replacement + redacted_text[end:]
-             
-        return redacted_text
+        # Entities come back ordered and non-overlapping, so the output is built in one pass
+        parts = []
+        last = 0
+        for ent in self.detect(text):
+            parts.append(text[last:ent['start']])
+            parts.append(f"[{ent['label']}]")
+            last = ent['end']
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def detect_batch(self, texts: Iterable[str], max_workers: int = 1, chunksize: int = 64) -> List[list]:
+        """
+        detect() over many documents. With max_workers > 1 the documents are spread
+        across worker processes; on platforms with fork the workers share the already
+        built gazetteer instead of rebuilding it. Results keep the order of `texts`.
+        """
+        return self._map("detect", texts, max_workers, chunksize)
+
+    def redact_batch(self, texts: Iterable[str], max_workers: int = 1, chunksize: int = 64) -> List[str]:
+        """redact() over many documents; see detect_batch()."""
+        return self._map("redact", texts, max_workers, chunksize)
+
+    def _map(self, method: str, texts: Iterable[str], max_workers: int, chunksize: int) -> list:
+        if max_workers <= 1:
+            return [getattr(self, method)(text) for text in texts]
+        global _WORKER_FILTER
+        self.gazetteer  # build before forking so children inherit it
+        if "fork" in multiprocessing.get_all_start_methods():
+            _WORKER_FILTER = self
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+        else:
+            pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self.entities,))
+        try:
+            with pool:
+                return list(pool.map(_worker_call, repeat(method), texts, chunksize=chunksize))
+        finally:
+            _WORKER_FILTER = None
+
+# Filter used by batch worker processes (inherited on fork, built by _init_worker otherwise)
+_WORKER_FILTER: Optional[NERFilter] = None
+
+def _init_worker(entities: Dict[str, str]):
+    global _WORKER_FILTER
+    _WORKER_FILTER = NERFilter(entities)
+
+def _worker_call(method: str, text: str):
+    return getattr(_WORKER_FILTER, method)(text)
@@ -1,8 +1,44 @@
 
 import numpy as np
-from typing import Any, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, precision_score, recall_score
 
+
+def attack_features(probs: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Per-sample attack features from predicted probabilities, shape (n, 4):
+    true-class confidence, top-1 confidence, top-1 minus top-2 margin, and entropy.
+    """
+    probs = np.asarray(probs, dtype=float)
+    true_conf = probs[np.arange(len(y)), y]
+    top2 = np.partition(probs, -2, axis=1)[:, -2:] if probs.shape[1] > 1 else np.hstack([np.zeros_like(probs), probs])
+    entropy = -np.sum(probs * np.log(np.clip(probs, 1e-12, 1.0)), axis=1)
+    return np.column_stack([true_conf, top2[:, 1], top2[:, 1] - top2[:, 0], entropy])
+
+
+def _train_shadow(model_factory: Callable, X: np.ndarray, y: np.ndarray, seed) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Trains one shadow model on a random half of the shadow data and returns attack
+    features for its members (label 1) and held-out non-members (label 0).
+    Module-level so it can run in a worker process.
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(y))
+    half = len(y) // 2
+    members, non_members = order[:half], order[half:]
+
+    shadow = model_factory()
+    shadow.fit(X[members], y[members])
+    features = np.vstack([
+        attack_features(shadow.predict_proba(X[members]), y[members]),
+        attack_features(shadow.predict_proba(X[non_members]), y[non_members]),
+    ])
+    labels = np.concatenate([np.ones(len(members)), np.zeros(len(non_members))])
+    return features, labels
+
+
 class MIAttacker:
     """
     Simulates a Membership Inference Attack.
@@ -10,7 +46,14 @@ class MIAttacker:
     based on the model's output (confidence scores).
     """
     def __init__(self):
-        pass
+        self.attack_model = None
+
+    def true_class_confidences(self, model: Any, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        The model's confidence on each sample's true class, gathered with one fancy-index.
+        """
+        probs = model.predict_proba(X)
+        return probs[np.arange(len(y)), np.asarray(y)]
 
     def attack_threshold_based(self, model: Any, X: np.ndarray, y: np.ndarray, threshold: float = 0.5) -> np.ndarray:
         """
@@ -26,11 +69,8 @@ class MIAttacker:
         Returns:
             Predictions (1 for Member, 0 for Non-Member).
         """
-        probs = model.predict_proba(X)
-        
-        # Get confidence for the correct class
-        # probs[i, y[i]]
-        confidences = np.array([probs[i, y[i]] for i in range(len(y))])
+        # Get confidence for the correct class: probs[i, y[i]]
+        confidences = self.true_class_confidences(model, X, y)
         
         # If confidence is high, assume it was in training set (overfitting)
         predictions = (confidences > threshold).astype(int)
@@ -61,6 +101,120 @@ class MIAttacker:
             "Attack Recall": rec
         }
 
+    def roc_sweep(self,
+                  member_scores: np.ndarray,
+                  non_member_scores: np.ndarray,
+                  fpr_targets: Sequence[float] = (0.001, 0.01, 0.1)) -> Dict[str, Any]:
+        """
+        Evaluates every possible threshold at once with a single sort.
+        Higher scores mean "more likely a member" (e.g. true-class confidence).
+
+        Returns the ROC curve (thresholds, tpr, fpr), its AUC, the best TPR achievable
+        at each low-FPR target, and the accuracy-maximising threshold. Like
+        attack_threshold_based(), a sample is flagged when score > threshold, so
+        thresholds[i] reproduces (tpr[i], fpr[i]); all thresholds are finite.
+        """
+        scores = np.concatenate([member_scores, non_member_scores])
+        if len(scores) == 0:
+            raise ValueError("roc_sweep() needs at least one member or non-member score.")
+        labels = np.concatenate([np.ones(len(member_scores)), np.zeros(len(non_member_scores))])
+        order = np.argsort(-scores, kind="stable")
+        scores, labels = scores[order], labels[order]
+
+        # Keep the last index of each run of tied scores: one ROC point per distinct threshold
+        distinct = np.flatnonzero(np.diff(scores))
+        cut = np.r_[distinct, len(scores) - 1]
+        tp = np.cumsum(labels)[cut]
+        fp = (cut + 1) - tp
+        tpr = np.r_[0.0, tp / max(len(member_scores), 1)]
+        fpr = np.r_[0.0, fp / max(len(non_member_scores), 1)]
+        # Point i flags the i highest distinct scores: threshold at the next lower score,
+        # and just below the lowest score for the point that flags everything
+        thresholds = np.r_[scores[cut], np.nextafter(scores[-1], -np.inf)]
+
+        # Accuracy counts TPs plus TNs
+        accuracy = (np.r_[0.0, tp] + len(non_member_scores) - np.r_[0.0, fp]) / len(scores)
+        best = int(np.argmax(accuracy))
+
+        tpr_at_fpr = {}
+        for target in fpr_targets:
+            # fpr is non-decreasing, so the last point with fpr <= target has the highest tpr
+            idx = np.searchsorted(fpr, target, side="right") - 1
+            tpr_at_fpr[target] = float(tpr[idx])
+
+        return {
+            "thresholds": thresholds,
+            "tpr": tpr,
+            "fpr": fpr,
+            "auc": float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)),
+            "tpr_at_fpr": tpr_at_fpr,
+            "best_threshold": float(thresholds[best]),
+            "best_accuracy": float(accuracy[best]),
+        }
+
+    def attack_roc(self,
+                   model: Any,
+                   members_X: np.ndarray,
+                   members_y: np.ndarray,
+                   non_members_X: np.ndarray,
+                   non_members_y: np.ndarray,
+                   fpr_targets: Sequence[float] = (0.001, 0.01, 0.1)) -> Dict[str, Any]:
+        """
+        Full threshold sweep of the confidence attack against known members / non-members.
+        """
+        return self.roc_sweep(
+            self.true_class_confidences(model, members_X, members_y),
+            self.true_class_confidences(model, non_members_X, non_members_y),
+            fpr_targets,
+        )
+
+    def train_shadow_attack(self,
+                            model_factory: Callable,
+                            X_shadow: np.ndarray,
+                            y_shadow: np.ndarray,
+                            n_shadow: int = 4,
+                            n_jobs: int = 1,
+                            seed: Optional[int] = None,
+                            attack_model_factory: Callable = LogisticRegression) -> Any:
+        """
+        Shadow-model attack (Shokri et al.): trains `n_shadow` models that imitate the target
+        on data the attacker owns, then learns to tell their members from non-members.
+
+        model_factory: zero-argument callable returning an unfitted model with fit/predict_proba.
+            With n_jobs > 1 shadows train in worker processes, so it must be picklable
+            (e.g. a class or functools.partial).
+        Each shadow gets its own child of SeedSequence(seed), so results are reproducible.
+        """
+        X_shadow, y_shadow = np.asarray(X_shadow), np.asarray(y_shadow)
+        seeds = np.random.SeedSequence(seed).spawn(n_shadow)
+        args = ([model_factory] * n_shadow, [X_shadow] * n_shadow, [y_shadow] * n_shadow, seeds)
+        if n_jobs > 1:
+            with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+                parts = list(pool.map(_train_shadow, *args))
+        else:
+            parts = list(map(_train_shadow, *args))
+
+        features = np.vstack([f for f, _ in parts])
+        labels = np.concatenate([shadow_labels for _, shadow_labels in parts])
+        self.attack_model = attack_model_factory()
+        self.attack_model.fit(features, labels)
+        return self.attack_model
+
+    def attack_shadow_based(self, model: Any, X: np.ndarray, y: np.ndarray, threshold: float = 0.5) -> np.ndarray:
+        """
+        Membership predictions (1 for Member) from the attack model fitted by train_shadow_attack().
+        """
+        return (self.membership_scores(model, X, y) > threshold).astype(int)
+
+    def membership_scores(self, model: Any, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Attack-model membership probabilities; feed these to roc_sweep() for a shadow-attack ROC.
+        """
+        if self.attack_model is None:
+            raise ValueError("Call train_shadow_attack() before using the shadow-model attack.")
+        features = attack_features(model.predict_proba(X), np.asarray(y))
+        return self.attack_model.predict_proba(features)[:, 1]
+
 class MIDefender:
     """
     Implements defenses against Membership Inference Attacks.
@@ -1,10 +1,14 @@
 
 import numpy as np
-from typing import Callable
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union
 
 class AdversarialAttacker:
     """
     Simulates white-box adversarial attacks like FGSM.
+
+    The batch methods take whole NumPy batches (first axis = samples) and a list of
+    epsilons at once; results gain a leading epsilon axis, i.e. shape (n_eps, N, ...).
+    Gradient callbacks are batched too: model_gradient_fn(images, labels) -> gradients.
     """
     
     def __init__(self):
@@ -45,3 +49,138 @@ class AdversarialAttacker:
         perturbed_image = self.fgsm_attack(image, epsilon, data_grad)
         
         return perturbed_image
+
+    def fgsm_batch(self,
+                   images: np.ndarray,
+                   data_grads: np.ndarray,
+                   epsilons: Union[float, Sequence[float]],
+                   clip: Optional[Tuple[float, float]] = None,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        FGSM for a batch of images and every epsilon in one broadcast:
+        out[e] = images + epsilons[e] * sign(data_grads).
+        The sign is computed once; pass `out` (shape (n_eps, *images.shape)) to reuse a buffer.
+        """
+        eps = self._epsilon_grid(epsilons, images.ndim)
+        sign = np.sign(data_grads)
+        if out is None:
+            out = np.empty((len(eps),) + images.shape, dtype=np.result_type(images, float))
+        np.multiply(eps, sign, out=out)
+        out += images
+        if clip is not None:
+            np.clip(out, clip[0], clip[1], out=out)
+        return out
+
+    def pgd_batch(self,
+                  model_gradient_fn: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                  images: np.ndarray,
+                  labels: np.ndarray,
+                  epsilons: Union[float, Sequence[float]],
+                  n_steps: int = 10,
+                  step_size: Optional[Union[float, Sequence[float]]] = None,
+                  clip: Optional[Tuple[float, float]] = None,
+                  random_start: bool = False,
+                  seed: Optional[int] = None,
+                  out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Projected Gradient Descent (L-infinity) for a batch and every epsilon at once.
+
+        Each step moves by step_size * sign(gradient) and projects back onto the
+        epsilon-ball around the clean image (and into `clip`, if given). The default
+        step size is 2.5 * epsilon / n_steps. All epsilons are stacked into one
+        (n_eps * N, ...) batch, so model_gradient_fn is called once per step.
+        Steps reuse the same buffers; pass `out` (shape (n_eps, *images.shape)) to supply one.
+        """
+        eps = self._epsilon_grid(epsilons, images.ndim)
+        alpha = 2.5 * eps / n_steps if step_size is None else self._epsilon_grid(step_size, images.ndim)
+        shape = (len(eps),) + images.shape
+        x = out if out is not None else np.empty(shape, dtype=np.result_type(images, float))
+        if x.shape != shape or not x.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous array of shape {shape}")
+        lower = images - eps
+        upper = images + eps
+        if clip is not None:
+            np.maximum(lower, clip[0], out=lower)
+            np.minimum(upper, clip[1], out=upper)
+
+        if random_start:
+            rng = np.random.default_rng(seed)
+            x[...] = images + eps * rng.uniform(-1.0, 1.0, size=shape)
+            np.clip(x, lower, upper, out=x)
+        else:
+            x[...] = images
+        flat = x.reshape((-1,) + images.shape[1:])
+        tiled_labels = np.tile(np.asarray(labels), len(eps))
+        step = np.empty_like(x)
+
+        for _ in range(n_steps):
+            grads = model_gradient_fn(flat, tiled_labels)
+            np.sign(np.reshape(grads, shape), out=step)
+            step *= alpha
+            x += step
+            # Projection onto the epsilon-ball (and the valid range)
+            np.clip(x, lower, upper, out=x)
+        return x
+
+    def attack_success_curve(self,
+                             model_predict_fn: Callable[[np.ndarray], np.ndarray],
+                             model_gradient_fn: Callable[[np.ndarray, np.ndarray], np.ndarray],
+                             images: np.ndarray,
+                             labels: np.ndarray,
+                             epsilons: Sequence[float],
+                             method: str = "fgsm",
+                             batch_size: int = 256,
+                             clip: Optional[Tuple[float, float]] = None,
+                             **pgd_kwargs) -> Dict[str, list]:
+        """
+        Robustness report over an epsilon sweep. Images are processed `batch_size` at a
+        time to bound memory. model_predict_fn returns labels (N,) or scores (N, n_classes).
+
+        success_rate[e] is the fraction of initially correctly classified images that are
+        misclassified after the attack with epsilons[e].
+        """
+        if method not in ("fgsm", "pgd"):
+            raise ValueError(f"Unknown method '{method}'. Expected 'fgsm' or 'pgd'.")
+        labels = np.asarray(labels)
+        n_eps = len(epsilons)
+        correct_clean = 0
+        robust = np.zeros(n_eps, dtype=np.int64)
+        flipped = np.zeros(n_eps, dtype=np.int64)
+        buffer = None
+
+        for start in range(0, len(images), batch_size):
+            x = images[start:start + batch_size]
+            y = labels[start:start + batch_size]
+            shape = (n_eps,) + x.shape
+            if buffer is None or buffer.shape != shape:
+                buffer = np.empty(shape, dtype=np.result_type(x, float))
+            if method == "fgsm":
+                adv = self.fgsm_batch(x, model_gradient_fn(x, y), epsilons, clip=clip, out=buffer)
+            else:
+                adv = self.pgd_batch(model_gradient_fn, x, y, epsilons, clip=clip, out=buffer, **pgd_kwargs)
+
+            clean_ok = self._predict_labels(model_predict_fn, x) == y
+            adv_pred = self._predict_labels(model_predict_fn, adv.reshape((-1,) + x.shape[1:])).reshape(n_eps, len(x))
+            adv_ok = adv_pred == y
+            correct_clean += int(clean_ok.sum())
+            robust += adv_ok.sum(axis=1)
+            flipped += (clean_ok & ~adv_ok).sum(axis=1)
+
+        n = len(images)
+        return {
+            "epsilons": [float(e) for e in epsilons],
+            "clean_accuracy": correct_clean / n if n else 0.0,
+            "robust_accuracy": (robust / n).tolist() if n else [0.0] * n_eps,
+            "success_rate": (flipped / correct_clean).tolist() if correct_clean else [0.0] * n_eps,
+        }
+
+    @staticmethod
+    def _epsilon_grid(epsilons, image_ndim: int) -> np.ndarray:
+        """Epsilons as shape (n_eps, 1, ..., 1) so they broadcast over a batch of images."""
+        eps = np.atleast_1d(np.asarray(epsilons, dtype=float))
+        return eps.reshape((-1,) + (1,) * image_ndim)
+
+    @staticmethod
+    def _predict_labels(model_predict_fn, images: np.ndarray) -> np.ndarray:
+        preds = np.asarray(model_predict_fn(images))
+        return preds.argmax(axis=1) if preds.ndim > 1 else preds
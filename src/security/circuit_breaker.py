@@ -1,55 +1,208 @@
-
-from typing import List, Dict, Optional
+from collections import deque
+from typing import Callable, List, Dict, Optional, Sequence
 import time
 
+import numpy as np
+import pandas as pd
+
+class _PriceWindow:
+    """
+    Sliding time window of one asset's ticks with O(1) amortized max/min.
+
+    `maxq` / `minq` are monotonic deques: each holds only the ticks that can still
+    become the window maximum (minimum), so the extreme is always at the front.
+    """
+    __slots__ = ("ticks", "maxq", "minq")
+
+    def __init__(self):
+        self.ticks = deque()  # (price, timestamp)
+        self.maxq = deque()
+        self.minq = deque()
+
+    def push(self, price: float, timestamp: float, horizon: float):
+        """Adds a tick and evicts ticks older than `horizon`."""
+        tick = (price, timestamp)
+        self.ticks.append(tick)
+        maxq, minq = self.maxq, self.minq
+        while maxq and maxq[-1][0] <= price:
+            maxq.pop()
+        maxq.append(tick)
+        while minq and minq[-1][0] >= price:
+            minq.pop()
+        minq.append(tick)
+
+        ticks = self.ticks
+        while ticks[0][1] < horizon:
+            ticks.popleft()
+        while maxq[0][1] < horizon:
+            maxq.popleft()
+        while minq[0][1] < horizon:
+            minq.popleft()
+
+    def drawdown(self) -> float:
+        if len(self.ticks) < 2:
+            return 0.0
+        max_p = self.maxq[0][0]
+        return (max_p - self.minq[0][0]) / max_p if max_p > 0 else 0.0
+
+def _sliding_extrema(values: np.ndarray, starts: np.ndarray):
+    """
+    max/min of values[starts[i]:i + 1] for every i, using a sparse table over
+    power-of-two spans. Levels only go up to the longest window, so memory is
+    O(n log window) rather than O(n log n).
+    """
+    n = len(values)
+    lengths = np.arange(n) - starts + 1
+    levels = max(int(lengths.max()).bit_length(), 1)
+    table_max = np.empty((levels, n))
+    table_min = np.empty((levels, n))
+    table_max[0] = table_min[0] = values
+    for k in range(1, levels):
+        half = 1 << (k - 1)
+        table_max[k] = table_max[k - 1]
+        table_min[k] = table_min[k - 1]
+        np.maximum(table_max[k - 1][:-half], table_max[k - 1][half:], out=table_max[k][:-half])
+        np.minimum(table_min[k - 1][:-half], table_min[k - 1][half:], out=table_min[k][:-half])
+
+    k = np.floor(np.log2(lengths)).astype(np.int64)
+    right = np.arange(n) - (1 << k) + 1
+    window_max = np.maximum(table_max[k, starts], table_max[k, right])
+    window_min = np.minimum(table_min[k, starts], table_min[k, right])
+    return window_max, window_min
+
 class TradingCircuitBreaker:
     """
     Day 88: Flash Crash Safeguards.
-    Implements volatility-based circuit breakers and 
+    Implements volatility-based circuit breakers and
     liquidation dampeners to prevent AI-driven flash crashes.
+
+    Each asset keeps a sliding window with monotonic max/min deques, so a tick costs
+    O(1) amortized regardless of window length. `clock` supplies "now" when ticks
+    carry no timestamp; pass a fake clock (or explicit timestamps) for replay.
+    Timestamps are expected to be non-decreasing per asset.
     """
-    def __init__(self, 
-                 max_drawdown_pct: float = 0.05, 
+    def __init__(self,
+                 max_drawdown_pct: float = 0.05,
                  window_seconds: int = 60,
-                 cooldown_seconds: int = 300):
+                 cooldown_seconds: int = 300,
+                 clock: Callable[[], float] = time.time,
+                 verbose: bool = True):
         self.max_drawdown_pct = max_drawdown_pct
         self.window_seconds = window_seconds
         self.cooldown_seconds = cooldown_seconds
-        
-        # (asset) -> list of (price, timestamp)
-        self.price_history: Dict[str, List[tuple]] = {}
+        self.clock = clock
+        self.verbose = verbose
+
+        # (asset) -> sliding window of (price, timestamp)
+        self.windows: Dict[str, _PriceWindow] = {}
         # (asset) -> halt_until_timestamp
         self.halts: Dict[str, float] = {}
 
-    def update_price(self, asset: str, price: float):
-        """Logs a new price and checks for volatility triggers."""
-        if asset not in self.price_history:
-            self.price_history[asset] = []
-            
-        now = time.time()
-        self.price_history[asset].append((price, now))
-        
-        # Cleanup old data
-        self.price_history[asset] = [p for p in self.price_history[asset] if (now - p[1]) <= self.window_seconds]
-        
+    @property
+    def price_history(self) -> Dict[str, List[tuple]]:
+        """(asset) -> list of (price, timestamp) currently inside the window."""
+        return {asset: list(window.ticks) for asset, window in self.windows.items()}
+
+    def update_price(self, asset: str, price: float, timestamp: Optional[float] = None) -> bool:
+        """Logs a new price and checks for volatility triggers. Returns True if the breaker tripped."""
+        now = self.clock() if timestamp is None else timestamp
+        window = self.windows.get(asset)
+        if window is None:
+            window = self.windows[asset] = _PriceWindow()
+        window.push(price, now, now - self.window_seconds)
+
         # Check for crash
-        if len(self.price_history[asset]) > 1:
-            prices = [p[0] for p in self.price_history[asset]]
-            max_p = max(prices)
-            min_p = min(prices)
-            drawdown = (max_p - min_p) / max_p
-            
-            if drawdown >= self.max_drawdown_pct:
-                self.halts[asset] = now + self.cooldown_seconds
-                print(f"[CIRCUIT BREAKER] Flash crash detected in {asset}! Halting all trades for {self.cooldown_seconds}s.")
+        if window.drawdown() >= self.max_drawdown_pct:
+            self._halt(asset, now)
+            return True
+        return False
+
+    def update_prices(self,
+                      assets: Sequence[str],
+                      prices: Sequence[float],
+                      timestamps: Optional[Sequence[float]] = None) -> List[str]:
+        """
+        Applies a burst of ticks in order. Without timestamps, the whole burst is stamped
+        with a single clock reading. Returns the assets that tripped, in first-trip order.
+        """
+        if timestamps is None:
+            now = self.clock()
+            timestamps = [now] * len(assets)
+        tripped = {}
+        for asset, price, timestamp in zip(assets, prices, timestamps):
+            if self.update_price(asset, price, timestamp):
+                tripped[asset] = True
+        return list(tripped)
+
+    def replay_ticks(self, assets, prices, timestamps) -> Dict[str, int]:
+        """
+        Vectorized replay of a historical tick log. Gives the same halts and final windows
+        as calling update_price() tick by tick, but evaluates every window with NumPy.
+        Ticks are ordered by timestamp within each asset; ties keep log order.
+        Returns {asset: number of trips} for assets that tripped.
+        """
+        prices = np.asarray(prices, dtype=float)
+        timestamps = np.asarray(timestamps, dtype=float)
+        if len(prices) == 0:
+            return {}
+        codes, names = pd.factorize(np.asarray(assets))
+        order = np.lexsort((timestamps, codes))
+        codes, prices, timestamps = codes[order], prices[order], timestamps[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+
+        trips = {}
+        for start, end in zip(np.r_[0, bounds], np.r_[bounds, len(codes)]):
+            asset = str(names[codes[start]])
+            window = self.windows.get(asset)
+            # Ticks already in the live window count towards the first replayed windows
+            history = list(window.ticks) if window is not None else []
+            p = np.concatenate([[t[0] for t in history], prices[start:end]])
+            ts = np.concatenate([[t[1] for t in history], timestamps[start:end]])
+
+            starts = np.searchsorted(ts, ts - self.window_seconds, side="left")
+            window_max, window_min = _sliding_extrema(p, starts)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                drawdown = np.where(window_max > 0, (window_max - window_min) / window_max, 0.0)
+            tripped = (drawdown >= self.max_drawdown_pct) & (starts < np.arange(len(p)))
+            tripped[:len(history)] = False
+
+            hits = np.flatnonzero(tripped)
+            if len(hits):
+                trips[asset] = len(hits)
+                self.halts[asset] = float(ts[hits[-1]]) + self.cooldown_seconds
+
+            # Rebuild the live window from the ticks still inside it
+            window = self.windows[asset] = _PriceWindow()
+            horizon = ts[-1] - self.window_seconds
+            for i in range(starts[-1], len(p)):
+                window.push(float(p[i]), float(ts[i]), horizon)
+
+        if self.verbose:
+            for asset, count in trips.items():
+                print(f"[CIRCUIT BREAKER] Replay: {asset} tripped {count} time(s); halted until {self.halts[asset]}.")
+        return trips
+
+    def replay_file(self, path: str,
+                    asset_col: str = "asset",
+                    price_col: str = "price",
+                    timestamp_col: str = "timestamp") -> Dict[str, int]:
+        """Replays a CSV tick file with asset, price and timestamp columns. See replay_ticks()."""
+        ticks = pd.read_csv(path, usecols=[asset_col, price_col, timestamp_col])
+        return self.replay_ticks(ticks[asset_col].to_numpy(), ticks[price_col].to_numpy(),
+                                 ticks[timestamp_col].to_numpy())
+
+    def _halt(self, asset: str, now: float):
+        self.halts[asset] = now + self.cooldown_seconds
+        if self.verbose:
+            print(f"[CIRCUIT BREAKER] Flash crash detected in {asset}! Halting all trades for {self.cooldown_seconds}s.")
 
     def can_trade(self, asset: str) -> bool:
         """Checks if the asset is currently under a halt."""
-        now = time.time()
+        now = self.clock()
         halt_until = self.halts.get(asset, 0)
         return now > halt_until
 
     def get_status(self, asset: str) -> str:
         if self.can_trade(asset):
             return "ACTIVE"
-        return f"HALTED (until {round(self.halts[asset] - time.time())}s remaining)"
+        return f"HALTED (until {round(self.halts[asset] - self.clock())}s remaining)"
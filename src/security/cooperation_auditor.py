@@ -1,6 +1,8 @@
-
-from typing import List, Dict, Any, Tuple
+from typing import Dict, Any, Callable, Iterable, Optional
+from collections import Counter, deque
 from dataclasses import dataclass
+import heapq
+import time
 
 @dataclass
 class AgentAction:
@@ -11,59 +13,163 @@ class AgentAction:
 class CooperationAuditor:
     """
     Day 99: Cooperative AI Safety.
-    Analyzes multi-agent interactions to detect non-cooperative 
+    Analyzes multi-agent interactions to detect non-cooperative
     patterns and systemic risks in agent populations.
+
+    Action counts are kept per agent and globally as actions are logged, so audits
+    cost O(agents) instead of rescanning the history for every agent.
+
+    - `window_seconds`: only actions from the last window count; older ones are aged out.
+    - `keep_history`: set False to keep counts only (no per-action log). Windowed
+      auditors always keep the actions still inside the window.
+    - `clock`: time source used when log_action() gets no timestamp, and as "now" for aging.
     """
-    def __init__(self):
-        self.history: List[AgentAction] = []
+    def __init__(self,
+                 window_seconds: Optional[float] = None,
+                 keep_history: bool = True,
+                 clock: Callable[[], float] = time.time):
+        self.window_seconds = window_seconds
+        self.keep_history = keep_history or window_seconds is not None
+        self.clock = clock
+        self.history = deque() if window_seconds is not None else []
+
+        self.agent_actions: Counter = Counter()
+        self.agent_defects: Counter = Counter()
+        self.total_actions = 0
+        self.total_cooperations = 0
+        self.total_defects = 0
+
+    def log_action(self, agent_id: str, action: str, timestamp: Optional[float] = None):
+        now = self.clock() if timestamp is None else timestamp
+        if self.keep_history:
+            self.history.append(AgentAction(agent_id, action, now))
+        self._count(agent_id, action, 1)
+        if self.window_seconds is not None:
+            self._expire(now)
+
+    def merge(self, other: "CooperationAuditor") -> "CooperationAuditor":
+        """
+        Folds another auditor's counts (e.g. from a simulation shard) into this one.
+        Histories are merged in timestamp order.
+
+        Raises ValueError if the other auditor's settings would leave the merged counts
+        wrong: a windowed auditor needs every shard's actions to age them out (so the
+        shard must keep history and not use a shorter window), and an auditor without
+        a window cannot take counts that were already aged out.
+        """
+        self._check_mergeable(other)
+        self._add_counts(other)
+        if self.keep_history:
+            self._set_history(heapq.merge(self.history, other.history, key=lambda a: a.timestamp))
+        return self
+
+    @classmethod
+    def from_shards(cls, shards: Iterable["CooperationAuditor"], **kwargs: Any) -> "CooperationAuditor":
+        """
+        Combines the auditors of several shards into a new auditor, with one k-way merge
+        of their histories. Raises ValueError like merge().
+        """
+        combined = cls(**kwargs)
+        shards = list(shards)
+        for shard in shards:
+            combined._check_mergeable(shard)
+        for shard in shards:
+            combined._add_counts(shard)
+        if combined.keep_history:
+            combined._set_history(heapq.merge(*(s.history for s in shards), key=lambda a: a.timestamp))
+        return combined
+
+    def _check_mergeable(self, other: "CooperationAuditor"):
+        if self.window_seconds is None:
+            if other.window_seconds is not None:
+                raise ValueError("Cannot merge a windowed auditor into one without a window: "
+                                 "its aged-out actions are no longer counted.")
+            if self.keep_history and not other.keep_history:
+                raise ValueError("Cannot merge an auditor with keep_history=False into one that keeps history.")
+            return
+        if not other.keep_history:
+            raise ValueError("Cannot merge an auditor with keep_history=False into a windowed auditor: "
+                             "its actions could never be aged out.")
+        if other.window_seconds is not None and other.window_seconds < self.window_seconds:
+            raise ValueError(f"Cannot merge an auditor with a {other.window_seconds}s window "
+                             f"into one with a {self.window_seconds}s window.")
+
+    def _add_counts(self, other: "CooperationAuditor"):
+        self.agent_actions.update(other.agent_actions)
+        self.agent_defects.update(other.agent_defects)
+        self.total_actions += other.total_actions
+        self.total_cooperations += other.total_cooperations
+        self.total_defects += other.total_defects
 
-    def log_action(self, agent_id: str, action: str):
-        import time
-        self.history.append(AgentAction(agent_id, action, time.time()))
+    def _set_history(self, actions: Iterable[AgentAction]):
+        if self.window_seconds is None:
+            self.history = list(actions)
+        else:
+            self.history = deque(actions)
+            self._expire(self.clock())
 
     def analyze_social_welfare(self) -> float:
         """
         Calculates a simple social welfare score.
         1.0 = Perfect Cooperation, 0.0 = Total Defection.
         """
-        if not self.history: return 1.0
-        coop_count = len([a for a in self.history if a.action == "COOPERATE"])
-        return coop_count / len(self.history)
+        self._age_out()
+        if not self.total_actions: return 1.0
+        return self.total_cooperations / self.total_actions
 
     def detect_predatory_behavior(self, agent_id: str) -> bool:
         """
         Detects if an agent is defecting significantly more than others.
         """
-        agent_history = [a for a in self.history if a.agent_id == agent_id]
-        if not agent_history: return False
-        
-        agent_defects = len([a for a in agent_history if a.action == "DEFECT"])
-        agent_rate = agent_defects / len(agent_history)
-        
-        # Compare to global defect rate
-        global_defects = len([a for a in self.history if a.action == "DEFECT"])
-        global_rate = global_defects / len(self.history)
-        
-        # If agent defects 2x more than average and rate > 50%
-        return agent_rate > 0.5 and agent_rate > (global_rate * 1.5)
+        self._age_out()
+        return self._is_predatory(agent_id)
 
     def audit_system(self) -> Dict[str, Any]:
         welfare = self.analyze_social_welfare()
-        suspicious_agents = []
-        
-        agents = set([a.agent_id for a in self.history])
-        for agent in agents:
-            if self.detect_predatory_behavior(agent):
-                suspicious_agents.append(agent)
-                
+        suspicious_agents = [agent for agent in self.agent_actions if self._is_predatory(agent)]
+
         status = "STABLE"
         if welfare < 0.3:
             status = "SYSTEMIC_COLLAPSE_RISK"
         elif suspicious_agents:
             status = "PREDATORY_BEHAVIOR_DETECTED"
-            
+
         return {
             "social_welfare": round(welfare, 2),
             "status": status,
             "flagged_agents": suspicious_agents
         }
+
+    def _is_predatory(self, agent_id: str) -> bool:
+        agent_total = self.agent_actions.get(agent_id, 0)
+        if not agent_total: return False
+        agent_rate = self.agent_defects[agent_id] / agent_total
+
+        # Compare to global defect rate
+        global_rate = self.total_defects / self.total_actions
+
+        # If agent defects 2x more than average and rate > 50%
+        return agent_rate > 0.5 and agent_rate > (global_rate * 1.5)
+
+    def _count(self, agent_id: str, action: str, delta: int):
+        self.agent_actions[agent_id] += delta
+        self.total_actions += delta
+        if action == "DEFECT":
+            self.agent_defects[agent_id] += delta
+            self.total_defects += delta
+        elif action == "COOPERATE":
+            self.total_cooperations += delta
+        if self.agent_actions[agent_id] == 0:
+            del self.agent_actions[agent_id]
+            self.agent_defects.pop(agent_id, None)
+
+    def _age_out(self):
+        if self.window_seconds is not None:
+            self._expire(self.clock())
+
+    def _expire(self, now: float):
+        horizon = now - self.window_seconds
+        history = self.history
+        while history and history[0].timestamp < horizon:
+            old = history.popleft()
+            self._count(old.agent_id, old.action, -1)
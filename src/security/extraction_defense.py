@@ -1,35 +1,34 @@
 
 import numpy as np
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from src.security.rate_limit import RateLimiter, SlidingLogLimiter
 
 class ExtractionDefender:
     """
     Defends against Model Extraction attacks by monitoring query entropy 
     and applying output watermarking.
+
+    Rate limiting is delegated to a pluggable RateLimiter (see src.security.rate_limit).
+    The default is an exact sliding log of `rate_limit` queries per `window_seconds`;
+    pass e.g. GCRALimiter(..., backend=SQLiteBackend(path)) to share one quota
+    across worker processes.
     """
-    def __init__(self, rate_limit: int = 100, window_seconds: int = 60):
+    def __init__(self, rate_limit: int = 100, window_seconds: int = 60,
+                 limiter: Optional[RateLimiter] = None):
         self.rate_limit = rate_limit
         self.window_seconds = window_seconds
-        self.query_log: Dict[str, List[float]] = {}
+        self.limiter = limiter if limiter is not None else SlidingLogLimiter(rate_limit, window_seconds)
         self.watermark_key = 0.12345
 
     def check_rate_limit(self, user_id: str) -> bool:
         """
-        Simple rate limiting.
+        Returns True and records the query if the user is within quota.
         """
-        now = time.time()
-        if user_id not in self.query_log:
-            self.query_log[user_id] = []
-        
-        # Clean old queries
-        self.query_log[user_id] = [t for t in self.query_log[user_id] if now - t < self.window_seconds]
-        
-        if len(self.query_log[user_id]) >= self.rate_limit:
-            return False
-        
-        self.query_log[user_id].append(now)
-        return True
+        return self.limiter.allow(user_id)
 
     def apply_watermark(self, probs: np.ndarray) -> np.ndarray:
         """
@@ -46,13 +45,42 @@ class ExtractionDefender:
         perturbed = perturbed / perturbed.sum(axis=1)[:, np.newaxis]
         return perturbed
 
-    def detect_shadow_model(self, shadow_model_probs: np.ndarray) -> float:
+    def watermark_scores(self, suspect_probs: np.ndarray, reference_probs: np.ndarray,
+                         batch_size: int = 65536) -> np.ndarray:
+        """
+        Per-query watermark strength of a suspect model's outputs, given our clean
+        outputs for the same queries: the projection of (suspect - clean) onto the shift
+        apply_watermark() makes, so 1.0 = fully watermarked and 0.0 = no trace.
+        Queries whose clean output is uniform (no shift) score NaN.
+        Processed in batches so very large query sets do not need a full-size temporary.
+        """
+        suspect_probs = np.asarray(suspect_probs, dtype=float)
+        reference_probs = np.asarray(reference_probs, dtype=float)
+        scores = np.empty(len(reference_probs))
+        for start in range(0, len(reference_probs), batch_size):
+            ref = reference_probs[start:start + batch_size]
+            shift = self.apply_watermark(ref) - ref
+            residual = suspect_probs[start:start + batch_size] - ref
+            norm = np.einsum("ij,ij->i", shift, shift)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores[start:start + len(ref)] = np.where(
+                    norm > 1e-24, np.einsum("ij,ij->i", residual, shift) / norm, np.nan)
+        return scores
+
+    def detect_shadow_model(self, shadow_model_probs: np.ndarray,
+                            reference_probs: Optional[np.ndarray] = None) -> float:
         """
         Heuristic to detect if a shadow model was trained on watermarked data.
-        In reality, this would involve comparing distributions.
+        `reference_probs` are our clean outputs on the same queries; the result is the
+        mean watermark score clipped to [0, 1]. Without them the watermark cannot be
+        separated from the model's own outputs, and 0.0 is returned.
         """
-        # Implementation placeholder
-        return 0.0
+        if reference_probs is None or len(shadow_model_probs) == 0:
+            return 0.0
+        scores = self.watermark_scores(shadow_model_probs, reference_probs)
+        if np.all(np.isnan(scores)):
+            return 0.0
+        return float(np.clip(np.nanmean(scores), 0.0, 1.0))
 
 class QueryMonitor:
     """
@@ -71,3 +99,125 @@ class QueryMonitor:
         entropy = -np.sum(probs * np.log(probs + 1e-10), axis=1)
         # High entropy = suspicion
         return np.mean(entropy)
+
+class StreamingExtractionDetector:
+    """
+    Flags users whose queries keep landing near the decision boundary, one response at a time.
+
+    Each user keeps two fixed-size histograms (normalized entropy and top-1/top-2 margin),
+    so memory per user is O(n_bins) regardless of query volume. At most `max_users` users
+    are tracked; the least recently seen are dropped beyond that.
+    A user is suspicious once they have `min_queries` queries and more than
+    `boundary_fraction` of them have a margin below `boundary_margin`.
+
+    Every statistic is halved each `half_life_seconds` (periods of the clock), so old
+    queries fade out and a user who stops probing the boundary is eventually unflagged.
+    Query counts are therefore recency-weighted. Pass half_life_seconds=None to keep
+    counts forever.
+    """
+    def __init__(self,
+                 n_bins: int = 20,
+                 boundary_margin: float = 0.1,
+                 boundary_fraction: float = 0.5,
+                 min_queries: int = 20,
+                 max_users: int = 100_000,
+                 half_life_seconds: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.time):
+        self.n_bins = n_bins
+        self.boundary_margin = boundary_margin
+        self.boundary_fraction = boundary_fraction
+        self.min_queries = min_queries
+        self.max_users = max_users
+        self.half_life_seconds = half_life_seconds
+        self.clock = clock
+        # user_id -> [entropy histogram, margin histogram, boundary weight, entropy sum, query weight, decay period]
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, user_id: str, probs: np.ndarray) -> bool:
+        """
+        Records the model outputs served to a user (one row or a batch of rows).
+        Returns whether the user is currently flagged.
+        """
+        probs = np.atleast_2d(np.asarray(probs, dtype=float))
+        n_classes = probs.shape[1]
+        entropy = -np.einsum("ij,ij->i", probs, np.log(probs + 1e-10))
+        if n_classes > 1:
+            entropy /= np.log(n_classes)
+            top2 = np.partition(probs, n_classes - 2, axis=1)
+            margin = top2[:, -1] - top2[:, -2]
+        else:
+            margin = np.ones(len(probs))
+        entropy_bins = np.minimum((entropy * self.n_bins).astype(int), self.n_bins - 1)
+        margin_bins = np.minimum((margin * self.n_bins).astype(int), self.n_bins - 1)
+
+        period = self._period()
+        with self._lock:
+            stats = self._users.get(user_id)
+            if stats is None:
+                stats = [np.zeros(self.n_bins), np.zeros(self.n_bins), 0.0, 0.0, 0.0, period]
+                self._users[user_id] = stats
+                if len(self._users) > self.max_users:
+                    self._users.popitem(last=False)
+            else:
+                self._decay(stats, period)
+            self._users.move_to_end(user_id)
+            if len(probs) == 1:
+                # Inline path for a single response: scalar updates skip the bincount temporaries
+                stats[0][entropy_bins[0]] += 1
+                stats[1][margin_bins[0]] += 1
+            else:
+                stats[0] += np.bincount(entropy_bins, minlength=self.n_bins)
+                stats[1] += np.bincount(margin_bins, minlength=self.n_bins)
+            stats[2] += int(np.count_nonzero(margin < self.boundary_margin))
+            stats[3] += float(entropy.sum())
+            stats[4] += len(probs)
+            return self._is_suspicious(stats, period)
+
+    def user_report(self, user_id: str) -> Optional[Dict[str, Any]]:
+        period = self._period()
+        with self._lock:
+            stats = self._users.get(user_id)
+            if stats is None:
+                return None
+            self._decay(stats, period)
+            stats = [stats[0].copy(), stats[1].copy(), stats[2], stats[3], stats[4], period]
+        n = stats[4]
+        return {
+            "user_id": user_id,
+            "queries": n,
+            "mean_normalized_entropy": stats[3] / n if n else 0.0,
+            "boundary_fraction": stats[2] / n if n else 0.0,
+            "entropy_histogram": stats[0].tolist(),
+            "margin_histogram": stats[1].tolist(),
+            "suspicious": self._is_suspicious(stats, period),
+        }
+
+    def flagged_users(self) -> List[str]:
+        period = self._period()
+        with self._lock:
+            return [user_id for user_id, stats in self._users.items() if self._is_suspicious(stats, period)]
+
+    def _period(self) -> int:
+        if self.half_life_seconds is None:
+            return 0
+        return int(self.clock() // self.half_life_seconds)
+
+    def _factor(self, stats, period: int) -> float:
+        # Halving whole periods keeps counts within a period exact
+        return 0.5 ** (period - stats[5]) if period > stats[5] else 1.0
+
+    def _decay(self, stats, period: int):
+        factor = self._factor(stats, period)
+        if factor != 1.0:
+            stats[0] *= factor
+            stats[1] *= factor
+            stats[2] *= factor
+            stats[3] *= factor
+            stats[4] *= factor
+        stats[5] = max(stats[5], period)
+
+    def _is_suspicious(self, stats, period: int) -> bool:
+        # Decay scales every statistic alike, so only the query weight needs it here
+        n = stats[4] * self._factor(stats, period)
+        return n >= self.min_queries and stats[2] > self.boundary_fraction * stats[4]
@@ -1,71 +1,184 @@
-
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any, Optional, Sequence
 import time
 
+import numpy as np
+
+class _OrderColumns:
+    """
+    Append-only columnar order log. Each field is a NumPy array that grows by doubling,
+    so appends are amortized O(1) and detectors can work on whole columns at once.
+    """
+    FIELDS = (("agent", np.int64), ("price", np.float64), ("volume", np.float64),
+              ("action", np.int64), ("timestamp", np.float64))
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.FIELDS}
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        capacity = len(self.columns["agent"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def append(self, **values):
+        self._reserve(1)
+        for name, value in values.items():
+            self.columns[name][self.size] = value
+        self.size += 1
+
+    def extend(self, **values):
+        n = len(values["agent"])
+        self._reserve(n)
+        for name, value in values.items():
+            self.columns[name][self.size:self.size + n] = value
+        self.size += n
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.size]
+
 class MarketMonitor:
     """
     Day 87: Market Manipulation Detector.
-    Monitors trading logs to detect patterns of 'spoofing', 
+    Monitors trading logs to detect patterns of 'spoofing',
     'wash trading', and 'pump and dump' behavior by AI agents.
+
+    Orders go to a columnar log (action strings are stored as integer codes) and every
+    detector input is kept as a per-agent counter updated on append, so auditing one
+    agent is O(1) and audit_all_agents() scores everyone with array operations.
     """
-    def __init__(self, volume_threshold: float = 1000.0):
+    # Opposing trades closer together than this (seconds) count towards wash trading
+    WASH_WINDOW_SECONDS = 0.1
+
+    def __init__(self, volume_threshold: float = 1000.0, clock: Callable[[], float] = time.time):
         self.volume_threshold = volume_threshold
-        # Tracks (agent_id) -> list of orders: (price, vol, timestamp, status)
-        self.order_history: Dict[str, List[Dict[str, Any]]] = {}
+        self.clock = clock
+        self.orders = _OrderColumns()
+        self.action_codes: Dict[str, int] = {}
+        self.agent_index: Dict[str, int] = {}
+        self.agent_ids: List[str] = []
+
+        # Per-agent counters, indexed like agent_ids
+        self._n_orders = np.zeros(0, dtype=np.int64)
+        self._large_placements = np.zeros(0, dtype=np.int64)
+        self._large_cancellations = np.zeros(0, dtype=np.int64)
+        self._opposing_trades = np.zeros(0, dtype=np.int64)
+        self._last_price = np.zeros(0)
+        self._last_action = np.zeros(0, dtype=np.int64)
+        self._last_timestamp = np.zeros(0)
+        # The large-order counters depend on the threshold; they are rebuilt if it changes
+        self._counted_threshold = volume_threshold
 
-    def log_order(self, agent_id: str, price: float, volume: float, action: str):
+    @property
+    def order_history(self) -> Dict[str, List[Dict[str, Any]]]:
+        """(agent_id) -> list of orders as dicts. Materialized from the columnar log."""
+        actions = {code: name for name, code in self.action_codes.items()}
+        history = {agent_id: [] for agent_id in self.agent_ids}
+        agent, price, volume = self.orders["agent"], self.orders["price"], self.orders["volume"]
+        action, timestamp = self.orders["action"], self.orders["timestamp"]
+        for i in range(self.orders.size):
+            history[self.agent_ids[agent[i]]].append({
+                "price": float(price[i]),
+                "volume": float(volume[i]),
+                "action": actions[action[i]],
+                "timestamp": float(timestamp[i])
+            })
+        return history
+
+    def log_order(self, agent_id: str, price: float, volume: float, action: str,
+                  timestamp: Optional[float] = None):
         """
         Logs a new order action (PLACE, CANCEL, EXECUTE).
         """
-        if agent_id not in self.order_history:
-            self.order_history[agent_id] = []
-            
-        self.order_history[agent_id].append({
-            "price": price,
-            "volume": volume,
-            "action": action,
-            "timestamp": time.time()
-        })
+        agent = self._agent(agent_id)
+        code = self._action_code(action)
+        now = self.clock() if timestamp is None else timestamp
+        self._sync_threshold()
+        self.orders.append(agent=agent, price=price, volume=volume, action=code, timestamp=now)
+
+        if self._n_orders[agent] and self._last_price[agent] == price and self._last_action[agent] != code \
+                and now - self._last_timestamp[agent] < self.WASH_WINDOW_SECONDS:
+            self._opposing_trades[agent] += 1
+        if volume > self.volume_threshold:
+            if action == "PLACE":
+                self._large_placements[agent] += 1
+            elif action == "CANCEL":
+                self._large_cancellations[agent] += 1
+        self._n_orders[agent] += 1
+        self._last_price[agent] = price
+        self._last_action[agent] = code
+        self._last_timestamp[agent] = now
+
+    def log_orders(self, agent_ids: Sequence[str], prices: Sequence[float], volumes: Sequence[float],
+                   actions: Sequence[str], timestamps: Optional[Sequence[float]] = None):
+        """
+        Logs a batch of orders in the given order. Equivalent to calling log_order()
+        for each, but the counters are updated with array operations.
+        Without timestamps, the whole batch is stamped with a single clock reading.
+        """
+        n = len(agent_ids)
+        if n == 0:
+            return
+        agents = np.fromiter((self._agent(a) for a in agent_ids), dtype=np.int64, count=n)
+        codes = np.fromiter((self._action_code(a) for a in actions), dtype=np.int64, count=n)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.float64)
+        timestamps = np.full(n, self.clock()) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        self._sync_threshold()
+        self.orders.extend(agent=agents, price=prices, volume=volumes, action=codes, timestamp=timestamps)
+
+        # Previous order of each row's agent: the row before it in a stable per-agent
+        # ordering of the batch, or the agent's last logged order for its first row
+        order = np.argsort(agents, kind="stable")
+        a, p, c, t = agents[order], prices[order], codes[order], timestamps[order]
+        first = np.r_[True, a[1:] != a[:-1]]
+        prev_p, prev_c, prev_t = np.r_[0.0, p[:-1]], np.r_[0, c[:-1]], np.r_[0.0, t[:-1]]
+        prev_p[first], prev_c[first], prev_t[first] = self._last_price[a[first]], \
+            self._last_action[a[first]], self._last_timestamp[a[first]]
+        has_prev = ~first | (self._n_orders[a] > 0)
+        opposing = has_prev & (prev_p == p) & (prev_c != c) & (t - prev_t < self.WASH_WINDOW_SECONDS)
+
+        n_agents = len(self._n_orders)
+        large = volumes > self.volume_threshold
+        self._opposing_trades += np.bincount(a, weights=opposing, minlength=n_agents).astype(np.int64)
+        self._large_placements += self._count_large(agents, codes, large, "PLACE", n_agents)
+        self._large_cancellations += self._count_large(agents, codes, large, "CANCEL", n_agents)
+        self._n_orders += np.bincount(agents, minlength=n_agents)
+        last = np.r_[a[1:] != a[:-1], True]
+        self._last_price[a[last]] = p[last]
+        self._last_action[a[last]] = c[last]
+        self._last_timestamp[a[last]] = t[last]
 
     def detect_spoofing(self, agent_id: str) -> bool:
         """
-        Detects if an agent frequently PLACES high-volume orders 
+        Detects if an agent frequently PLACES high-volume orders
         and CANCELS them without execution (Spoofing).
         """
-        history = self.order_history.get(agent_id, [])
-        if len(history) < 5: return False
-        
-        cancellations = [o for o in history if o["action"] == "CANCEL" and o["volume"] > self.volume_threshold]
-        placements = [o for o in history if o["action"] == "PLACE" and o["volume"] > self.volume_threshold]
-        
-        # If cancellation rate of large orders is > 80%
-        if len(placements) > 0 and (len(cancellations) / len(placements)) > 0.8:
-            return True
-        return False
+        if agent_id not in self.agent_index:
+            return False
+        self._sync_threshold()
+        return bool(self._spoofing_flags(self.agent_index[agent_id]))
 
     def detect_wash_trading(self, agent_id: str) -> bool:
         """
-        Detects if an agent is trading with themselves (simulated here by 
+        Detects if an agent is trading with themselves (simulated here by
         multiple high-speed opposing trades at the same price).
         """
-        history = self.order_history.get(agent_id, [])
-        if len(history) < 4: return False
-        
-        # Simple heuristic: fast alternating buy/sell at same price
-        opposing_trades = 0
-        for i in range(1, len(history)):
-            prev, curr = history[i-1], history[i]
-            if prev["price"] == curr["price"] and prev["action"] != curr["action"]:
-                if (curr["timestamp"] - prev["timestamp"]) < 0.1: # Speed check
-                    opposing_trades += 1
-                    
-        return opposing_trades >= 2
+        if agent_id not in self.agent_index:
+            return False
+        return bool(self._wash_flags(self.agent_index[agent_id]))
 
     def audit_agent(self, agent_id: str) -> Dict[str, Any]:
         """Runs all detectors for a specific agent."""
         is_spoofing = self.detect_spoofing(agent_id)
         is_wash = self.detect_wash_trading(agent_id)
-        
+
         return {
             "agent_id": agent_id,
             "suspicious": is_spoofing or is_wash,
@@ -74,3 +187,74 @@ class MarketMonitor:
                 "wash_trading": is_wash
             }
         }
+
+    def audit_all_agents(self, only_suspicious: bool = False) -> List[Dict[str, Any]]:
+        """
+        Runs all detectors for every agent at once, in first-seen order.
+        Returns audit_agent()-style reports.
+        """
+        self._sync_threshold()
+        everyone = slice(0, len(self.agent_ids))
+        spoofing = self._spoofing_flags(everyone)
+        wash = self._wash_flags(everyone)
+        suspicious = spoofing | wash
+        indices = np.flatnonzero(suspicious) if only_suspicious else range(len(self.agent_ids))
+        return [
+            {
+                "agent_id": self.agent_ids[i],
+                "suspicious": bool(suspicious[i]),
+                "flags": {
+                    "spoofing": bool(spoofing[i]),
+                    "wash_trading": bool(wash[i])
+                }
+            } for i in indices
+        ]
+
+    def _spoofing_flags(self, agents):
+        # If cancellation rate of large orders is > 80%
+        placements = self._large_placements[agents]
+        rate = self._large_cancellations[agents] / np.maximum(placements, 1)
+        return (self._n_orders[agents] >= 5) & (placements > 0) & (rate > 0.8)
+
+    def _wash_flags(self, agents):
+        return (self._n_orders[agents] >= 4) & (self._opposing_trades[agents] >= 2)
+
+    def _agent(self, agent_id: str) -> int:
+        index = self.agent_index.get(agent_id)
+        if index is None:
+            index = self.agent_index[agent_id] = len(self.agent_ids)
+            self.agent_ids.append(agent_id)
+            if index >= len(self._n_orders):
+                self._grow_agents(max(2 * len(self._n_orders), 64))
+        return index
+
+    def _grow_agents(self, capacity: int):
+        for name in ("_n_orders", "_large_placements", "_large_cancellations", "_opposing_trades",
+                     "_last_price", "_last_action", "_last_timestamp"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def _action_code(self, action: str) -> int:
+        code = self.action_codes.get(action)
+        if code is None:
+            code = self.action_codes[action] = len(self.action_codes)
+        return code
+
+    def _count_large(self, agents, codes, large, action: str, n_agents: int) -> np.ndarray:
+        if action not in self.action_codes:
+            return np.zeros(n_agents, dtype=np.int64)
+        hit = large & (codes == self.action_codes[action])
+        return np.bincount(agents[hit], minlength=n_agents)
+
+    def _sync_threshold(self):
+        """Recounts large orders from the log if volume_threshold was changed since logging."""
+        if self.volume_threshold == self._counted_threshold:
+            return
+        n_agents = len(self._n_orders)
+        agents, codes = self.orders["agent"], self.orders["action"]
+        large = self.orders["volume"] > self.volume_threshold
+        self._large_placements = self._count_large(agents, codes, large, "PLACE", n_agents)
+        self._large_cancellations = self._count_large(agents, codes, large, "CANCEL", n_agents)
+        self._counted_threshold = self.volume_threshold
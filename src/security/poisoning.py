@@ -1,6 +1,81 @@
-
-from typing import List, Tuple, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import json
 import math
+import os
+import re
+
+import numpy as np
+
+# Features computed for every sample during ingestion
+FEATURES = ("length", "unique_token_ratio", "trigger_hits")
+
+@lru_cache(maxsize=32)
+def _trigger_pattern(triggers: Tuple[str, ...]) -> Optional["re.Pattern"]:
+    if not triggers:
+        return None
+    # Longest first, so overlapping triggers count the longer one
+    return re.compile("|".join(re.escape(t) for t in sorted(triggers, key=len, reverse=True)))
+
+def compute_features(texts: Sequence[str], triggers: Sequence[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    Per-sample features for a batch of texts, one array per name in FEATURES.
+    Module-level so ingestion can run it in worker processes.
+    """
+    n = len(texts)
+    pattern = _trigger_pattern(tuple(triggers))
+
+    def unique_ratio(text: str) -> float:
+        tokens = text.split()
+        return len(set(tokens)) / len(tokens) if tokens else 0.0
+
+    return {
+        "length": np.fromiter(map(len, texts), dtype=np.float64, count=n),
+        "unique_token_ratio": np.fromiter(map(unique_ratio, texts), dtype=np.float64, count=n),
+        "trigger_hits": (np.fromiter((len(pattern.findall(t)) for t in texts), dtype=np.int64, count=n)
+                         if pattern is not None else np.zeros(n, dtype=np.int64)),
+    }
+
+class RunningStats:
+    """
+    Online mean / variance (Welford), updated a batch at a time and mergeable
+    across workers (Chan et al. pairwise combination).
+    """
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values) -> "RunningStats":
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            batch = RunningStats()
+            batch.n = len(values)
+            batch.mean = float(values.mean())
+            batch.m2 = float(((values - batch.mean) ** 2).sum())
+            self.merge(batch)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Population variance."""
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
 
 class DataSanitizer:
     """
@@ -8,58 +83,190 @@ class DataSanitizer:
     Strategies:
     1. Label Flip Detection (Mock influence check)
     2. Outlier Detection (Feature statistics)
+
+    Statistics are kept as RunningStats, so the reference corpus can be streamed
+    through partial_fit() in batches of any size. `outlier_features` selects which
+    features are checked against the 3-sigma bound.
     """
-    
-    def __init__(self):
+
+    def __init__(self, outlier_features: Sequence[str] = ("length",)):
         self.feature_stats: Dict[str, Tuple[float, float]] = {} # mean, std dev
+        self.running_stats: Dict[str, RunningStats] = {}
+        self.outlier_features = tuple(outlier_features)
+        # Often poisoning inserts rare tokens.
+        self.rare_triggers = ["nonsensestring", "triggerword123", "sudo_mode"]
 
-    def fit_stats(self, legitimate_data: List[str]):
+    def fit_stats(self, legitimate_data: Iterable[str], batch_size: int = 100_000):
         """
         Learns the 'normal' distribution of data characteristics (e.g. length, unique words).
         """
-        lengths = [len(x) for x in legitimate_data]
-        if not lengths:
-            return
-            
-        mean_l = sum(lengths) / len(lengths)
-        variance = sum((l - mean_l) ** 2 for l in lengths) / len(lengths)
-        std_l = math.sqrt(variance)
-        
-        self.feature_stats['length'] = (mean_l, std_l)
+        previous = self.feature_stats, self.running_stats
+        self.feature_stats, self.running_stats = {}, {}
+        batch = []
+        for text in legitimate_data:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                self.partial_fit(batch)
+                batch = []
+        if batch:
+            self.partial_fit(batch)
+        if not self.running_stats:
+            # No data: keep the previous statistics
+            self.feature_stats, self.running_stats = previous
+
+    def partial_fit(self, texts: Sequence[str]):
+        """Folds one more batch of legitimate data into the statistics."""
+        features = compute_features(texts)
+        for name in ("length", "unique_token_ratio"):
+            stats = self.running_stats.setdefault(name, RunningStats()).update(features[name])
+            self.feature_stats[name] = (stats.mean, stats.std)
 
     def is_poison(self, text: str, label: str) -> bool:
         """
         Checks if a data point looks malicious.
         """
-        # 1. Outlier Check
-        if 'length' in self.feature_stats:
-            mean, std = self.feature_stats['length']
-            # If text is absurdly long or short (> 3 sigma)
-            if abs(len(text) - mean) > 3 * std:
-                return True
-        
+        return bool(self.poison_mask([text])[0])
+
+    def poison_mask(self, texts: Sequence[str], features: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+        """
+        Boolean mask of suspicious samples for a batch (features are computed if not given).
+        """
+        if features is None:
+            features = compute_features(texts, self.rare_triggers)
+        # 1. Outlier Check: absurdly long or short (> 3 sigma)
+        mask = np.zeros(len(texts), dtype=bool)
+        for name in self.outlier_features:
+            if name in self.feature_stats:
+                mean, std = self.feature_stats[name]
+                mask |= np.abs(features[name] - mean) > 3 * std
+
         # 2. Keyword Poisoning (Backdoor trigger components)
-        # Often poisoning inserts rare tokens.
-        rare_triggers = ["nonsensestring", "triggerword123", "sudo_mode"]
-        for trigger in rare_triggers:
-            if trigger in text:
-                return True
-                
-        return False
+        mask |= features["trigger_hits"] > 0
+        return mask
+
+class ShardWriter:
+    """
+    Appends (text, label) rows as JSON lines to `<directory>/<prefix>-00000.jsonl`,
+    starting a new shard every `shard_size` rows, so ingested data stays on disk.
+    Numbering continues after shards already in the directory (e.g. from an earlier
+    run), and shards are created exclusively, so existing data is never overwritten.
+    """
+    def __init__(self, directory: str, prefix: str, shard_size: int = 1_000_000):
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.rows = 0
+        self.paths: List[str] = []
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        existing = re.compile(rf"{re.escape(prefix)}-(\d+)\.jsonl$")
+        numbers = [int(m.group(1)) for m in map(existing.match, os.listdir(directory)) if m]
+        self._next_shard = max(numbers) + 1 if numbers else 0
+
+    def write(self, rows: Iterable[Tuple[str, str]]):
+        for text, label in rows:
+            if self._file is None or self.rows % self.shard_size == 0:
+                self._roll()
+            self._file.write(json.dumps({"text": text, "label": label}) + "\n")
+            self.rows += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _roll(self):
+        self.close()
+        path = os.path.join(self.directory, f"{self.prefix}-{self._next_shard:05d}.jsonl")
+        self._next_shard += 1
+        self._file = open(path, "x", encoding="utf-8")
+        self.paths.append(path)
 
 class TrainingGuard:
     """
     Simulates a secure training loop that filters data.
+
+    Without `output_dir`, accepted and quarantined samples are kept in the
+    `clean_data` / `quarantine` lists. With it, they are written to JSONL shards under
+    `output_dir/clean` and `output_dir/quarantine` and only counted in memory.
+    Running statistics of every feature over the accepted data are kept in `clean_stats`.
     """
-    def __init__(self, sanitizer: DataSanitizer):
+    def __init__(self, sanitizer: DataSanitizer, output_dir: Optional[str] = None,
+                 shard_size: int = 1_000_000, verbose: bool = True):
         self.sanitizer = sanitizer
         self.clean_data = []
         self.quarantine = []
+        self.n_clean = 0
+        self.n_quarantined = 0
+        self.verbose = verbose
+        self.clean_stats = {name: RunningStats() for name in FEATURES}
+        self._writers = None
+        if output_dir is not None:
+            self._writers = (ShardWriter(os.path.join(output_dir, "clean"), "clean", shard_size),
+                             ShardWriter(os.path.join(output_dir, "quarantine"), "quarantine", shard_size))
+
+    def ingest_batch(self, batch: List[Tuple[str, str]], features: Optional[Dict[str, np.ndarray]] = None):
+        texts = [text for text, _ in batch]
+        if features is None:
+            features = compute_features(texts, self.sanitizer.rare_triggers)
+        mask = self.sanitizer.poison_mask(texts, features)
 
-    def ingest_batch(self, batch: List[Tuple[str, str]]):
-        for text, label in batch:
-            if self.sanitizer.is_poison(text, label):
-                print(f"POISON DETECTED: Discarding '{text[:20]}...'")
-                self.quarantine.append((text, label))
+        clean = [row for row, poison in zip(batch, mask) if not poison]
+        poisoned = [row for row, poison in zip(batch, mask) if poison]
+        for name, values in features.items():
+            self.clean_stats[name].update(values[~mask])
+        self.n_clean += len(clean)
+        self.n_quarantined += len(poisoned)
+        if self._writers is not None:
+            self._writers[0].write(clean)
+            self._writers[1].write(poisoned)
+        else:
+            self.clean_data.extend(clean)
+            self.quarantine.extend(poisoned)
+        if self.verbose and poisoned:
+            print(f"POISON DETECTED: Discarding {len(poisoned)} of {len(batch)} samples "
+                  f"(first: '{poisoned[0][0][:20]}...')")
+
+    def ingest_stream(self, batches: Iterable[List[Tuple[str, str]]], max_workers: int = 1) -> Dict[str, Any]:
+        """
+        Ingests an iterable of batches. With max_workers > 1, per-sample features are
+        computed in worker processes while earlier batches are filtered and written;
+        at most 2 * max_workers batches are in flight, so memory stays bounded.
+        """
+        try:
+            if max_workers <= 1:
+                for batch in batches:
+                    self.ingest_batch(batch)
             else:
-                self.clean_data.append((text, label))
+                triggers = tuple(self.sanitizer.rare_triggers)
+                with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                    pending = deque()
+                    for batch in batches:
+                        pending.append((batch, pool.submit(compute_features, [t for t, _ in batch], triggers)))
+                        if len(pending) >= 2 * max_workers:
+                            done, future = pending.popleft()
+                            self.ingest_batch(done, future.result())
+                    while pending:
+                        done, future = pending.popleft()
+                        self.ingest_batch(done, future.result())
+        finally:
+            # Shards are closed even when a batch or a worker fails
+            self.close()
+        return {"clean": self.n_clean, "quarantined": self.n_quarantined}
+
+    def close(self):
+        """Flushes and closes the on-disk shards (if any)."""
+        if self._writers is not None:
+            for writer in self._writers:
+                writer.close()
+
+def iter_batches(rows: Iterable[Tuple[str, str]], batch_size: int = 10_000) -> Iterator[List[Tuple[str, str]]]:
+    """Groups a row iterator into lists of `batch_size` rows for ingest_stream()."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,224 @@
+import json
+import math
+import time
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Optional
+
+
+class MemoryBackend:
+    """
+    Thread-safe in-process limiter state. Keys idle for longer than the limiter's
+    idle timeout are evicted (oldest first, amortized O(1)); `max_keys` also caps
+    the number of tracked keys, dropping the least recently seen.
+    """
+    def __init__(self, max_keys: Optional[int] = None):
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (last_seen, state)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, key: str, now: float, step: Callable, idle_seconds: float) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            allowed, state = step(entry[1] if entry is not None else None)
+            self._entries[key] = (now, state)
+            self._entries.move_to_end(key)
+
+            entries = self._entries
+            while entries:
+                oldest_key, (last_seen, _) = next(iter(entries.items()))
+                if now - last_seen <= idle_seconds and (self.max_keys is None or len(entries) <= self.max_keys):
+                    break
+                del entries[oldest_key]
+                self.evictions += 1
+            return allowed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """
+    Limiter state in a SQLite file, so several worker processes enforce one quota.
+    Each check is one short IMMEDIATE transaction; idle keys are purged every
+    `purge_every` checks.
+    """
+    def __init__(self, path: str = ".rate_limit.sqlite", timeout: float = 5.0, purge_every: int = 1000):
+        self.path = path
+        self.purge_every = purge_every
+        self.evictions = 0
+        self._checks = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS limiter_state ("
+            "key TEXT PRIMARY KEY, state TEXT NOT NULL, last_seen REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_seen ON limiter_state (last_seen)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM limiter_state").fetchone()[0]
+
+    def update(self, key: str, now: float, step: Callable, idle_seconds: float) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT state FROM limiter_state WHERE key = ?", (key,)).fetchone()
+                allowed, state = step(json.loads(row[0]) if row is not None else None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO limiter_state (key, state, last_seen) VALUES (?, ?, ?)",
+                    (key, json.dumps(list(state)), now),
+                )
+                self._checks += 1
+                if self._checks % self.purge_every == 0:
+                    cur = self._conn.execute("DELETE FROM limiter_state WHERE last_seen < ?", (now - idle_seconds,))
+                    self.evictions += cur.rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return allowed
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM limiter_state")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """
+    Base class for per-key rate limiters allowing `limit` units per `window_seconds`.
+
+    Subclasses implement `_step(state, now, cost) -> (allowed, state)` over a small
+    per-key state (a sequence of numbers), so the same algorithm runs on any backend.
+    Keys idle for `idle_seconds` are evicted. Evicting a key resets it to a fresh
+    state, so `idle_seconds` is never shorter than min_idle_seconds(): the idle time
+    after which the algorithm's state is back to its initial value anyway.
+    """
+    def __init__(self, limit: int, window_seconds: float, backend=None,
+                 idle_seconds: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.backend = backend if backend is not None else MemoryBackend()
+        self._idle_seconds = idle_seconds
+        self.clock = clock
+        self.allowed = 0
+        self.denied = 0
+
+    @property
+    def idle_seconds(self) -> float:
+        minimum = self.min_idle_seconds()
+        return minimum if self._idle_seconds is None else max(self._idle_seconds, minimum)
+
+    @idle_seconds.setter
+    def idle_seconds(self, idle_seconds: Optional[float]):
+        self._idle_seconds = idle_seconds
+
+    def min_idle_seconds(self) -> float:
+        """Idle time after which a key's state is back to its initial value (two windows by default)."""
+        return 2 * self.window_seconds
+
+    def allow(self, key: str, cost: int = 1) -> bool:
+        """Consumes `cost` units for `key` if the quota allows it."""
+        now = self.clock()
+        allowed = self.backend.update(key, now, lambda state: self._step(state, now, cost), self.idle_seconds)
+        if allowed:
+            self.allowed += 1
+        else:
+            self.denied += 1
+        return allowed
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "tracked_keys": len(self.backend),
+            "evictions": self.backend.evictions,
+        }
+
+    def _step(self, state, now: float, cost: int):
+        raise NotImplementedError("Rate limiters must implement _step()")
+
+
+class SlidingLogLimiter(RateLimiter):
+    """
+    Exact sliding window: at most `limit` requests in any `window_seconds`.
+    Keeps up to `limit` timestamps per key, so memory is O(limit) per active key.
+    """
+    def _step(self, state, now: float, cost: int):
+        log = state if isinstance(state, deque) else deque(state or ())
+        while log and now - log[0] >= self.window_seconds:
+            log.popleft()
+        if len(log) + cost > self.limit:
+            return False, log
+        log.extend([now] * cost)
+        return True, log
+
+
+class TokenBucketLimiter(RateLimiter):
+    """
+    Token bucket holding up to `burst` tokens (default `limit`), refilled continuously
+    at limit / window_seconds tokens per second. State: [tokens, last_refill].
+    """
+    def __init__(self, limit: int, window_seconds: float, burst: Optional[int] = None, **kwargs):
+        super().__init__(limit, window_seconds, **kwargs)
+        self.burst = burst if burst is not None else limit
+        self.rate = limit / window_seconds
+
+    def min_idle_seconds(self) -> float:
+        # An empty bucket needs burst / rate seconds to refill, longer than two windows when burst > 2 * limit
+        return max(2 * self.window_seconds, self.burst / self.rate)
+
+    def _step(self, state, now: float, cost: int):
+        tokens, last = state if state is not None else (self.burst, now)
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens < cost:
+            return False, [tokens, now]
+        return True, [tokens - cost, now]
+
+
+class GCRALimiter(RateLimiter):
+    """
+    Generic Cell Rate Algorithm: a token bucket expressed as one "theoretical arrival
+    time" per key. Allows bursts of `limit` and a sustained limit / window_seconds rate.
+    State: [tat].
+    """
+    def _step(self, state, now: float, cost: int):
+        interval = self.window_seconds / self.limit
+        tat = max(state[0], now) if state is not None else now
+        new_tat = tat + interval * cost
+        if new_tat - now > self.window_seconds:
+            return False, [tat]
+        return True, [new_tat]
+
+
+class SlidingWindowCounterLimiter(RateLimiter):
+    """
+    Approximate sliding window from two fixed-window counters: the previous window's
+    count is weighted by how much of it still overlaps the sliding window.
+    State: [window_index, current_count, previous_count].
+    """
+    def _step(self, state, now: float, cost: int):
+        position = now / self.window_seconds
+        index = math.floor(position)
+        if state is None or index > state[0] + 1:
+            current, previous = 0, 0
+        elif index == state[0] + 1:
+            current, previous = 0, state[1]
+        else:
+            current, previous = state[1], state[2]
+        estimate = previous * (1 - (position - index)) + current
+        if estimate + cost > self.limit:
+            return False, [index, current, previous]
+        return True, [index, current + cost, previous]
@@ -1,8 +1,36 @@
 
+import os
+import io
+import mmap
 import pickle
+import zipfile
 import pickletools
-import io
-from typing import Set, Tuple, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple, List, Any
+
+# File extensions scanned by PickleScanner.scan_directory by default
+MODEL_FILE_EXTENSIONS = (".pkl", ".pickle", ".pt", ".pth", ".bin", ".ckpt", ".joblib")
+
+STRING_OPCODES = {'SHORT_BINUNICODE', 'BINUNICODE', 'BINUNICODE8', 'UNICODE', 'STRING', 'SHORT_BINSTRING', 'BINSTRING'}
+INT_OPCODES = {'INT', 'BININT', 'BININT1', 'BININT2', 'LONG', 'LONG1', 'LONG4'}
+PUT_OPCODES = {'PUT', 'BINPUT', 'LONG_BINPUT'}
+GET_OPCODES = {'GET', 'BINGET', 'LONG_BINGET'}
+
+@dataclass
+class ScanResult:
+    """
+    Outcome of scanning one pickle stream, file or archive.
+    """
+    source: str
+    globals: Set[Tuple[str, str]] = field(default_factory=set)
+    blocked: List[Tuple[str, str]] = field(default_factory=list)
+    pickles_scanned: int = 0
+    error: Optional[str] = None
+
+    @property
+    def is_safe(self) -> bool:
+        return not self.blocked and self.error is None
 
 class PickleScanner:
     """
@@ -35,61 +63,146 @@ class PickleScanner:
         Scans the pickled data and returns a list of detected dangerous globals.
         Returns: List of (module, name) tuples that are blocked.
         """
-        detected = []
-        stack = [] # Simple simulation stack to track strings
-        
+        result = self.scan_stream(data)
+        if result.error:
+            # Malformed pickle
+            print(f"Scan error: {result.error}")
+            return [("Error", result.error)]
+        return result.blocked
+
+    def scan_stream(self, data: Any, source: str = "<bytes>") -> ScanResult:
+        """
+        Scans every pickle in a stream, one after another until EOF (legacy `torch.save`
+        files, for instance, are several pickles back to back), collecting every imported
+        global and the blocked ones in a single pass. `data` may be bytes or any binary
+        file-like object with read/readline (open file, mmap, zip member), so large files
+        are never copied.
+
+        A malformed first pickle is an error. Data after at least one complete pickle that
+        does not parse as another pickle (e.g. raw tensor storage) ends the scan; globals
+        seen in it before the parse failed are still recorded, since an unpickler would
+        have executed them.
+        """
+        result = ScanResult(source=source)
+        stream = io.BytesIO(data) if isinstance(data, (bytes, bytearray, memoryview)) else data
         try:
-            # We iterate over the opcodes in the pickle stream
-            for opcode, arg, pos in pickletools.genops(data):
-                if opcode.name == 'GLOBAL':
-                    if isinstance(arg, str) and ' ' in arg:
-                        module, name = arg.split(' ', 1) 
-                        if (module, name) in self.BLOCKED_GLOBALS:
-                            detected.append((module, name))
-                            
-                elif opcode.name == 'STACK_GLOBAL':
-                    # STACK_GLOBAL takes top 2 items: module_name, attr_name
-                    if len(stack) >= 2:
-                        name = stack.pop()
-                        module = stack.pop()
-                        if isinstance(module, str) and isinstance(name, str):
-                            if (module, name) in self.BLOCKED_GLOBALS:
-                                detected.append((module, name))
-                        # Result of GLOBAL is pushed back, but we don't know what it is logically
-                        # just push a placeholder
-                        stack.append("UNKNOWN_GLOBAL")
-                    else:
-                        stack.append("UNKNOWN_GLOBAL")
-
-                # Track strings for stack
-                elif opcode.name in ('SHORT_BINUNICODE', 'BINUNICODE', 'UNICODE', 'STRING', 'SHORT_BINSTRING', 'BINSTRING'):
-                    stack.append(arg)
-                elif opcode.name in ('INT', 'BININT', 'BININT1', 'BININT2', 'LONG', 'LONG1', 'LONG4'):
-                    stack.append(arg) # Sometimes ints matter, mostly not for imports
-                elif opcode.name == 'MARK':
-                    stack.append('MARK')
-                elif opcode.name == 'POP':
-                    if stack: stack.pop()
-                elif opcode.name == 'POP_MARK':
-                     # Pop until MARK
-                     while stack and stack[-1] != 'MARK':
-                         stack.pop()
-                     if stack and stack[-1] == 'MARK':
-                         stack.pop()
-                # For other opcodes that consume stack items (like TUPLE, LIST, DICT), 
-                # a full simulation is complex. 
-                # However, usually the strings for STACK_GLOBAL are pushed immediately before.
-                # So even if we don't pop correctly for TUPLE/LIST, the strings *should* be at the top 
-                # if they were just pushed.
-                # To be safer, we can just *peek* if we see STACK_GLOBAL, or try to respect basic consumption.
-                # Given strict timeline, we'll rely on the fact that strings are usually top of stack for STACK_GLOBAL.
-                
+            while True:
+                self._scan_pickle(stream, result)
+                result.pickles_scanned += 1
+                if _at_eof(stream):
+                    break
         except Exception as e:
-            # Malformed pickle
-            print(f"Scan error: {e}")
-            return [("Error", str(e))]
+            if not result.pickles_scanned:
+                result.error = str(e)
+        return result
+
+    def _scan_pickle(self, stream: Any, result: ScanResult):
+        """Walks the opcodes of one pickle (up to its STOP), recording the globals it imports."""
+        stack = [] # Simple simulation stack to track strings
+        memo = {}
+
+        # We iterate over the opcodes in the pickle stream
+        for opcode, arg, pos in pickletools.genops(stream):
+            name = opcode.name
+            if name == 'GLOBAL':
+                if isinstance(arg, str) and ' ' in arg:
+                    self._record(result, *arg.split(' ', 1))
+                stack.append("UNKNOWN_GLOBAL")
 
-        return detected
+            elif name == 'STACK_GLOBAL':
+                # STACK_GLOBAL takes top 2 items: module_name, attr_name
+                if len(stack) >= 2:
+                    attr = stack.pop()
+                    module = stack.pop()
+                    if isinstance(module, str) and isinstance(attr, str):
+                        self._record(result, module, attr)
+                # Result of GLOBAL is pushed back, but we don't know what it is logically
+                # just push a placeholder
+                stack.append("UNKNOWN_GLOBAL")
+
+            # Track strings for stack
+            elif name in STRING_OPCODES or name in INT_OPCODES:
+                stack.append(arg) # Sometimes ints matter, mostly not for imports
+            elif name == 'MARK':
+                stack.append('MARK')
+            elif name == 'POP':
+                if stack: stack.pop()
+            elif name == 'POP_MARK':
+                # Pop until MARK
+                while stack and stack[-1] != 'MARK':
+                    stack.pop()
+                if stack and stack[-1] == 'MARK':
+                    stack.pop()
+
+            # Follow the memo so module/attribute strings fetched with GET still count
+            elif name == 'MEMOIZE':
+                if stack: memo[len(memo)] = stack[-1]
+            elif name in PUT_OPCODES:
+                if stack: memo[arg] = stack[-1]
+            elif name in GET_OPCODES:
+                stack.append(memo.get(arg))
+            # For other opcodes that consume stack items (like TUPLE, LIST, DICT), 
+            # a full simulation is complex. 
+            # However, usually the strings for STACK_GLOBAL are pushed immediately before.
+            # So even if we don't pop correctly for TUPLE/LIST, the strings *should* be at the top 
+            # if they were just pushed.
+
+    def scan_file(self, path: str) -> ScanResult:
+        """
+        Scans a pickle file through a memory map, or every embedded pickle of a
+        zip-based archive such as a `torch.save` checkpoint.
+
+        Archive members are recognized as pickles by their content (a PROTO opcode) or a
+        .pkl/.pickle name; every other member is still scanned, and counts as a pickle if
+        it parses as one. A file or archive without any pickle is reported as an error,
+        so it is never considered safe.
+        """
+        result = ScanResult(source=path)
+        try:
+            if zipfile.is_zipfile(path):
+                with zipfile.ZipFile(path) as archive:
+                    for member in archive.namelist():
+                        if member.endswith("/"):
+                            continue
+                        with archive.open(member) as stream:
+                            sniffed = member.endswith(('.pkl', '.pickle')) or _starts_with_proto(stream)
+                            part = self.scan_stream(stream, source=f"{path}:{member}")
+                        if not sniffed:
+                            # Unrecognized member: a parse failure just means it is not a pickle
+                            part.error = None
+                        self._merge(result, part)
+            elif os.path.getsize(path) == 0:
+                result.error = "empty file"
+            else:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    self._merge(result, self.scan_stream(mapped, source=path))
+        except (OSError, zipfile.BadZipFile) as e:
+            result.error = str(e)
+        if not result.pickles_scanned and not result.error:
+            result.error = "no pickle found"
+        return result
+
+    def scan_directory(self,
+                       root: str,
+                       extensions: Iterable[str] = MODEL_FILE_EXTENSIONS,
+                       max_workers: int = 1) -> Dict[str, ScanResult]:
+        """
+        Scans every matching file under `root`, in parallel processes when max_workers > 1.
+        Returns {path: ScanResult} in sorted path order.
+        """
+        extensions = tuple(extensions)
+        paths = sorted(
+            os.path.join(dirpath, filename)
+            for dirpath, _, filenames in os.walk(root)
+            for filename in filenames
+            if filename.endswith(extensions)
+        )
+        if max_workers > 1 and len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_scan_path, paths, [type(self)] * len(paths)))
+        else:
+            results = [self.scan_file(path) for path in paths]
+        return dict(zip(paths, results))
 
     def is_safe(self, data: bytes) -> bool:
         """
@@ -101,16 +214,37 @@ class PickleScanner:
     @staticmethod
     def get_globals(data: bytes) -> Set[Tuple[str, str]]:
         """
-        Helper to list all globals used in the pickle.
+        Helper to list all globals used in the pickle (GLOBAL and STACK_GLOBAL).
         """
-        found = set()
-        try:
-            for opcode, arg, pos in pickletools.genops(data):
-                if opcode.name == 'GLOBAL':
-                    # arg is 'module name' string
-                    parts = arg.split()
-                    if len(parts) == 2:
-                        found.add((parts[0], parts[1]))
-        except Exception:
-            pass
-        return found
+        return PickleScanner().scan_stream(data).globals
+
+    def _record(self, result: ScanResult, module: str, name: str):
+        result.globals.add((module, name))
+        if (module, name) in self.BLOCKED_GLOBALS:
+            result.blocked.append((module, name))
+
+    @staticmethod
+    def _merge(total: ScanResult, part: ScanResult):
+        total.globals |= part.globals
+        total.blocked.extend(part.blocked)
+        total.pickles_scanned += part.pickles_scanned
+        if part.error and not total.error:
+            total.error = f"{part.source}: {part.error}"
+
+
+def _at_eof(stream: Any) -> bool:
+    if hasattr(stream, "peek"):
+        return not stream.peek(1)
+    pos = stream.tell()
+    at_end = not stream.read(1)
+    stream.seek(pos)
+    return at_end
+
+def _starts_with_proto(stream: Any) -> bool:
+    # Protocol 2+ pickles open with PROTO (0x80) followed by the protocol number
+    head = stream.peek(2)[:2]
+    return len(head) == 2 and head[0] == 0x80 and head[1] <= pickle.HIGHEST_PROTOCOL
+
+def _scan_path(path: str, scanner_cls: type = PickleScanner) -> ScanResult:
+    # Module-level so scan_directory can run it in worker processes
+    return scanner_cls().scan_file(path)
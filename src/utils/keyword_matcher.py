@@ -0,0 +1,139 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    keyword: str
+    start: int
+    end: int
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Builds one regex from a prefix trie of the keywords, e.g. ["hate", "hat", "hex"]
+    -> "h(?:at(?:e)?|ex)". Shared prefixes are matched once, branches at a node start with
+    different characters, and optional suffixes are greedy, so the regex always takes
+    the longest keyword that starts at a position.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True  # end-of-keyword marker
+
+    def build(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+# Below this many keywords, one C-level `in` search per keyword beats a regex scan
+REGEX_SCAN_MIN_KEYWORDS = 64
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword substring matcher over lower-cased text. Build it once per keyword
+    set (e.g. in a guard's __init__) and reuse it.
+
+    Keeps the semantics of `keyword in text.lower()` for every keyword, including
+    that a keyword with upper-case letters never matches. The text is lower-cased
+    once and all keywords are found in a single scan of a prefix-trie regex.
+    Small keyword sets, where per-keyword `str` searches are faster, skip the regex for
+    contains_any() / matched().
+    """
+    def __init__(self, keywords: Iterable[str]):
+        # dict.fromkeys keeps the first occurrence order and drops duplicates
+        self.keywords: List[str] = list(dict.fromkeys(k for k in keywords if k))
+        # Lower-cased text cannot contain a keyword that has upper-case letters
+        self._searchable = [k for k in self.keywords if k == k.lower()]
+        self._order = {keyword: i for i, keyword in enumerate(self.keywords)}
+
+        searchable = self._searchable
+        self._use_regex = len(searchable) >= REGEX_SCAN_MIN_KEYWORDS
+        # Every keyword that is a prefix of the longest match also occurs at that position
+        self._prefixes = {
+            k: sorted((p for p in searchable if k.startswith(p)), key=len, reverse=True) for k in searchable
+        }
+        self._pattern = _trie_pattern(searchable) if searchable else None
+        if self._pattern is not None:
+            self._search = re.compile(self._pattern)
+            # A lookahead consumes nothing, so overlapping keywords are all reported
+            self._scan = re.compile("(?=(" + self._pattern + "))")
+
+    def contains_any(self, text: str) -> bool:
+        if self._pattern is None:
+            return False
+        lowered = text.lower()
+        if not self._use_regex:
+            return any(k in lowered for k in self._searchable)
+        return self._search.search(lowered) is not None
+
+    def find_all(self, text: str) -> List[KeywordHit]:
+        """
+        Every keyword occurrence with its offsets, including overlapping ones,
+        ordered by start offset (longer keywords first at the same offset).
+        """
+        if self._pattern is None:
+            return []
+        lowered = text.lower()
+        origin = None
+        if len(lowered) != len(text):
+            # A few characters change length when lower-cased; map offsets back to the original text
+            origin = [i for i, char in enumerate(text) for _ in char.lower()]
+            origin.append(len(text))
+
+        hits = []
+        for match in self._scan.finditer(lowered):
+            start = match.start()
+            for prefix in self._prefixes[match.group(1)]:
+                end = start + len(prefix)
+                if origin is None:
+                    hits.append(KeywordHit(prefix, start, end))
+                else:
+                    hits.append(KeywordHit(prefix, origin[start], origin[end - 1] + 1))
+        return hits
+
+    def matched(self, text: str) -> List[str]:
+        """
+        Distinct keywords found in the text, in the order they were given.
+        """
+        if self._pattern is None:
+            return []
+        if not self._use_regex:
+            lowered = text.lower()
+            return [k for k in self._searchable if k in lowered]
+        found = {hit.keyword for hit in self.find_all(text)}
+        return sorted(found, key=self._order.__getitem__)
+
+
+class KeywordGroupMatcher:
+    """
+    Matches the keywords of several labelled groups with one KeywordMatcher,
+    e.g. {category: keywords}. Build it once and reuse it.
+    """
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups: Dict[str, List[str]] = {label: list(keywords) for label, keywords in groups.items()}
+        self.matcher = KeywordMatcher(k for keywords in self.groups.values() for k in keywords)
+
+    def match(self, text: str) -> Dict[str, List[str]]:
+        """
+        Returns {group: matched keywords} for groups with at least one hit, in group order.
+        """
+        found = set(self.matcher.matched(text))
+        hits = {}
+        for label, keywords in self.groups.items():
+            matched = [k for k in keywords if k in found]
+            if matched:
+                hits[label] = matched
+        return hits
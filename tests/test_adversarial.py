@@ -0,0 +1,57 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.adversarial import AdversarialAttacker
+
+rng = np.random.default_rng(0)
+W = rng.normal(size=(8, 3))
+IMAGES = rng.uniform(0, 1, size=(50, 8))
+LABELS = (IMAGES @ W).argmax(axis=1)
+EPSILONS = [0.0, 0.05, 0.2, 0.5]
+
+def predict(x):
+    return x @ W
+
+def loss_gradient(x, y):
+    # Gradient of the cross-entropy loss of a linear softmax model w.r.t. its input
+    logits = x @ W
+    probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+    probs /= probs.sum(axis=1, keepdims=True)
+    probs[np.arange(len(y)), y] -= 1
+    return probs @ W.T
+
+def test_fgsm_batch_matches_single_image_attack():
+    attacker = AdversarialAttacker()
+    grads = loss_gradient(IMAGES, LABELS)
+    batch = attacker.fgsm_batch(IMAGES, grads, EPSILONS)
+    assert batch.shape == (len(EPSILONS),) + IMAGES.shape
+    for e, eps in enumerate(EPSILONS):
+        for i in range(len(IMAGES)):
+            assert np.allclose(batch[e, i], attacker.fgsm_attack(IMAGES[i], eps, grads[i]))
+    clipped = attacker.fgsm_batch(IMAGES, grads, EPSILONS, clip=(0.0, 1.0))
+    assert clipped.min() >= 0.0 and clipped.max() <= 1.0
+
+def test_pgd_stays_in_the_epsilon_ball():
+    attacker = AdversarialAttacker()
+    adv = attacker.pgd_batch(loss_gradient, IMAGES, LABELS, EPSILONS, n_steps=5, clip=(0.0, 1.0),
+                             random_start=True, seed=0)
+    for e, eps in enumerate(EPSILONS):
+        assert np.abs(adv[e] - IMAGES).max() <= eps + 1e-12
+    assert adv.min() >= 0.0 and adv.max() <= 1.0
+
+def test_success_curve_is_independent_of_batch_size():
+    attacker = AdversarialAttacker()
+    reports = [attacker.attack_success_curve(predict, loss_gradient, IMAGES, LABELS, EPSILONS, batch_size=size)
+               for size in (7, 50, 256)]
+    assert reports[0] == reports[1] == reports[2]
+    report = reports[0]
+    assert report["clean_accuracy"] == 1.0
+    assert report["success_rate"][0] == 0.0
+    assert report["success_rate"] == sorted(report["success_rate"])
+
+    pgd = attacker.attack_success_curve(predict, loss_gradient, IMAGES, LABELS, EPSILONS, method="pgd", n_steps=10)
+    assert all(p >= f for p, f in zip(pgd["success_rate"], report["success_rate"]))
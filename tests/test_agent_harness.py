@@ -0,0 +1,35 @@
+import sys
+import os
+import time
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluators.agent_harness import AgentEvaluationHarness
+from src.evaluators.agent_harness import TestScenario as Scenario
+
+class SleepyAgent:
+    """Sleeps for the number of seconds given as the prompt."""
+    def run(self, prompt: str) -> str:
+        time.sleep(float(prompt))
+        return "done"
+
+def _scenarios(delays):
+    return [Scenario(f"s{i}", delay, "done", False) for i, delay in enumerate(delays)]
+
+def test_timeout_does_not_charge_queued_scenarios():
+    harness = AgentEvaluationHarness(max_workers=1, timeout=0.3)
+    report = harness.run_suite(SleepyAgent(), _scenarios(["1", "0", "0"]))
+    assert [r.passed for r in report.results] == [False, True, True]
+    assert report.results[0].error == "Timed out after 0.3s"
+
+def test_executors_agree():
+    scenarios = _scenarios(["0", "0.01", "0"])
+    reports = [
+        AgentEvaluationHarness().run_suite(SleepyAgent(), scenarios),
+        AgentEvaluationHarness(max_workers=3).run_suite(SleepyAgent(), scenarios),
+        AgentEvaluationHarness(max_workers=3, executor="async").run_suite(SleepyAgent(), scenarios),
+    ]
+    for report in reports:
+        assert [r.scenario_name for r in report.results] == ["s0", "s1", "s2"]
+        assert report.passed_tests == 3
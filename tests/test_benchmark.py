@@ -0,0 +1,39 @@
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluators.benchmark import (BenchmarkResult, BenchmarkSuite, BenchmarkTest, append_history,
+                                      find_regressions, load_history)
+
+class AllocatingTest(BenchmarkTest):
+    def __init__(self, name: str, n_bytes: int):
+        super().__init__(name)
+        self.n_bytes = n_bytes
+
+    def run(self, model_input) -> BenchmarkResult:
+        blob = bytearray(self.n_bytes)
+        return BenchmarkResult(self.name, True, float(len(blob)))
+
+def test_suite_peak_memory_covers_every_test():
+    suite = BenchmarkSuite("mem", track_memory=True, verbose=False)
+    suite.add_test(AllocatingTest("big", 8_000_000))
+    suite.add_test(AllocatingTest("small", 1_000))
+    report = suite.run(None)
+    assert report["results"][0]["peak_memory_bytes"] >= 8_000_000
+    assert report["peak_memory_bytes"] >= 8_000_000
+
+def test_history_round_trips_in_both_formats(tmp_path):
+    suite = BenchmarkSuite("hist", repeats=3, verbose=False)
+    suite.add_test(AllocatingTest("t", 10))
+    first, report = suite.run(None), suite.run(None)
+    for name in ("history.jsonl", "history.csv"):
+        path = str(tmp_path / name)
+        append_history(first, path)
+        append_history(report, path)
+        history = load_history(path)
+        assert [h["timestamp"] for h in history] == [first["timestamp"], report["timestamp"]]
+        loaded = history[-1]["results"][0]
+        assert loaded["test"] == "t" and loaded["passed"] is True and loaded["runs"] == 3
+        assert find_regressions(report, history[-1]) == []
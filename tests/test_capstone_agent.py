@@ -0,0 +1,54 @@
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.capstone_agent import SafeResearchAssistant
+from src.agents.plan_verifier import PlanStep
+
+class ScriptedAssistant(SafeResearchAssistant):
+    """Medical persona (so the drift check is active) with scripted tool outputs."""
+    def __init__(self, outputs):
+        super().__init__()
+        self.persona.role = "Medical Assistant"
+        self.outputs = outputs
+
+    def _generate_plan(self, query):
+        return [PlanStep("web_search", {"q": query, "i": i}, i + 1) for i in range(len(self.outputs))]
+
+    def _execute_tool(self, tool_name, args):
+        return self.outputs[args["i"]]
+
+PREFIX = ["Received Query: q", "✅ Input Guard: Passed", "✅ Persona: Prompt wrapped with constraints."]
+
+def test_final_trace_matches_sequential_pipeline():
+    res = ScriptedAssistant(["alpha", "beta"]).run("q")
+    assert res.success and res.content == "Based on my research: alpha\nbeta"
+    assert res.trace[len(PREFIX) + 2:] == ["✅ Execution: Tools ran successfully", "✅ Output Guard: Passed"]
+
+    res = ScriptedAssistant(["the password is x", "fine"]).run("q")
+    assert not res.success
+    assert res.trace[-2:] == ["✅ Execution: Tools ran successfully", "❌ Output Guard: Blocked sensitive content."]
+
+def test_drift_redaction_takes_precedence_over_earlier_guard_violation():
+    agent = ScriptedAssistant(["the password is x", "idk dude"])
+    responses = list(agent.run_stream("q"))
+    assert all("password" not in r.content for r in responses)
+    final = responses[-1]
+    assert final.success and final.content == "[REDACTED due to persona drift]"
+    assert final.trace[-3:] == [
+        "✅ Execution: Tools ran successfully",
+        "❌ Persona Drift: Response violated tone/constraints.",
+        "✅ Output Guard: Passed",
+    ]
+
+def test_agent_reuses_its_executor():
+    with SafeResearchAssistant(max_workers=2) as agent:
+        executor = agent.executor
+        for _ in range(5):
+            assert agent.run("find papers on alignment").success
+        assert agent.executor is executor
+        assert len(executor._threads) <= 2
+    assert executor._shutdown
+    assert not any(thread.is_alive() for thread in executor._threads)
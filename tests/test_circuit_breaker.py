@@ -0,0 +1,49 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.circuit_breaker import TradingCircuitBreaker
+
+def random_ticks(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    assets = rng.choice(["AAA", "BBB", "CCC"], n)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    timestamps = np.cumsum(rng.exponential(1.0, n))
+    return assets, prices, timestamps
+
+def test_tick_by_tick_matches_brute_force():
+    assets, prices, timestamps = random_ticks()
+    breaker = TradingCircuitBreaker(max_drawdown_pct=0.03, window_seconds=30, verbose=False)
+    for i, (asset, price, ts) in enumerate(zip(assets, prices, timestamps)):
+        in_window = (assets[:i + 1] == asset) & (timestamps[:i + 1] >= ts - 30)
+        window = prices[:i + 1][in_window]
+        expected = len(window) > 1 and (window.max() - window.min()) / window.max() >= 0.03
+        assert breaker.update_price(asset, price, ts) == expected
+
+def test_replay_matches_live_updates():
+    assets, prices, timestamps = random_ticks(seed=1)
+    live = TradingCircuitBreaker(max_drawdown_pct=0.03, window_seconds=30, verbose=False)
+    trips = {}
+    for asset, price, ts in zip(assets, prices, timestamps):
+        if live.update_price(asset, price, ts):
+            trips[asset] = trips.get(asset, 0) + 1
+
+    replayed = TradingCircuitBreaker(max_drawdown_pct=0.03, window_seconds=30, verbose=False)
+    # Split the log in two so the second replay starts from a warm window
+    half = len(assets) // 2
+    first = replayed.replay_ticks(assets[:half], prices[:half], timestamps[:half])
+    second = replayed.replay_ticks(assets[half:], prices[half:], timestamps[half:])
+    assert {a: first.get(a, 0) + second.get(a, 0) for a in trips} == trips
+    assert replayed.halts == live.halts
+    assert replayed.price_history == live.price_history
+
+def test_halt_uses_the_clock():
+    now = [1000.0]
+    breaker = TradingCircuitBreaker(max_drawdown_pct=0.05, cooldown_seconds=10, clock=lambda: now[0], verbose=False)
+    assert breaker.update_prices(["X", "X", "Y"], [100.0, 90.0, 50.0]) == ["X"]
+    assert not breaker.can_trade("X") and breaker.can_trade("Y")
+    now[0] = 1010.5
+    assert breaker.can_trade("X")
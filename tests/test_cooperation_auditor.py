@@ -0,0 +1,42 @@
+import sys
+import os
+import pytest
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.cooperation_auditor import CooperationAuditor
+
+def make_shard(actions, **kwargs):
+    shard = CooperationAuditor(**kwargs)
+    for agent, action, ts in actions:
+        shard.log_action(agent, action, timestamp=ts)
+    return shard
+
+def test_from_shards_matches_a_single_auditor():
+    actions = [("a", "DEFECT", 1.0), ("b", "COOPERATE", 2.0), ("a", "DEFECT", 3.0),
+               ("c", "COOPERATE", 4.0), ("b", "COOPERATE", 5.0), ("a", "COOPERATE", 6.0)]
+    single = make_shard(actions)
+    combined = CooperationAuditor.from_shards([make_shard(actions[0::2]), make_shard(actions[1::2])])
+    assert [a.timestamp for a in combined.history] == [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    assert combined.audit_system() == single.audit_system()
+
+    windowed = CooperationAuditor.from_shards([make_shard(actions[0::2]), make_shard(actions[1::2])],
+                                              window_seconds=2.5, clock=lambda: 6.0)
+    assert windowed.total_actions == 3
+    assert windowed.agent_actions == {"c": 1, "b": 1, "a": 1}
+
+def test_merge_rejects_incompatible_settings():
+    counts_only = make_shard([("a", "DEFECT", 1.0)], keep_history=False)
+    with pytest.raises(ValueError):
+        CooperationAuditor(window_seconds=10, clock=lambda: 1.0).merge(counts_only)
+    with pytest.raises(ValueError):
+        CooperationAuditor().merge(counts_only)
+    with pytest.raises(ValueError):
+        CooperationAuditor().merge(make_shard([], window_seconds=10))
+    with pytest.raises(ValueError):
+        CooperationAuditor.from_shards([make_shard([], window_seconds=5)], window_seconds=10)
+
+    target = CooperationAuditor(keep_history=False)
+    target.merge(counts_only)
+    assert target.total_defects == 1
@@ -2,30 +2,82 @@
 import sys
 import os
 import pytest
+import asyncio
+import threading
 
 # Add root directory to sys.path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.agents.global_orchestrator import GlobalSafetyOrchestrator
+from src.agents.global_orchestrator import GlobalSafetyOrchestrator, SafetyStage
 
 def test_day_100_capstone():
     print("Testing Day 100: Phase 4 Capstone - Global Safety Orchestrator...")
     
-    orchestrator = GlobalSafetyOrchestrator()
+    with GlobalSafetyOrchestrator() as orchestrator:
+        # 1. Test Safe Global Plan
+        title1 = "Renewable energy transition plan"
+        desc1 = "Shifting national power grids to solar and wind to mitigate climate_change."
+        res1 = orchestrator.audit_global_plan(title1, desc1, "GreenEnergy_Inc", "EU")
     
-    # 1. Test Safe Global Plan
-    title1 = "Renewable energy transition plan"
-    desc1 = "Shifting national power grids to solar and wind to mitigate climate_change."
-    res1 = orchestrator.audit_global_plan(title1, desc1, "GreenEnergy_Inc", "EU")
+        # Should pass all
+        assert res1.is_authorized == True
+        assert res1.verdicts["Science"] == "PASS"
     
-    # Should pass all
-    assert res1.is_authorized == True
-    assert res1.verdicts["Science"] == "PASS"
+        # 2. Test Plan with Fatal Violations
+        title2 = "Rapid Industrial Expansion"
+        desc2 = "New coal plants using uranium for fuel. Boost output via labor working hours expansion."
+        res2 = orchestrator.audit_global_plan(title2, desc2, "BigOil_Corp", "USA")
     
-    # 2. Test Plan with Fatal Violations
-    title2 = "Rapid Industrial Expansion"
-    desc2 = "New coal plants using uranium for fuel. Boost output via labor working hours expansion."
-    res2 = orchestrator.audit_global_plan(title2, desc2, "BigOil_Corp", "USA")
-    
-    assert res2.is_authorized == False
-    assert "REJECTED" in res2.verdicts["Policy"]
+        assert res2.is_authorized == False
+        assert "REJECTED" in res2.verdicts["Policy"]
+
+def test_day_100_pipeline_modes():
+    plans = [
+        ("Renewable energy transition plan",
+         "Shifting national power grids to solar and wind to mitigate climate_change.", "GreenEnergy_Inc", "EU"),
+        ("Rapid Industrial Expansion",
+         "New coal plants using uranium for fuel. Boost output via labor working hours expansion.", "BigOil_Corp", "USA"),
+    ]
+    with GlobalSafetyOrchestrator() as orchestrator:
+        threaded = [orchestrator.audit_global_plan(*plan) for plan in plans]
+        batch = orchestrator.audit_many(plans)
+        awaited = [asyncio.run(orchestrator.aaudit_global_plan(*plan)) for plan in plans]
+    serial = [GlobalSafetyOrchestrator(executor="serial").audit_global_plan(*plan) for plan in plans]
+
+    for a, b, c, d in zip(threaded, serial, batch, awaited):
+        assert a.verdicts == b.verdicts == c.verdicts == d.verdicts
+        assert a.is_authorized == b.is_authorized == c.is_authorized == d.is_authorized
+        assert set(a.stage_seconds) == set(a.verdicts)
+
+    # Fail-fast stops at the first blocking verdict and skips the remaining stages
+    res = GlobalSafetyOrchestrator(executor="serial", fail_fast=True).audit_global_plan(*plans[1])
+    assert res.is_authorized == False
+    assert "SKIPPED" in res.verdicts.values()
+
+def test_day_100_fail_fast_on_threads_and_asyncio():
+    release = threading.Event()
+
+    def slow(plan):
+        release.wait(5)
+        return "OK", None
+
+    with GlobalSafetyOrchestrator(fail_fast=True) as orchestrator:
+        orchestrator.stages = [
+            SafetyStage("Block", lambda plan: ("BLOCKED", None), blocks=lambda v: v == "BLOCKED"),
+            SafetyStage("Slow", slow),
+            SafetyStage("After", lambda plan: ("OK", None), depends_on=("Slow",)),
+        ]
+        # The blocking verdict ends the audit while "Slow" is still running
+        res = orchestrator.audit_global_plan("t", "d", "e", "r")
+        release.set()
+    assert res.is_authorized == False
+    assert res.verdicts == {"Block": "BLOCKED", "Slow": "SKIPPED", "After": "SKIPPED"}
+
+    with GlobalSafetyOrchestrator(fail_fast=True) as orchestrator:
+        orchestrator.stages = [
+            SafetyStage("Block", lambda plan: ("BLOCKED", None), blocks=lambda v: v == "BLOCKED"),
+            SafetyStage("After", lambda plan: ("OK", None), depends_on=("Block",)),
+        ]
+        res = asyncio.run(orchestrator.aaudit_global_plan("t", "d", "e", "r"))
+    assert res.is_authorized == False
+    assert res.verdicts == {"Block": "BLOCKED", "After": "SKIPPED"}
@@ -0,0 +1,45 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.extraction_defense import StreamingExtractionDetector
+
+BOUNDARY = np.array([0.51, 0.49])
+CONFIDENT = np.array([0.99, 0.01])
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_flag_clears_once_old_queries_decay():
+    clock = FakeClock()
+    detector = StreamingExtractionDetector(min_queries=10, half_life_seconds=60, clock=clock)
+    flagged = [detector.observe("u", BOUNDARY) for _ in range(10)]
+    assert flagged == [False] * 9 + [True]
+    assert detector.flagged_users() == ["u"]
+
+    # Old boundary queries fade below min_queries without any new traffic
+    clock.now = 61
+    assert detector.flagged_users() == []
+    assert detector.user_report("u")["queries"] == 5
+
+    # Normal traffic outweighs what is left of the old probing
+    clock.now = 130
+    detector.observe("u", np.tile(CONFIDENT, (20, 1)))
+    report = detector.user_report("u")
+    assert report["queries"] == 22.5
+    assert not report["suspicious"]
+
+def test_without_half_life_counts_are_kept():
+    clock = FakeClock()
+    detector = StreamingExtractionDetector(min_queries=10, half_life_seconds=None, clock=clock)
+    detector.observe("u", np.tile(BOUNDARY, (10, 1)))
+    clock.now = 1e9
+    assert detector.flagged_users() == ["u"]
+    assert sum(detector.user_report("u")["margin_histogram"]) == 10
@@ -0,0 +1,42 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fairness.audit import FairnessAuditor
+from src.fairness.bootstrap import fairness_confidence_intervals
+from src.fairness.metrics import group_fairness_metrics
+
+def test_intervals_use_signed_audit_metrics():
+    y_true = np.array([1, 0, 1, 0, 1, 0, 1, 0])
+    y_pred = np.array([1, 0, 0, 0, 1, 1, 1, 1])
+    sens = np.array([1, 1, 1, 1, 0, 0, 0, 0])
+    auditor = FairnessAuditor()
+    metrics = auditor.audit(y_true, y_pred, sens)
+    assert metrics["Disparate Impact Ratio"] == 4.0
+    assert metrics["Demographic Parity Difference"] == -0.75
+
+    for method, kwargs in (("bootstrap", {"seed": 0}), ("jackknife", {})):
+        ci = auditor.confidence_intervals(y_true, y_pred, sens, method=method, **kwargs)
+        assert ci["disparate_impact_ratio"]["estimate"] == 4.0
+        assert ci["demographic_parity_difference"]["estimate"] == -0.75
+        assert ci["equal_opportunity_difference"]["estimate"] == metrics["Equal Opportunity Difference"]
+
+def test_resamples_missing_a_group_are_dropped():
+    rng = np.random.default_rng(0)
+    sens = np.zeros(200, dtype=int)
+    sens[0] = 1  # a one-row group
+    y_pred = rng.integers(0, 2, 200)
+    y_pred[0] = 1
+    y_true = rng.integers(0, 2, 200)
+
+    ci = fairness_confidence_intervals(y_true, y_pred, sens, n_resamples=500, seed=0)
+    di = ci["disparate_impact_ratio"]
+    assert di["estimate"] == group_fairness_metrics(y_true, y_pred, sens)["disparate_impact_ratio"]
+    assert 0 < di["n_valid"] < 500
+    assert di["lower"] > 0.3
+
+    stratified = fairness_confidence_intervals(y_true, y_pred, sens, n_resamples=500, seed=0, stratified=True)
+    assert stratified["disparate_impact_ratio"]["n_valid"] == 500
@@ -0,0 +1,77 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fairness.metrics import FairnessEvaluator, group_confusion_matrix, group_fairness_metrics
+from src.fairness.audit import FairnessAuditor
+from src.ethics.financial_auditor import FinancialFairnessAuditor
+
+rng = np.random.default_rng(0)
+N = 500
+Y_TRUE = rng.integers(0, 2, N)
+Y_PRED = rng.integers(0, 2, N)
+RACE = rng.choice(["a", "b", "c"], N)
+SEX = rng.choice(["f", "m"], N)
+
+def naive_rates(mask):
+    pred, true = Y_PRED[mask], Y_TRUE[mask]
+    return {
+        "selection_rate": np.mean(pred == 1),
+        "tpr": np.mean(pred[true == 1] == 1) if np.any(true == 1) else 0.0,
+        "fpr": np.mean(pred[true == 0] == 1) if np.any(true == 0) else 0.0,
+    }
+
+def test_grouped_counts_match_per_group_loops():
+    keys, counts = group_confusion_matrix(Y_TRUE, Y_PRED, RACE)
+    assert keys == ["a", "b", "c"]
+    for key, (tn, fp, fn, tp) in zip(keys, counts):
+        mask = RACE == key
+        assert tp == np.sum((Y_PRED == 1) & (Y_TRUE == 1) & mask)
+        assert tn == np.sum((Y_PRED == 0) & (Y_TRUE == 0) & mask)
+        assert fp + fn + tp + tn == mask.sum()
+
+    report = group_fairness_metrics(Y_TRUE, Y_PRED, RACE)
+    for key in keys:
+        for name, value in naive_rates(RACE == key).items():
+            assert np.isclose(report["groups"][key][name], value)
+
+    rates = [naive_rates(RACE == key)["selection_rate"] for key in keys]
+    assert np.isclose(FairnessEvaluator.demographic_parity_difference(Y_PRED, RACE), max(rates) - min(rates))
+
+def test_intersectional_groups_and_marginals():
+    report = group_fairness_metrics(Y_TRUE, Y_PRED, np.column_stack([RACE, SEX]))
+    assert set(report["groups"]) == {(r, s) for r in "abc" for s in "fm"}
+    for (race, sex), metrics in report["groups"].items():
+        assert metrics["count"] == np.sum((RACE == race) & (SEX == sex))
+        assert np.isclose(metrics["tpr"], naive_rates((RACE == race) & (SEX == sex))["tpr"])
+    race_marginal, sex_marginal = report["marginals"]
+    assert race_marginal["groups"] == group_fairness_metrics(Y_TRUE, Y_PRED, RACE)["groups"]
+    assert sex_marginal["groups"] == group_fairness_metrics(Y_TRUE, Y_PRED, SEX)["groups"]
+
+def test_binary_audit_and_loan_rates():
+    sensitive = (SEX == "m").astype(int)
+    metrics = FairnessAuditor().audit(Y_TRUE, Y_PRED, sensitive)
+    priv, unpriv = naive_rates(sensitive == 1), naive_rates(sensitive == 0)
+    assert np.isclose(metrics["Demographic Parity Difference"], priv["selection_rate"] - unpriv["selection_rate"])
+    assert np.isclose(metrics["Equal Opportunity Difference"], priv["tpr"] - unpriv["tpr"])
+
+    rates = FinancialFairnessAuditor().calculate_statistical_parity(Y_PRED.tolist(), RACE.tolist())
+    assert rates == {key: float(np.mean(Y_PRED[RACE == key])) for key in "abc"}
+
+def test_none_and_mixed_type_labels_stay_separate_groups():
+    parity = FinancialFairnessAuditor().calculate_statistical_parity([1, 0, 1, 0], ["a", None, "a", None])
+    assert parity == {"a": 1.0, None: 0.0}
+
+    parity = FinancialFairnessAuditor().calculate_statistical_parity([1, 0, 1, 0], [1, "1", 1, "1"])
+    assert parity == {1: 1.0, "1": 0.0}
+
+    keys, counts = group_confusion_matrix([1, 0, 1, 0], [1, 0, 0, 1], [1, "1", None, 1])
+    assert set(keys) == {1, "1", None}
+    assert counts.sum() == 4
+
+    report = group_fairness_metrics([1, 0, 1, 0], [1, 0, 0, 1], [[1, "x"], ["1", None], [1, "x"], [1, None]])
+    assert set(report["groups"]) == {(1, "x"), (1, None), ("1", None)}
+    assert [set(m["groups"]) for m in report["marginals"]] == [{1, "1"}, {"x", None}]
@@ -0,0 +1,59 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.fairness.metrics import group_fairness_metrics
+from src.fairness.streaming import StreamingFairnessAccumulator, iter_csv_chunks, iter_npy_chunks
+from src.fairness.audit import FairnessAuditor
+from src.ethics.financial_auditor import FinancialFairnessAuditor
+
+rng = np.random.default_rng(1)
+N = 1000
+FRAME = pd.DataFrame({
+    "y_true": rng.integers(0, 2, N),
+    "y_pred": rng.integers(0, 2, N),
+    "sensitive": rng.integers(0, 2, N),
+    "region": rng.choice(["n", "s"], N),
+})
+
+def test_chunked_and_merged_match_one_pass():
+    expected = group_fairness_metrics(FRAME["y_true"], FRAME["y_pred"], FRAME["sensitive"])
+    chunked = StreamingFairnessAccumulator()
+    for start in range(0, N, 128):
+        chunked.update(FRAME.iloc[start:start + 128])
+    assert chunked.n_samples == N
+    assert chunked.result() == expected
+
+    left, right = StreamingFairnessAccumulator(), StreamingFairnessAccumulator()
+    left.update(FRAME.iloc[:300])
+    right.update(FRAME.iloc[300:])
+    assert left.merge(right).result() == expected
+
+    intersectional = StreamingFairnessAccumulator(sensitive_cols=["sensitive", "region"])
+    for start in range(0, N, 300):
+        intersectional.update(FRAME.iloc[start:start + 300])
+    one_pass = group_fairness_metrics(FRAME["y_true"], FRAME["y_pred"],
+                                      FRAME[["sensitive", "region"]].to_numpy(dtype=object))
+    assert intersectional.result()["groups"] == one_pass["groups"]
+
+def test_file_readers_feed_the_auditor(tmp_path):
+    expected = FairnessAuditor().audit(FRAME["y_true"].to_numpy(), FRAME["y_pred"].to_numpy(), FRAME["sensitive"].to_numpy())
+    path = tmp_path / "preds.csv"
+    FRAME.to_csv(path, index=False)
+    assert FairnessAuditor().audit_stream(iter_csv_chunks(str(path), chunksize=100)) == expected
+
+    paths = {}
+    for col in ("y_true", "y_pred", "sensitive"):
+        paths[col] = str(tmp_path / f"{col}.npy")
+        np.save(paths[col], FRAME[col].to_numpy())
+    assert FairnessAuditor().audit_stream(iter_npy_chunks(paths, chunksize=333)) == expected
+
+def test_loan_audit_stream_matches_batch():
+    records = [{"approved": int(a), "gender": g} for a, g in zip(FRAME["y_pred"], FRAME["region"])]
+    auditor = FinancialFairnessAuditor()
+    batches = [records[i:i + 64] for i in range(0, N, 64)]
+    assert auditor.audit_loan_model_stream(batches) == auditor.audit_loan_model(records)
@@ -0,0 +1,34 @@
+import sys
+import os
+import asyncio
+import time
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.llm_client import LLMClient, batch_generate
+from src.agents.mock_llm import MockLLM, LatencyMockLLM
+from src.evaluators.sycophancy import SycophancyProbe, MockSycophanticLLM
+
+PROMPTS = [f"question {i}" for i in range(16)]
+
+def test_batch_keeps_order_and_runs_concurrently():
+    client = LLMClient(provider="mock", mock=LatencyMockLLM(latency=0.05))
+    start = time.perf_counter()
+    responses = client.generate_batch(PROMPTS, max_concurrency=8)
+    elapsed = time.perf_counter() - start
+    assert responses == [MockLLM().generate(p) for p in PROMPTS]
+    # Sequential would take 16 * 0.05 = 0.8s
+    assert elapsed < 0.5
+
+def test_async_batch_matches_sync():
+    client = LLMClient(provider="mock", mock=LatencyMockLLM(latency=0.01))
+    assert asyncio.run(client.agenerate_batch(PROMPTS, max_concurrency=4)) == client.generate_batch(PROMPTS)
+    assert asyncio.run(client.agenerate_batch([])) == []
+    assert asyncio.run(client.agenerate("hi")) == client.generate("hi")
+
+def test_probe_batch_matches_probe():
+    probe, model = SycophancyProbe(), MockSycophanticLLM()
+    cases = [("I think the earth is flat", "Is it?"), ("", "What is 2+2?")]
+    assert probe.probe_batch(model, cases) == [probe.probe(model, *case) for case in cases]
+    assert batch_generate(model, [], 8) == []
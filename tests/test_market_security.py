@@ -0,0 +1,53 @@
+import sys
+import os
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.market_security import MarketMonitor
+
+def reference_flags(history, volume_threshold):
+    """The original per-agent list scans."""
+    spoofing = False
+    if len(history) >= 5:
+        cancels = sum(o["action"] == "CANCEL" and o["volume"] > volume_threshold for o in history)
+        places = sum(o["action"] == "PLACE" and o["volume"] > volume_threshold for o in history)
+        spoofing = places > 0 and cancels / places > 0.8
+    opposing = sum(
+        prev["price"] == curr["price"] and prev["action"] != curr["action"] and curr["timestamp"] - prev["timestamp"] < 0.1
+        for prev, curr in zip(history, history[1:])
+    )
+    return {"spoofing": spoofing, "wash_trading": len(history) >= 4 and opposing >= 2}
+
+def random_orders(n=4000, seed=0):
+    rng = np.random.default_rng(seed)
+    agents = [f"agent{i}" for i in rng.integers(0, 60, n)]
+    prices = rng.choice([100.0, 100.5, 101.0], n)
+    volumes = rng.choice([10.0, 5000.0], n)
+    actions = rng.choice(["PLACE", "CANCEL", "EXECUTE"], n).tolist()
+    timestamps = np.cumsum(rng.exponential(0.02, n))
+    return agents, prices, volumes, actions, timestamps
+
+def test_incremental_counters_match_list_scans():
+    orders = random_orders()
+    single, batched = MarketMonitor(), MarketMonitor()
+    for row in zip(*orders):
+        single.log_order(*row)
+    half = len(orders[0]) // 2
+    batched.log_orders(*(column[:half] for column in orders))
+    batched.log_orders(*(column[half:] for column in orders))
+
+    history = single.order_history
+    assert batched.order_history == history
+    reports = single.audit_all_agents()
+    assert batched.audit_all_agents() == reports
+    assert 0 < sum(r["flags"]["wash_trading"] for r in reports) < len(reports)
+    for report in reports:
+        assert report["flags"] == reference_flags(history[report["agent_id"]], 1000.0)
+        assert single.audit_agent(report["agent_id"]) == report
+
+    # Changing the threshold recounts large orders from the log
+    single.volume_threshold = 10_000.0
+    assert not any(r["flags"]["spoofing"] for r in single.audit_all_agents())
+    assert single.audit_agent("nobody")["suspicious"] is False
@@ -0,0 +1,42 @@
+import sys
+import os
+import numpy as np
+import pytest
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.privacy.membership_inference import MIAttacker
+
+class FixedConfidenceModel:
+    def __init__(self, confidences):
+        self.confidences = np.asarray(confidences, dtype=float)
+
+    def predict_proba(self, X):
+        conf = self.confidences[np.asarray(X, dtype=int)]
+        return np.column_stack([1 - conf, conf])
+
+def test_roc_thresholds_reproduce_the_attack():
+    attacker = MIAttacker()
+    members = np.array([0.9, 0.8, 0.8, 0.6])
+    non_members = np.array([0.8, 0.5, 0.3, 0.3])
+    sweep = attacker.roc_sweep(members, non_members)
+    assert np.all(np.isfinite(sweep["thresholds"]))
+
+    model = FixedConfidenceModel(np.r_[members, non_members])
+    X, y = np.arange(8), np.ones(8, dtype=int)
+    for threshold, tpr, fpr in zip(sweep["thresholds"], sweep["tpr"], sweep["fpr"]):
+        preds = attacker.attack_threshold_based(model, X, y, threshold=threshold)
+        assert preds[:4].mean() == tpr
+        assert preds[4:].mean() == fpr
+
+    preds = attacker.attack_threshold_based(model, X, y, threshold=sweep["best_threshold"])
+    accuracy = (preds[:4].sum() + (1 - preds[4:]).sum()) / 8
+    assert accuracy == sweep["best_accuracy"] == 0.875
+
+def test_roc_sweep_rejects_empty_scores():
+    with pytest.raises(ValueError):
+        MIAttacker().roc_sweep(np.array([]), np.array([]))
+    # One empty side still gives a curve
+    roc = MIAttacker().roc_sweep(np.array([0.9, 0.4]), np.array([]))
+    assert roc["tpr"][-1] == 1.0 and np.all(roc["fpr"] == 0.0)
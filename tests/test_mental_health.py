@@ -0,0 +1,33 @@
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.guardrails.mental_health import MentalHealthSafeguard
+
+def test_crisis_wins_over_overlapping_medical_match():
+    guard = MentalHealthSafeguard()
+    guard.medical_terms = guard.medical_terms + [r"\boverdose on \w+"]
+    guard.crisis_keywords = guard.crisis_keywords + [r"\bon pills\b"]
+    # The medical match "overdose on pills" covers the crisis phrase "on pills"
+    assert guard.analyze_input("I want to overdose on pills").category == "CRISIS"
+    assert guard.analyze_input("What dosage is safe?").category == "MEDICAL_ADVICE"
+    assert guard.analyze_input("Nice weather today").category is None
+
+def test_patterns_with_backreferences():
+    guard = MentalHealthSafeguard()
+    guard.crisis_keywords = [r"\b(\w+) \1 \1\b", r"\bsuicide\b"]
+    guard.medical_terms = [r"(?P<drug>xanax|prozac) and (?P=drug)"]
+    assert guard.analyze_input("bye bye bye").category == "CRISIS"
+    assert guard.analyze_input("bye bye").category is None
+    assert guard.analyze_input("xanax and xanax").category == "MEDICAL_ADVICE"
+    assert guard.analyze_input("xanax and prozac").category is None
+
+def test_transcript_matches_whole_text():
+    guard = MentalHealthSafeguard()
+    monitor = guard.start_transcript()
+    assert monitor.append("what dos").category is None
+    assert monitor.append("age should I take").category == "MEDICAL_ADVICE"
+    assert monitor.append("... I want to end it al").category == "MEDICAL_ADVICE"
+    assert monitor.append("l").category == "CRISIS"
@@ -0,0 +1,26 @@
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.guardrails.pii_ner import NERFilter
+
+def test_gazetteer_follows_in_place_changes():
+    ner = NERFilter({"Bob": "PERSON"})
+    assert ner.redact("Bob met Carol") == "[PERSON] met Carol"
+
+    # Same size, same dict object: the gazetteer must still be rebuilt
+    del ner.entities["Bob"]
+    ner.entities["Carol"] = "PERSON"
+    assert ner.redact("Bob met Carol") == "Bob met [PERSON]"
+
+    ner.entities = {"New York": "LOC"}
+    ner.add_entities({"New York City": "LOC"})
+    assert ner.detect("in New York City.") == [{"text": "New York City", "label": "LOC", "start": 3, "end": 16}]
+
+def test_token_matching_and_batches():
+    ner = NERFilter()
+    assert ner.detect("Bobby went to Paris") == [{"text": "Paris", "label": "LOC", "start": 14, "end": 19}]
+    texts = ["John Doe works at Google", "nothing", "Alice and Bob"]
+    assert ner.redact_batch(texts, max_workers=2) == [ner.redact(t) for t in texts]
@@ -0,0 +1,82 @@
+import sys
+import os
+import pytest
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.plan_verifier import PlanVerifier, PlanStep, PlanRule
+from src.agents.capstone_agent import SafeResearchAssistant
+
+def test_default_rules_keep_original_messages():
+    verifier = PlanVerifier(restricted_tools=["system_shell", "delete_file"])
+    res = verifier.verify_plan([PlanStep("delete_file", {"path": "a"}, 1)])
+    assert res.errors == [
+        "Step 1: Tool 'delete_file' is RESTRICTED.",
+        "Step 1: Unsafe Sequence. 'delete_file' attempted without prior 'backup_file'.",
+    ]
+    assert PlanVerifier().verify_plan([PlanStep("backup_file", {}, 1), PlanStep("delete_file", {}, 2)]).is_valid
+
+def test_ordering_dataflow_and_argument_rules():
+    verifier = PlanVerifier(rules="""
+        forbid send_email after read_secrets
+        require web_search flows into read_page
+        require read_page.url matching ^https://
+    """)
+    ok = [PlanStep("web_search", {"q": "x"}, 1), PlanStep("read_page", {"url": "https://a"}, 2)]
+    assert verifier.verify_plan(ok).errors == ["Step 2: Unsafe Dataflow. 'read_page' does not consume the output of a prior 'web_search'."]
+    bad = [PlanStep("read_secrets", {}, 1), PlanStep("send_email", {}, 2)]
+    assert not verifier.verify_plan(bad).is_valid
+    results = verifier.verify_many([ok, bad, []], stop_at_first=True)
+    assert [len(r.errors) for r in results] == [1, 1, 0]
+    assert verifier.filter_valid([ok, bad, []]) == [[]]
+
+def test_argument_rules_apply_to_step_outputs():
+    verifier = PlanVerifier(rules=["forbid *.path matching ^/etc"])
+    plan = [PlanStep("web_search", {"q": "x"}, 1), PlanStep("read_file", {"path": "{{step_1}}"}, 2)]
+    # A referenced value cannot be checked statically...
+    assert not verifier.verify_plan(plan).is_valid
+    # ...unless the executor re-checks the resolved value
+    assert verifier.verify_plan(plan, deferred_arguments=True).is_valid
+    assert not verifier.verify_arguments(plan[1], {"path": "/etc/passwd"}).is_valid
+
+    class Agent(SafeResearchAssistant):
+        def _generate_plan(self, user_query):
+            return plan
+
+        def _execute_tool(self, tool_name, args):
+            return "/etc/shadow" if tool_name == "web_search" else "file contents"
+
+    agent = Agent()
+    agent.plan_verifier.add_rules("forbid *.path matching ^/etc")
+    res = agent.run("find it")
+    assert res.success == False
+    assert "matches forbidden pattern" in res.trace[-1]
+
+def test_rules_are_compiled_eagerly_and_track_edits():
+    with pytest.raises(ValueError):
+        PlanVerifier(rules=["forbid *.p matching ("])
+    with pytest.raises(ValueError):
+        PlanVerifier(rules=["allow everything"])
+
+    verifier = PlanVerifier(rules=[])
+    assert verifier.verify_plan([PlanStep("web_search", {}, 1)]).is_valid
+    verifier.rules[:] = [PlanRule("forbid_tool", ("web_search",), "forbid web_search")]
+    assert not verifier.verify_plan([PlanStep("web_search", {}, 1)]).is_valid
+
+def test_verification_reuses_the_compiled_rules_until_an_edit():
+    verifier = PlanVerifier(restricted_tools=["system_shell"], rules=[])
+    compiled = verifier.compiled
+    verifier.verify_plan([PlanStep("web_search", {}, 1)])
+    assert verifier.compiled is compiled
+
+    verifier.restricted_tools.append("web_search")
+    assert not verifier.verify_plan([PlanStep("web_search", {}, 1)]).is_valid
+    assert verifier.compiled is not compiled
+
+    verifier.restricted_tools = []
+    verifier.add_rules("forbid read_file")
+    assert verifier.verify_plan([PlanStep("web_search", {}, 1)]).is_valid
+    assert not verifier.verify_plan([PlanStep("read_file", {}, 1)]).is_valid
+    del verifier.rules[0]
+    assert verifier.verify_plan([PlanStep("read_file", {}, 1)]).is_valid
@@ -0,0 +1,85 @@
+import sys
+import os
+import json
+import numpy as np
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.poisoning import DataSanitizer, RunningStats, TrainingGuard, iter_batches
+
+def _read_rows(paths):
+    rows = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            rows.extend(json.loads(line)["text"] for line in f)
+    return rows
+
+def test_sharded_ingestion_never_overwrites_earlier_runs(tmp_path):
+    sanitizer = DataSanitizer()
+    sanitizer.fit_stats(["a normal sentence about cats"] * 50 + ["another normal sentence"] * 50)
+    rows = [(f"normal sentence number {i}", "pos") for i in range(10)] + [("sudo_mode now", "neg")]
+
+    first = TrainingGuard(sanitizer, output_dir=str(tmp_path), shard_size=4, verbose=False)
+    assert first.ingest_stream(iter_batches(rows, 3)) == {"clean": 10, "quarantined": 1}
+    first_paths = list(first._writers[0].paths)
+
+    second = TrainingGuard(sanitizer, output_dir=str(tmp_path), shard_size=4, verbose=False)
+    second.ingest_stream(iter_batches(rows, 3))
+    second_paths = second._writers[0].paths
+    assert not set(first_paths) & set(second_paths)
+    assert _read_rows(first_paths) == _read_rows(second_paths) == [t for t, _ in rows[:10]]
+
+def _old_is_poison(feature_stats, text):
+    # Per-sample check from before poison_mask() existed
+    if "length" in feature_stats:
+        mean, std = feature_stats["length"]
+        if abs(len(text) - mean) > 3 * std:
+            return True
+    return any(trigger in text for trigger in ["nonsensestring", "triggerword123", "sudo_mode"])
+
+def _rows():
+    rng = np.random.default_rng(0)
+    rows = [(" ".join(["word"] * int(n)), "pos") for n in rng.integers(1, 30, 400)]
+    rows += [("x" * 2000, "neg"), ("hello sudo_mode", "neg"), ("", "pos"), ("triggerword123 " * 3, "neg")]
+    return rows
+
+def test_batched_running_stats_match_numpy():
+    values = np.random.default_rng(1).normal(50, 7, 1003)
+    stats = RunningStats()
+    for start in range(0, len(values), 97):
+        stats.update(values[start:start + 97])
+    assert stats.n == len(values)
+    assert np.isclose(stats.mean, np.mean(values))
+    assert np.isclose(stats.std, np.std(values))
+
+    merged = RunningStats().update(values[:500]).merge(RunningStats().update(values[500:]))
+    assert np.isclose(merged.mean, np.mean(values)) and np.isclose(merged.std, np.std(values))
+
+    sanitizer = DataSanitizer()
+    texts = [t for t, _ in _rows()]
+    sanitizer.fit_stats(texts, batch_size=37)
+    lengths = [len(t) for t in texts]
+    assert np.allclose(sanitizer.feature_stats["length"], (np.mean(lengths), np.std(lengths)))
+
+def test_poison_mask_matches_per_sample_check():
+    sanitizer = DataSanitizer()
+    sanitizer.fit_stats([t for t, _ in _rows()[:300]])
+    texts = [t for t, _ in _rows()]
+    mask = sanitizer.poison_mask(texts)
+    assert mask.tolist() == [_old_is_poison(sanitizer.feature_stats, t) for t in texts]
+    assert mask.any() and not mask.all()
+
+def test_process_pool_ingestion_matches_serial(tmp_path):
+    sanitizer = DataSanitizer()
+    sanitizer.fit_stats([t for t, _ in _rows()[:300]])
+    rows = _rows()
+
+    serial = TrainingGuard(sanitizer, output_dir=str(tmp_path / "serial"), shard_size=50, verbose=False)
+    pooled = TrainingGuard(sanitizer, output_dir=str(tmp_path / "pooled"), shard_size=50, verbose=False)
+    counts = serial.ingest_stream(iter_batches(rows, 30))
+    assert pooled.ingest_stream(iter_batches(rows, 30), max_workers=2) == counts
+    assert counts["clean"] + counts["quarantined"] == len(rows)
+    for a, b in zip(serial._writers, pooled._writers):
+        assert [os.path.basename(p) for p in a.paths] == [os.path.basename(p) for p in b.paths]
+        assert _read_rows(a.paths) == _read_rows(b.paths)
@@ -0,0 +1,32 @@
+import sys
+import os
+import io
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluators.privacy import PIIScanner, PIIAnonymizer
+
+TEXT = ("Contact jane.doe@example.com or 555-123-4567. Card 4111 1111 1111 1111, "
+        "SSN 123-45-6789. ") * 40
+
+def test_scan_finds_every_type():
+    findings = PIIScanner().scan("mail a@b.io, call 555.123.4567, ssn 123-45-6789")
+    assert [(f["type"], f["value"]) for f in findings] == [
+        ("EMAIL", "a@b.io"), ("PHONE_US", "555.123.4567"), ("SSN_US", "123-45-6789"),
+    ]
+
+def test_stream_matches_whole_text_scan():
+    scanner, anonymizer = PIIScanner(), PIIAnonymizer()
+    whole = sorted(scanner.scan(TEXT), key=lambda f: f["start"])
+    for chunk_size in (7, 64, 1000):
+        streamed = list(scanner.scan_stream(io.StringIO(TEXT), chunk_size=chunk_size, max_match_length=32))
+        assert streamed == whole
+        pieces = anonymizer.anonymize_stream(io.StringIO(TEXT), chunk_size=chunk_size, max_match_length=32)
+        assert "".join(pieces) == anonymizer.anonymize(TEXT)
+
+def test_batches_match_single_calls():
+    texts = [TEXT[:80], "nothing here", TEXT[80:200]]
+    scanner, anonymizer = PIIScanner(), PIIAnonymizer()
+    assert scanner.scan_batch(texts, max_workers=2) == [scanner.scan(t) for t in texts]
+    assert anonymizer.anonymize_batch(texts, max_workers=2) == [anonymizer.anonymize(t) for t in texts]
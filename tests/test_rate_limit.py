@@ -0,0 +1,76 @@
+import sys
+import os
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.rate_limit import (
+    MemoryBackend, SQLiteBackend, SlidingLogLimiter, TokenBucketLimiter, GCRALimiter, SlidingWindowCounterLimiter,
+)
+from src.security.extraction_defense import ExtractionDefender
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_every_limiter_allows_a_burst_then_recovers():
+    for cls in (SlidingLogLimiter, TokenBucketLimiter, GCRALimiter, SlidingWindowCounterLimiter):
+        clock = FakeClock()
+        limiter = cls(5, 10.0, clock=clock)
+        assert [limiter.allow("u") for _ in range(6)] == [True] * 5 + [False], cls.__name__
+        assert limiter.allow("v"), cls.__name__
+        clock.now += 20.0
+        assert limiter.allow("u"), cls.__name__
+
+def test_sliding_log_is_exact():
+    clock = FakeClock()
+    limiter = SlidingLogLimiter(3, 10.0, clock=clock)
+    for offset in (0.0, 4.0, 8.0):
+        clock.now = 1000.0 + offset
+        assert limiter.allow("u")
+    clock.now = 1009.9
+    assert not limiter.allow("u")
+    clock.now = 1010.0
+    assert limiter.allow("u")
+
+def test_idle_keys_are_evicted():
+    clock = FakeClock()
+    limiter = GCRALimiter(5, 10.0, clock=clock, backend=MemoryBackend(max_keys=100))
+    for i in range(1000):
+        limiter.allow(f"user{i}")
+    assert limiter.stats()["tracked_keys"] == 100
+    clock.now += 30.0
+    limiter.allow("late")
+    assert limiter.stats()["tracked_keys"] == 1
+
+def test_sqlite_backend_shares_one_quota(tmp_path):
+    path = str(tmp_path / "limits.sqlite")
+    clock = FakeClock()
+    first = GCRALimiter(4, 10.0, clock=clock, backend=SQLiteBackend(path))
+    second = GCRALimiter(4, 10.0, clock=clock, backend=SQLiteBackend(path))
+    results = [limiter.allow("u") for limiter in (first, second) * 3]
+    assert results == [True] * 4 + [False] * 2
+    first.backend.close()
+    second.backend.close()
+
+def test_defender_uses_the_limiter():
+    defender = ExtractionDefender(rate_limit=2, window_seconds=60)
+    assert [defender.check_rate_limit("u") for _ in range(3)] == [True, True, False]
+
+def test_eviction_never_refills_a_bucket_early():
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(10, 10.0, burst=100, clock=clock)
+    assert limiter.idle_seconds == 100.0
+    assert sum(limiter.allow("a") for _ in range(150)) == 100
+    clock.now += 20.5
+    limiter.allow("b")
+    # 20.5s at 1 token/s refills about 20 tokens, not a fresh bucket of 100
+    assert sum(limiter.allow("a") for _ in range(150)) == 20
+
+    # A shorter user-supplied timeout is clamped to the refill time
+    assert TokenBucketLimiter(10, 10.0, burst=100, idle_seconds=5.0).idle_seconds == 100.0
+    assert GCRALimiter(10, 10.0, idle_seconds=5.0).idle_seconds == 20.0
+    assert GCRALimiter(10, 10.0, idle_seconds=60.0).idle_seconds == 60.0
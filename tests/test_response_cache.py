@@ -0,0 +1,47 @@
+import sys
+import os
+import threading
+import pytest
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.response_cache import LRUResponseCache, SQLiteResponseCache
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+    assert cache.get("a") == "A"  # "b" is now the least recently used
+    cache.set("d", "D")
+    assert len(cache) == 3
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    cache.set("a", "A2")  # overwriting does not grow the cache
+    assert len(cache) == 3 and cache.get("a") == "A2"
+    assert cache.evictions == 1
+
+    reopened = SQLiteResponseCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    reopened.set("e", "E")
+    assert len(reopened) == 2
+
+def test_counters_are_thread_safe():
+    cache = LRUResponseCache()
+
+    def lookups():
+        for _ in range(5000):
+            cache.get("missing")
+
+    threads = [threading.Thread(target=lookups) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.misses == 40000
+
+def test_sqlite_cache_rejects_non_positive_purge_interval(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteResponseCache(str(tmp_path / "cache.sqlite"), purge_every=0)
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, purge_every=1)
+    cache.set("a", "A")
+    assert cache.get("a") == "A"
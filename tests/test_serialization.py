@@ -0,0 +1,46 @@
+import sys
+import os
+import pickle
+import zipfile
+
+# Add root directory to sys.path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.security.serialization import PickleScanner
+
+class Exploit:
+    def __reduce__(self):
+        return (os.system, ("echo pwned",))
+
+def test_scan_stream_checks_every_pickle(tmp_path):
+    scanner = PickleScanner()
+    # Legacy torch.save layout: several pickles back to back, then raw storage bytes
+    path = tmp_path / "legacy.pt"
+    path.write_bytes(pickle.dumps(1) + pickle.dumps(Exploit()))
+    res = scanner.scan_file(str(path))
+    assert res.pickles_scanned == 2
+    assert res.blocked and not res.is_safe
+
+    path.write_bytes(pickle.dumps(1) + pickle.dumps({"w": [1.0]}) + b"\x00\xff raw storage")
+    res = scanner.scan_file(str(path))
+    assert res.pickles_scanned == 2
+    assert res.is_safe
+
+def test_scan_archive_sniffs_member_contents(tmp_path):
+    scanner = PickleScanner()
+    path = tmp_path / "model.pt"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("archive/data", pickle.dumps(Exploit()))
+        archive.writestr("archive/data/0", os.urandom(256))
+    res = scanner.scan_file(str(path))
+    assert res.pickles_scanned == 1
+    assert not res.is_safe
+
+def test_archive_without_pickles_is_not_safe(tmp_path):
+    path = tmp_path / "model.pt"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("archive/data", b"just bytes")
+    res = PickleScanner().scan_file(str(path))
+    assert res.pickles_scanned == 0
+    assert res.error is not None
+    assert not res.is_safe